@@ -0,0 +1,115 @@
+"""Compare the pandas post-processing stage with an equivalent record-by-record loop.
+
+Usage: python benchmarks/bench_postprocess.py [registros] [repeticiones]
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.postprocess import alias_frame, postprocess_frame, postprocess_records, to_frame  # noqa: E402
+from src.text import fold_words  # noqa: E402
+
+COMPANIES = ["ACME S.A.C.", "Lindcorp", "Financiera Ades", "Banco Único", "Clínica  San Pablo"]
+TITLES = ["Analista de Datos", "Contador Júnior", "Ingeniero   de Sistemas", "Asistente Administrativo"]
+ALIASES = {"acme s.a.c.": "Acme SAC", "banco unico": "Banco Único SA"}
+_TRACKING = re.compile(r"(?<=[?&])(?:utm_[a-z]+|from|advn|sjdu|tk|vjs)=[^&#]*&?")
+
+
+def make_records(count: int, duplicate_ratio: float = 0.6) -> List[Dict[str, str]]:
+    """Synthetic history: offers repeat across runs and some URLs carry tracking parameters."""
+    rng = random.Random(7)
+    unique = max(1, int(count * (1 - duplicate_ratio)))
+    records = []
+    for index in range(count):
+        offer = rng.randrange(unique)
+        records.append(
+            {
+                "fuente": rng.choice(["Bumeran", "Computrabajo", "Indeed"]),
+                "empresa": rng.choice(COMPANIES),
+                "titulo": rng.choice(TITLES),
+                "url": (
+                    f"http://Jobs.Example.com/oferta/{offer}?utm_source=feed&p=1"
+                    if index % 10 == 0
+                    else f"https://jobs.example.com/oferta/{offer}"
+                ),
+            }
+        )
+    return records
+
+
+def _canonical(url: str) -> str:
+    url = (url or "").strip()
+    if url.startswith("http://"):
+        url = "https://" + url[len("http://"):]
+    match = re.match(r"^(https://[^/?#]+)(.*)$", url)
+    if not match:
+        return url
+    rest = re.sub(r"[?&]+(?=#|$)", "", _TRACKING.sub("", match.group(2)))
+    return match.group(1).lower() + rest
+
+
+def record_by_record(records: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    aliases = {fold_words(alias): company for alias, company in ALIASES.items()}
+    seen = set()
+    results = []
+    for record in records:
+        url = _canonical(record.get("url", ""))
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        empresa = " ".join((record.get("empresa") or "").split())
+        empresa = aliases.get(fold_words(empresa), empresa)
+        titulo = " ".join((record.get("titulo") or "").split())
+        results.append(
+            {
+                **record,
+                "url": url,
+                "empresa": empresa,
+                "titulo": titulo,
+                "empresa_normalizada": fold_words(empresa),
+                "titulo_normalizado": fold_words(titulo),
+            }
+        )
+    return results
+
+
+def best_of(function, records, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(records)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    records = make_records(count)
+    vectorised = postprocess_records(records, ALIASES)
+    reference = record_by_record(records)
+    assert [r["url"] for r in vectorised] == [r["url"] for r in reference]
+    assert [r["empresa"] for r in vectorised] == [r["empresa"] for r in reference]
+    loop_time = best_of(record_by_record, records, repeat)
+    pandas_time = best_of(lambda rows: postprocess_records(rows, ALIASES), records, repeat)
+    # Camino de merge_history: el historial ya llega como DataFrame
+    frame, aliases = to_frame(records), alias_frame(ALIASES)
+    frame_time = best_of(lambda df: postprocess_frame(df, aliases), frame, repeat)
+    print(f"registros: {count}  únicos: {len(reference)}")
+    print(f"registro a registro:      {loop_time:.3f}s")
+    print(f"pandas (listas de dict):  {pandas_time:.3f}s  ({loop_time / pandas_time:.1f}x)")
+    print(f"pandas (DataFrame):       {frame_time:.3f}s  ({loop_time / frame_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
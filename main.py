@@ -1,16 +1,37 @@
 import argparse
+import glob
 import logging
 import os
 import sys
-from dataclasses import dataclass
-from typing import List, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 SRC_DIR = os.path.join(ROOT, "src")
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
-from src.pipeline import DEFAULT_SOURCES, run_combined
+from src.companies import CompanyIndex
+from src.core.backend import DriverBackend, LocalFirefoxBackend, resolve_backend
+from src.core.blocking import COOLDOWN, BlockRegistry
+from src.core.cache import PageCache
+from src.core.redirects import RedirectCache
+from src.core.profiles import ProfileTemplate, startup_stats
+from src.core.resources import ResourceGovernor
+from src.health import HealthMonitor
+from src.indeed_links import LinkResolver
+from src.logconfig import LOG_FORMATS, setup_logging
+from src.profiling import PROFILE_MODES, RunProfiler
+from src.postprocess import load_aliases, merge_history
+from src.pipeline import DEFAULT_SOURCES, EXTRACTION_MODES, RunContext, run_combined
+from src.recurring import HOUR, RecurringSchedule
+from src.scheduler import SearchSpec, build_specs, run_batch
+from src.search_index import SearchIndex
+from src.storage import SegmentStore
+from src.relevance import RelevanceScorer
+from src.replay import SnapshotArchive, iter_archive, iter_cached_pages, new_run_id, replay
+from src.utils import guardar_resultados, iter_history
 
 
 @dataclass
@@ -22,6 +43,46 @@ class RunParameters:
     sources: List[str]
     log_level: int = logging.INFO
     headless: Optional[bool] = None
+    grid_urls: List[str] = field(default_factory=list)
+    grid_slots: int = 1
+    modes: Dict[str, str] = field(default_factory=dict)
+    page_workers: int = 1
+    cache_dir: Optional[str] = None
+    cache_ttl_hours: float = 6.0
+    archive_dir: Optional[str] = None
+    batch_file: Optional[str] = None
+    schedule_file: Optional[str] = None
+    schedule_loop: bool = False
+    min_interval_hours: float = 1.0
+    max_interval_hours: float = 48.0
+    batch_dias: List[int] = field(default_factory=list)
+    max_workers: Optional[int] = None
+    source_limits: Dict[str, int] = field(default_factory=dict)
+    max_browser_mb: Optional[float] = None
+    recycle_pages: Optional[int] = None
+    pool_memory_mb: Optional[float] = None
+    delta_dir: Optional[str] = None
+    normalize: bool = False
+    company_aliases: Optional[str] = None
+    company_index: Optional[str] = None
+    search_index: Optional[str] = None
+    profile_template: Optional[str] = None
+    indeed_links: Optional[str] = None
+    redirect_cache: Optional[str] = None
+    segments_dir: Optional[str] = None
+    segments_only: bool = False
+    retention_days: Optional[int] = None
+    retention_mb: Optional[float] = None
+    health_file: Optional[str] = None
+    health_alerts: Optional[str] = None
+    health_webhook: Optional[str] = None
+    landing_page: bool = False
+    block_state: Optional[str] = None
+    block_cooldown: float = COOLDOWN / 60
+    profile: Optional[str] = None
+    profile_interval: float = 5.0
+    min_relevance: Optional[float] = None
+    relevance_vocab: Optional[str] = None
 
 
 def prompt_interactive() -> Optional[RunParameters]:
@@ -81,6 +142,90 @@ def parse_arguments() -> argparse.Namespace:
         default="info",
         help="Nivel de logging a utilizar",
     )
+    parser.add_argument(
+        "--profile-template",
+        metavar="DIR",
+        help="Perfil de Firefox preparado una vez (preferencias sin telemetría ni actualizaciones, "
+        "arrancado una vez para inicializarlo) del que cada navegador local parte con una copia ligera",
+    )
+    parser.add_argument(
+        "--indeed-links",
+        metavar="JSON",
+        help="Resuelve los enlaces patrocinados de Indeed (/pagead/clk) a su jk con una petición HEAD "
+        "y guarda la correspondencia en este archivo para las siguientes ejecuciones",
+    )
+    parser.add_argument(
+        "--redirect-cache",
+        metavar="JSON",
+        help="Guarda las redirecciones de dominio observadas (p. ej. computrabajo.com.pe -> pe.computrabajo.com) "
+        "para navegar directo al destino final en las siguientes ejecuciones",
+    )
+    parser.add_argument(
+        "--landing-page",
+        action="store_true",
+        help="Carga la portada de cada sitio antes de buscar (por defecto se navega directo a la URL de búsqueda)",
+    )
+    parser.add_argument(
+        "--block-state",
+        metavar="JSON",
+        help="Guarda los bloqueos (captcha, HTTP 403/429) por host para respetar su enfriamiento entre ejecuciones",
+    )
+    parser.add_argument(
+        "--block-cooldown",
+        type=float,
+        default=COOLDOWN / 60,
+        metavar="MIN",
+        help="Minutos que se deja descansar un host tras un bloqueo; se duplica si vuelve a bloquear (por defecto 30)",
+    )
+    parser.add_argument(
+        "--health",
+        metavar="JSON",
+        help="Vigila la calidad de extracción (tarjetas por página, empresa vacía, selectores de respaldo) "
+        "frente a la mediana de ejecuciones anteriores guardadas en este archivo",
+    )
+    parser.add_argument(
+        "--health-alerts",
+        metavar="JSONL",
+        help="Archivo donde se agregan las alertas de --health (por defecto <archivo>_alerts.jsonl)",
+    )
+    parser.add_argument(
+        "--health-webhook",
+        metavar="URL",
+        help="Envía cada alerta de --health como POST JSON a esta URL",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sample",
+        choices=PROFILE_MODES,
+        help="Perfila cada scraper y guarda los informes en output/profiles/<run>/: "
+        "'sample' (por defecto, muestreo de pilas de bajo costo) o 'cprofile' (exacto, más lento)",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=5.0,
+        metavar="MS",
+        help="Intervalo de muestreo en milisegundos para --profile sample",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default="text",
+        help="Formato de los logs: texto legible o una línea JSON por evento (con run, fuente, busqueda y page)",
+    )
+    parser.add_argument(
+        "--log-file",
+        metavar="RUTA",
+        help="Escribe los logs también en este archivo",
+    )
+    parser.add_argument(
+        "--log-sample",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Con --log-level debug, registra 1 de cada N eventos debug repetidos (por mensaje). Ej: 10",
+    )
     parser.add_argument(
         "--headless",
         dest="headless",
@@ -93,21 +238,269 @@ def parse_arguments() -> argparse.Namespace:
         action="store_false",
         help="Deshabilitar headless para depuración local",
     )
+    parser.add_argument(
+        "--grid-url",
+        action="append",
+        help="URL de Selenium Grid/standalone donde abrir los navegadores (repetible, uno por nodo)",
+    )
+    parser.add_argument(
+        "--grid-slots",
+        type=int,
+        default=1,
+        help="Sesiones simultáneas permitidas por nodo de Grid",
+    )
+    parser.add_argument(
+        "--mode",
+        action="append",
+        metavar="FUENTE=MODO",
+        help=(
+            "Modo de extracción por fuente: dom (por defecto), network "
+            "(Chromium + captura de respuestas JSON) o api (solo Bumeran). Ej: --mode indeed=network"
+        ),
+    )
+    parser.add_argument(
+        "--page-workers",
+        type=int,
+        default=1,
+        help="Navegadores que se reparten las páginas de cada fuente",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directorio de caché de páginas de listado (se reutilizan mientras no expiren)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=6.0,
+        help="Horas de validez de una página en caché",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        help="Guarda el HTML de cada página de listado para poder re-extraerlo después con --replay",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Re-extrae ofertas desde un archivo de snapshots o un directorio de caché, sin navegador",
+    )
+    parser.add_argument(
+        "--replay-workers",
+        type=int,
+        help="Procesos usados por --replay (por defecto, uno por CPU)",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="ARCHIVO",
+        help="Archivo con una palabra clave por línea; ejecuta todas las búsquedas con un presupuesto común de workers",
+    )
+    parser.add_argument(
+        "--batch-dias",
+        type=int,
+        action="append",
+        choices=[0, 1, 2, 3],
+        help="Filtros de días a combinar con cada palabra del lote (repetible; por defecto --dias)",
+    )
+    parser.add_argument(
+        "--schedule",
+        metavar="JSON",
+        help="Ejecuta solo las búsquedas programadas que estén pendientes y guarda su estado en JSON. "
+        "Con --batch, la programación pasa a contener exactamente esas búsquedas. "
+        "El intervalo de cada búsqueda se adapta a cuántas ofertas nuevas encuentra",
+    )
+    parser.add_argument(
+        "--schedule-loop",
+        action="store_true",
+        help="Con --schedule, sigue en ejecución lanzando cada búsqueda cuando le toca",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=1.0,
+        metavar="HORAS",
+        help="Intervalo mínimo entre ejecuciones de una misma búsqueda programada (por defecto 1 h)",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=48.0,
+        metavar="HORAS",
+        help="Intervalo máximo entre ejecuciones de una misma búsqueda programada (por defecto 48 h)",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Máximo de scrapers simultáneos en modo lote (por defecto, la capacidad del backend o 3)",
+    )
+    parser.add_argument(
+        "--source-limit",
+        action="append",
+        metavar="FUENTE=N",
+        help="Máximo de scrapers simultáneos por fuente en modo lote. Ej: --source-limit indeed=1",
+    )
+    parser.add_argument(
+        "--max-browser-mb",
+        type=float,
+        help="Reinicia el navegador entre páginas cuando su memoria (RSS del árbol de procesos) supera este valor",
+    )
+    parser.add_argument(
+        "--recycle-pages",
+        type=int,
+        help="Reinicia el navegador cada N páginas cargadas",
+    )
+    parser.add_argument(
+        "--pool-memory-mb",
+        type=float,
+        help="Memoria total permitida para todos los navegadores locales; los nuevos esperan a que haya margen",
+    )
+    parser.add_argument(
+        "--delta-dir",
+        help="Escribe un JSONL con las ofertas nuevas, modificadas y desaparecidas respecto a la ejecución anterior de la misma búsqueda",
+    )
+    parser.add_argument(
+        "--normalize",
+        action="store_true",
+        help="Normaliza empresa/título, canoniza URLs y deduplica con pandas antes de guardar",
+    )
+    parser.add_argument(
+        "--company-aliases",
+        metavar="CSV",
+        help="CSV con columnas alias,empresa para unificar nombres de empresa (implica --normalize)",
+    )
+    parser.add_argument(
+        "--company-index",
+        metavar="JSON",
+        help="Índice de empresas: unifica el nombre de cada empresa entre fuentes y añade empresa_id; se actualiza al terminar",
+    )
+    parser.add_argument(
+        "--search-index",
+        metavar="DB",
+        help="Índice de texto completo (SQLite FTS5) que se actualiza con cada ejecución",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="TEXTO",
+        help="Consulta el índice de --search-index (ordenado por relevancia) sin ejecutar scrapers",
+    )
+    parser.add_argument("--search-limit", type=int, default=20, help="Máximo de resultados de --search")
+    parser.add_argument(
+        "--reindex",
+        metavar="DIR",
+        help="Importa al índice de --search-index los JSON guardados en DIR que aún no estén indexados",
+    )
+    parser.add_argument(
+        "--rank",
+        action="store_true",
+        help="Puntúa cada título contra la búsqueda (BM25), añade la columna relevancia y ordena por ella",
+    )
+    parser.add_argument(
+        "--min-relevance",
+        type=float,
+        help="Descarta ofertas con relevancia menor (0 a 1; implica --rank). Ej: 0.5",
+    )
+    parser.add_argument(
+        "--relevance-vocab",
+        metavar="JSON",
+        help="Vocabulario e IDF precalculados para --rank (si no, se calculan sobre cada lote)",
+    )
+    parser.add_argument(
+        "--fit-relevance",
+        metavar="DIR",
+        help="Calcula el vocabulario de --relevance-vocab a partir de los JSON guardados en DIR y termina",
+    )
+    parser.add_argument(
+        "--merge-history",
+        metavar="DIR",
+        help="Combina y deduplica todos los JSON guardados en DIR (o un almacén de --segments) "
+        "en un único archivo, sin ejecutar scrapers",
+    )
+    parser.add_argument(
+        "--segments",
+        metavar="DIR",
+        help="Guarda cada ejecución como un segmento JSONL comprimido (zstd si está instalado, si no gzip) "
+        "con id único en DIR; los segmentos de días anteriores se compactan al terminar",
+    )
+    parser.add_argument(
+        "--segments-only",
+        action="store_true",
+        help="Con --segments, no escribe además los archivos JSON y CSV en output/",
+    )
+    parser.add_argument(
+        "--compact",
+        metavar="DIR",
+        help="Compacta el almacén de segmentos DIR, aplica la retención y termina",
+    )
+    parser.add_argument(
+        "--import-results",
+        metavar="DIR",
+        help="Con --compact, importa al almacén los JSON de resultados guardados en DIR",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        help="Elimina del almacén de segmentos las particiones con más de N días",
+    )
+    parser.add_argument(
+        "--retention-mb",
+        type=float,
+        help="Elimina los segmentos más antiguos cuando el almacén supera este tamaño (MB)",
+    )
     parser.set_defaults(headless=None)
     return parser.parse_args()
 
 
 def resolve_parameters(args: argparse.Namespace) -> Optional[RunParameters]:
-    if args.interactive or not args.busqueda:
+    batch_file = getattr(args, "batch", None)
+    schedule_file = getattr(args, "schedule", None)
+    if not batch_file and not schedule_file and (args.interactive or not args.busqueda):
         return prompt_interactive()
     return RunParameters(
-        busqueda=args.busqueda,
+        busqueda=args.busqueda or "",
         dias=1 if args.hoy else args.dias,
         initial_wait=args.initial_wait if args.initial_wait is not None else 2.0,
         page_wait=args.page_wait if args.page_wait is not None else 1.0,
         sources=normalize_sources(args.source),
         log_level=parse_log_level(args.log_level),
         headless=args.headless,
+        grid_urls=list(getattr(args, "grid_url", None) or []),
+        grid_slots=getattr(args, "grid_slots", 1),
+        modes=parse_modes(getattr(args, "mode", None)),
+        page_workers=max(1, getattr(args, "page_workers", 1) or 1),
+        cache_dir=getattr(args, "cache_dir", None),
+        cache_ttl_hours=getattr(args, "cache_ttl", 6.0),
+        archive_dir=getattr(args, "archive_dir", None),
+        batch_file=batch_file,
+        schedule_file=schedule_file,
+        schedule_loop=getattr(args, "schedule_loop", False),
+        min_interval_hours=getattr(args, "min_interval", 1.0),
+        max_interval_hours=getattr(args, "max_interval", 48.0),
+        batch_dias=list(getattr(args, "batch_dias", None) or []),
+        max_workers=getattr(args, "max_workers", None),
+        source_limits=parse_source_limits(getattr(args, "source_limit", None)),
+        max_browser_mb=getattr(args, "max_browser_mb", None),
+        recycle_pages=getattr(args, "recycle_pages", None),
+        pool_memory_mb=getattr(args, "pool_memory_mb", None),
+        delta_dir=getattr(args, "delta_dir", None),
+        normalize=getattr(args, "normalize", False),
+        company_aliases=getattr(args, "company_aliases", None),
+        company_index=getattr(args, "company_index", None),
+        search_index=getattr(args, "search_index", None),
+        profile_template=getattr(args, "profile_template", None),
+        indeed_links=getattr(args, "indeed_links", None),
+        redirect_cache=getattr(args, "redirect_cache", None),
+        segments_dir=getattr(args, "segments", None),
+        segments_only=getattr(args, "segments_only", False),
+        retention_days=getattr(args, "retention_days", None),
+        retention_mb=getattr(args, "retention_mb", None),
+        health_file=getattr(args, "health", None),
+        health_alerts=getattr(args, "health_alerts", None),
+        health_webhook=getattr(args, "health_webhook", None),
+        landing_page=getattr(args, "landing_page", False),
+        block_state=getattr(args, "block_state", None),
+        block_cooldown=getattr(args, "block_cooldown", COOLDOWN / 60),
+        profile=getattr(args, "profile", None),
+        profile_interval=getattr(args, "profile_interval", 5.0),
+        min_relevance=resolve_min_relevance(args),
+        relevance_vocab=getattr(args, "relevance_vocab", None),
     )
 
 
@@ -131,6 +524,59 @@ def parse_sources_input(raw_input: str) -> List[str]:
     return normalize_sources(tokens)
 
 
+def parse_modes(raw_modes: Optional[List[str]]) -> Dict[str, str]:
+    modes: Dict[str, str] = {}
+    for entry in raw_modes or []:
+        source, sep, mode = (entry or "").partition("=")
+        source, mode = source.strip().lower(), mode.strip().lower()
+        if not sep or not source or mode not in EXTRACTION_MODES:
+            raise SystemExit(f"Modo inválido '{entry}'. Usa fuente=modo con modo en {', '.join(EXTRACTION_MODES)}.")
+        targets = DEFAULT_SOURCES if source == "all" else [source]
+        for target in targets:
+            modes[target] = mode
+    return modes
+
+
+def parse_source_limits(raw_limits: Optional[List[str]]) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for entry in raw_limits or []:
+        source, sep, value = (entry or "").partition("=")
+        source = source.strip().lower()
+        if not sep or not source or not value.strip().isdigit() or int(value) < 1:
+            raise SystemExit(f"Límite inválido '{entry}'. Usa fuente=N con N >= 1.")
+        limits[source] = int(value)
+    return limits
+
+
+def read_batch_keywords(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as handle:
+        lines = [line.strip() for line in handle]
+    return _dedupe_preserving_order([line for line in lines if line and not line.startswith("#")])
+
+
+def resolve_min_relevance(args: argparse.Namespace) -> Optional[float]:
+    threshold = getattr(args, "min_relevance", None)
+    if threshold is not None:
+        return max(0.0, min(1.0, threshold))
+    return 0.0 if getattr(args, "rank", False) else None
+
+
+def resolve_browser_backend(params: RunParameters) -> Optional[DriverBackend]:
+    """Grid backend, or local Firefox on ``--profile-template`` (``None``: plain local Firefox)."""
+    backend = resolve_backend(params.grid_urls, params.grid_slots)
+    if not params.profile_template:
+        return backend
+    if backend is not None:
+        raise SystemExit("--profile-template solo se aplica a Firefox local y no puede combinarse con Selenium Grid.")
+    network_sources = sorted(source for source, mode in params.modes.items() if mode == "network")
+    if network_sources:
+        logging.getLogger(__name__).warning(
+            "--profile-template no se aplica a las fuentes en modo 'network' (usan Chromium): %s",
+            ", ".join(network_sources),
+        )
+    return LocalFirefoxBackend(ProfileTemplate(params.profile_template).prepare(warm=True))
+
+
 def parse_log_level(value: Optional[str]) -> int:
     if not value:
         return logging.INFO
@@ -140,13 +586,19 @@ def parse_log_level(value: Optional[str]) -> int:
     return logging.INFO
 
 
-def configure_logging(level: int) -> None:
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+def configure_logging(level: int, args: Optional[argparse.Namespace] = None) -> str:
+    """Configure logging and return the run id attached to every record."""
+    run_id = new_run_id()
+    setup_logging(
+        level,
+        log_format=getattr(args, "log_format", "text"),
+        log_file=getattr(args, "log_file", None),
+        sample=getattr(args, "log_sample", 1),
+        run=run_id,
     )
     # Reduce el ruido de bibliotecas verbosas como Selenium
     logging.getLogger("selenium").setLevel(max(logging.WARNING, level))
+    return run_id
 
 
 def _dedupe_preserving_order(values: List[str]) -> List[str]:
@@ -159,20 +611,238 @@ def _dedupe_preserving_order(values: List[str]) -> List[str]:
     return ordered
 
 
+def run_replay(directory: str, workers: Optional[int], label: str = "replay") -> List[Dict[str, str]]:
+    snapshots = list(iter_archive(directory)) or list(iter_cached_pages(directory))
+    if not snapshots:
+        logging.getLogger(__name__).warning("No hay snapshots ni páginas en caché en '%s'.", directory)
+        return []
+    results = replay(snapshots, workers=workers)
+    guardar_resultados(results, label, output_dir="output", source="replay")
+    return results
+
+
+def run_merge_history(directory: str, aliases_path: Optional[str] = None) -> int:
+    aliases = load_aliases(aliases_path) if aliases_path else None
+    merged = merge_history(directory, aliases=aliases)
+    records = merged.fillna("").to_dict(orient="records")
+    guardar_resultados(records, "historial", output_dir="output", source="merged")
+    return len(records)
+
+
+def run_compact(
+    directory: str,
+    import_dir: Optional[str] = None,
+    retention_days: Optional[int] = None,
+    retention_mb: Optional[float] = None,
+) -> SegmentStore:
+    store = SegmentStore(directory)
+    if import_dir:
+        imported = [path for path in sorted(glob.glob(os.path.join(import_dir, "*.json"))) if store.import_file(path)]
+        logging.getLogger(__name__).info(
+            "Importados %d archivos de %s; los originales pueden eliminarse", len(imported), import_dir
+        )
+    store.compact()
+    max_bytes = int(retention_mb * 1024 * 1024) if retention_mb is not None else None
+    if retention_days is not None or max_bytes is not None:
+        store.apply_retention(max_age_days=retention_days, max_bytes=max_bytes)
+    logging.getLogger(__name__).info(
+        "Almacén %s: %d segmentos, %.1f MB", directory, len(store.segments()), store.total_bytes() / 1024 / 1024
+    )
+    return store
+
+
+def run_search(index_path: str, text: str, limit: int = 20, reindex_dir: Optional[str] = None) -> List[Dict[str, object]]:
+    with SearchIndex(index_path) as index:
+        if reindex_dir:
+            added = index.import_directory(reindex_dir)
+            logging.getLogger(__name__).info("Importadas %d ofertas desde %s", added, reindex_dir)
+        if not text:
+            return []
+        hits = index.search(text, limit=limit)
+    for hit in hits:
+        print(f"{hit['fuente']:<13} {hit['titulo']} | {hit['empresa']} | {hit['url']}")
+    return hits
+
+
+def run_fit_relevance(directory: str, vocab_path: str) -> int:
+    titles = dict.fromkeys(str(record.get("titulo") or "") for record in iter_history(directory))
+    scorer = RelevanceScorer().fit(titles)
+    scorer.save(vocab_path)
+    logging.getLogger(__name__).info("Vocabulario de %d términos guardado en %s", len(scorer.vocabulary), vocab_path)
+    return len(scorer.vocabulary)
+
+
+def run_schedule(params: RunParameters, specs: Optional[List[SearchSpec]], batch_options: Dict) -> None:
+    schedule = RecurringSchedule(
+        params.schedule_file,
+        min_interval=params.min_interval_hours * HOUR,
+        max_interval=params.max_interval_hours * HOUR,
+    )
+    if specs is not None:
+        schedule.sync(specs)
+        schedule.save()
+    if not len(schedule):
+        raise SystemExit("La programación está vacía: indica las búsquedas con --batch.")
+    if params.schedule_loop:
+        schedule.run_forever(**batch_options)
+    elif not schedule.run_due(**batch_options):
+        upcoming = schedule.next_due() or time.time()
+        logging.getLogger(__name__).info(
+            "Sin búsquedas pendientes; la próxima vence en %.1f h", (upcoming - time.time()) / HOUR
+        )
+
+
 def main() -> None:
     args = parse_arguments()
+    if getattr(args, "fit_relevance", None):
+        configure_logging(parse_log_level(args.log_level), args)
+        if not args.relevance_vocab:
+            raise SystemExit("--fit-relevance requiere --relevance-vocab con la ruta de salida.")
+        run_fit_relevance(args.fit_relevance, args.relevance_vocab)
+        return
+    if getattr(args, "search", None) or getattr(args, "reindex", None):
+        configure_logging(parse_log_level(args.log_level), args)
+        index_path = args.search_index or os.path.join("output", "ofertas.db")
+        run_search(index_path, args.search or "", args.search_limit, args.reindex)
+        return
+    if getattr(args, "compact", None):
+        configure_logging(parse_log_level(args.log_level), args)
+        run_compact(args.compact, args.import_results, args.retention_days, args.retention_mb)
+        return
+    if getattr(args, "replay", None):
+        configure_logging(parse_log_level(args.log_level), args)
+        run_replay(args.replay, args.replay_workers, label=args.busqueda or "replay")
+        return
+    if getattr(args, "merge_history", None):
+        configure_logging(parse_log_level(args.log_level), args)
+        run_merge_history(args.merge_history, getattr(args, "company_aliases", None))
+        return
     params = resolve_parameters(args)
     if not params:
         return
-    configure_logging(params.log_level)
-    run_combined(
-        busqueda=params.busqueda,
-        dias=params.dias,
-        initial_wait=params.initial_wait,
-        page_wait=params.page_wait,
-        sources=params.sources,
-        headless=params.headless,
+    run_id = configure_logging(params.log_level, args)
+    backend = resolve_browser_backend(params)
+    page_cache = PageCache(params.cache_dir, ttl=params.cache_ttl_hours * 3600) if params.cache_dir else None
+    snapshot_archive = SnapshotArchive(params.archive_dir, run_id) if params.archive_dir else None
+    aliases = load_aliases(params.company_aliases) if params.company_aliases else None
+    company_index = (
+        CompanyIndex.load(params.company_index, aliases_csv=params.company_aliases) if params.company_index else None
+    )
+    search_index = SearchIndex(params.search_index) if params.search_index else None
+    relevance_scorer = RelevanceScorer.load(params.relevance_vocab) if params.relevance_vocab else None
+    link_resolver = LinkResolver(params.indeed_links) if params.indeed_links else None
+    # Sin archivo la caché vive solo durante la ejecución (útil en lotes)
+    redirect_cache = RedirectCache(params.redirect_cache)
+    block_registry = BlockRegistry(params.block_state, cooldown=params.block_cooldown * 60)
+    segment_store = SegmentStore(params.segments_dir, run_id) if params.segments_dir else None
+    health_monitor = (
+        HealthMonitor(
+            params.health_file,
+            alert_path=params.health_alerts or f"{os.path.splitext(params.health_file)[0]}_alerts.jsonl",
+            webhook=params.health_webhook,
+        )
+        if params.health_file
+        else None
+    )
+    governor = ResourceGovernor(params.max_browser_mb, params.recycle_pages, params.pool_memory_mb)
+    batch_mode = bool(params.batch_file or params.schedule_file)
+    # Tareas que pueden correr a la vez (un lote respeta --max-workers; una búsqueda lanza todas sus fuentes)
+    task_workers = (
+        params.max_workers or (backend and backend.capacity) or len(params.sources)
+        if batch_mode
+        else len(params.sources)
     )
+    profiler = (
+        RunProfiler(
+            os.path.join("output", "profiles", run_id),
+            mode=params.profile,
+            interval=max(0.001, params.profile_interval / 1000),
+            concurrent=task_workers > 1,
+        ).start()
+        if params.profile
+        else None
+    )
+    context = RunContext(
+        page_cache=page_cache,
+        snapshot_archive=snapshot_archive,
+        resource_governor=governor,
+        company_index=company_index,
+        profiler=profiler,
+        link_resolver=link_resolver,
+        redirect_cache=redirect_cache,
+        direct_entry=not params.landing_page,
+        health_monitor=health_monitor,
+        block_registry=block_registry,
+    )
+    try:
+        if batch_mode:
+            specs = (
+                build_specs(read_batch_keywords(params.batch_file), params.batch_dias or [params.dias], params.sources)
+                if params.batch_file
+                else None
+            )
+            batch_options = dict(
+                max_workers=task_workers,
+                source_limits=params.source_limits,
+                initial_wait=params.initial_wait,
+                page_wait=params.page_wait,
+                headless=params.headless,
+                backend=backend,
+                modes=params.modes,
+                page_workers=params.page_workers,
+                context=context,
+                delta_dir=params.delta_dir,
+                normalize=params.normalize,
+                company_aliases=aliases,
+                search_index=search_index,
+                min_relevance=params.min_relevance,
+                relevance_scorer=relevance_scorer,
+                segment_store=segment_store,
+                write_files=not (segment_store and params.segments_only),
+            )
+            if params.schedule_file:
+                run_schedule(params, specs, batch_options)
+            else:
+                run_batch(specs, **batch_options)
+            return
+        run_combined(
+            busqueda=params.busqueda,
+            dias=params.dias,
+            initial_wait=params.initial_wait,
+            page_wait=params.page_wait,
+            sources=params.sources,
+            headless=params.headless,
+            backend=backend,
+            modes=params.modes,
+            page_workers=params.page_workers,
+            context=context,
+            delta_dir=params.delta_dir,
+            normalize=params.normalize,
+            company_aliases=aliases,
+            search_index=search_index,
+            min_relevance=params.min_relevance,
+            relevance_scorer=relevance_scorer,
+            segment_store=segment_store,
+            write_files=not (segment_store and params.segments_only),
+        )
+    finally:
+        if link_resolver is not None:
+            link_resolver.save()
+        redirect_cache.save()
+        block_registry.save()
+        if health_monitor is not None:
+            health_monitor.save()
+        if segment_store is not None:
+            run_compact(params.segments_dir, retention_days=params.retention_days, retention_mb=params.retention_mb)
+        if profiler is not None:
+            profiler.stop()
+        if search_index is not None:
+            search_index.close()
+        if company_index is not None:
+            company_index.save(params.company_index)
+        if backend is not None:
+            backend.shutdown()
+        startup_stats.log()
 
 
 if __name__ == "__main__":
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import json
+import re
 import time
+import unicodedata
+import urllib.error
 import urllib.parse as urlparse
+import urllib.request
 from typing import Any, Dict, List, Optional
 
 from selenium.webdriver.common.by import By
@@ -12,6 +17,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from .core.base import BaseScraper
+from .core.blocking import BlockedPageError
+from .core.network import find_dicts_with_keys
 
 JobData = Dict[str, Any]
 
@@ -19,54 +26,210 @@ JobData = Dict[str, Any]
 class BumeranScraper(BaseScraper):
     """Scraper de ofertas laborales para Bumeran Perú."""
 
-    def __init__(self, driver=None, headless: Optional[bool] = True) -> None:
-        super().__init__(driver=driver, headless=headless)
+    source_name = "bumeran"
+    SITE_ROOT = "https://www.bumeran.com.pe"
+    NETWORK_PATTERNS = ("/api/avisos/",)
+    SHARD_STATE = ("_search_url",)
+    page_size = 20
+    TOTAL_RESULTS_SELECTORS = ("h1",)
+    API_URL = "https://www.bumeran.com.pe/api/avisos/searchV2"
+    API_PAGE_SIZE = 100
+    API_HEADERS = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "x-site-id": "BMPE",
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    }
+
+    def __init__(self, driver=None, headless: Optional[bool] = True, backend=None) -> None:
+        super().__init__(driver=driver, headless=headless, backend=backend)
+        self.api_url = self.API_URL
+        self._search_url = ""
+        self._listing_url = ""
+
+    def extraer_desde_api(
+        self,
+        palabra_clave: str,
+        hoy: bool = False,
+        dias: int = 0,
+        page_size: Optional[int] = None,
+        timeout: float = 15.0,
+    ) -> List[JobData]:
+        """Read listings from the search endpoint backing the React page.
+
+        Uses the same keyword and publication filter as ``_build_listing_url``
+        and walks pages of ``page_size`` avisos until the reported total is
+        reached or a page brings nothing new. Errors propagate so callers can
+        fall back to the browser path.
+        """
+        size = page_size or self.API_PAGE_SIZE
+        payloads: List[JobData] = []
+        seen = set()
+        page = 0
+        while page < self.max_pages:
+            data = self._request_api_page(palabra_clave, hoy, dias, page, size, timeout)
+            avisos = data.get("content") or []
+            new_found = 0
+            for record in self._records_from_avisos(avisos):
+                if record["url"] in seen:
+                    continue
+                seen.add(record["url"])
+                payloads.append(record)
+                new_found += 1
+            page += 1
+            total = data.get("total")
+            if not avisos or new_found == 0:
+                break
+            if isinstance(total, int) and page * size >= total:
+                break
+        for _ in payloads:
+            self._branch("origen", "api")
+        return payloads
 
     def abrir_pagina_empleos(self, hoy: bool = False, dias: int = 0) -> None:
-        url = self._build_listing_url(hoy=hoy, dias=dias)
-        self.driver.get(url)
+        self._listing_url = self._build_listing_url(hoy=hoy, dias=dias)
+        if not self.direct_entry:
+            self._navigate(self._listing_url)
 
     def buscar_vacante(self, palabra_clave: str = "") -> None:
         keyword = palabra_clave.replace(" ", "-").lower()
         try:
-            current = self.driver.current_url or ""
+            if self.direct_entry:
+                # La URL de búsqueda se deriva del listado sin cargarlo
+                current = self._listing_url or self._build_listing_url(hoy=False, dias=0)
+            else:
+                current = self.driver.current_url or ""
             parsed = urlparse.urlparse(current)
             prefix = self._resolve_search_prefix(parsed.path)
             new_path = f"/{prefix}{keyword}.html"
             new_url = f"{parsed.scheme}://{parsed.netloc}{new_path}"
-            self.driver.get(new_url)
+            self._search_url = new_url
+            self._open_listing(new_url)
+        except BlockedPageError:
+            raise
         except Exception:
             self._fallback_search(palabra_clave)
 
     def extraer_puestos(self, timeout: int = 10) -> List[JobData]:
+        self._last_card_count = None
+        network_records = self._extract_from_network(timeout=min(timeout, 3))
+        if network_records:
+            return network_records
         try:
-            return self._extract_from_links(timeout=timeout)
+            records = self._extract_from_links(timeout=timeout)
         except Exception:
             return []
+        for _ in records:
+            self._branch("origen", "dom")
+        return records
 
     def extraer_todos_los_puestos(self, timeout: int = 10, page_wait: float = 1.0) -> List[JobData]:
         return self.gather_paginated(
             extractor=lambda: self.extraer_puestos(timeout=timeout),
             navigator=self.navegar_a_pagina,
             page_wait=page_wait,
+            workers=self.page_workers,
+            shard_extractor=lambda shard: shard.extraer_puestos(timeout=timeout),
         )
 
+    def page_url(self, numero: int) -> Optional[str]:
+        if numero < 1 or not self._search_url:
+            return None
+        return self._with_page(self._search_url, numero)
+
     def navegar_a_pagina(self, numero: int) -> bool:
         try:
             current = self.driver.current_url or ""
-            parsed = urlparse.urlparse(current)
-            query = urlparse.parse_qs(parsed.query)
-            query["page"] = [str(numero)]
-            new_query = urlparse.urlencode(query, doseq=True)
-            refreshed = urlparse.urlunparse(
-                (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
-            )
-            self.driver.get(refreshed)
+            self._navigate(self._with_page(current, numero))
             time.sleep(1)
             return True
+        except BlockedPageError:
+            raise
         except Exception:
             return False
 
+    def _with_page(self, url: str, numero: int) -> str:
+        parsed = urlparse.urlparse(url)
+        query = urlparse.parse_qs(parsed.query)
+        query["page"] = [str(numero)]
+        new_query = urlparse.urlencode(query, doseq=True)
+        return urlparse.urlunparse(
+            (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
+        )
+
+    def _records_from_payload(self, payload: Any) -> List[JobData]:
+        return self._records_from_avisos(find_dicts_with_keys(payload, ("id", "titulo")))
+
+    def _records_from_avisos(self, avisos: List[Dict[str, Any]]) -> List[JobData]:
+        payloads: List[JobData] = []
+        for aviso in avisos:
+            title = str(aviso.get("titulo") or "").strip()
+            aviso_id = str(aviso.get("id") or "").strip()
+            if not title or not aviso_id:
+                continue
+            company = "" if aviso.get("confidencial") else str(aviso.get("empresa") or "").strip()
+            payloads.append({"titulo": title, "url": self._build_aviso_url(title, aviso_id), "empresa": company})
+        return payloads
+
+    def _build_aviso_url(self, title: str, aviso_id: str) -> str:
+        ascii_title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii")
+        slug = re.sub(r"[^a-z0-9]+", "-", ascii_title.lower()).strip("-")
+        return f"{self.SITE_ROOT}/empleos/{slug}-{aviso_id}.html"
+
+    def _request_api_page(
+        self, palabra_clave: str, hoy: bool, dias: int, page: int, size: int, timeout: float
+    ) -> Dict[str, Any]:
+        query = urlparse.urlencode({"pageSize": size, "page": page, "sort": "RECIENTES"})
+        filtros = []
+        date_filter = self._api_date_filter(hoy=hoy, dias=dias)
+        if date_filter:
+            filtros.append({"id": "dias_fecha_publicacion", "value": date_filter})
+        body = {
+            "filtros": filtros,
+            "busquedaExtendida": False,
+            "tipoDetalle": "full",
+            "withHome": False,
+            "internacional": False,
+            "query": palabra_clave.strip().lower(),
+        }
+        # La caché se indexa por la URL más los parámetros que viajan en el cuerpo
+        cache_url = f"{self.api_url}?{query}&{urlparse.urlencode({'query': body['query'], 'filtro': date_filter})}"
+        cached = self.page_cache.get(cache_url, allow_stale=True) if self.page_cache else None
+        if cached is not None and not self.page_cache.is_stale(cached):
+            return cached.payload
+        headers = dict(self.API_HEADERS)
+        if cached is not None:
+            headers.update(cached.conditional_headers())
+        request = urllib.request.Request(
+            f"{self.api_url}?{query}",
+            data=json.dumps(body).encode("utf-8"),
+            headers=headers,
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                data = json.load(response)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except urllib.error.HTTPError as error:
+            if error.code == 304 and cached is not None:
+                self.page_cache.touch(cached)
+                return cached.payload
+            raise
+        if self.page_cache is not None:
+            self.page_cache.put(cache_url, payload=data, etag=etag, last_modified=last_modified)
+        return data
+
+    def _api_date_filter(self, hoy: bool, dias: int) -> str:
+        # Mismos rangos que _build_listing_url
+        if hoy or dias == 1:
+            return "hoy"
+        if dias == 2:
+            return "menor-a-2-dias"
+        if dias == 3:
+            return "menor-a-3-dias"
+        return ""
+
     def _build_listing_url(self, hoy: bool, dias: int) -> str:
         if hoy or dias == 1:
             return "https://www.bumeran.com.pe/empleos-publicacion-hoy.html"
@@ -87,10 +250,15 @@ class BumeranScraper(BaseScraper):
 
     def _fallback_search(self, palabra_clave: str) -> None:
         try:
+            if self.direct_entry:
+                # El buscador vive en el listado, que en entrada directa no se cargó
+                self._navigate(self._listing_url or self._build_listing_url(hoy=False, dias=0))
             input_elem = self.driver.find_element(By.ID, "react-select-4-input")
             input_elem.clear()
             input_elem.send_keys(palabra_clave)
             input_elem.send_keys(Keys.RETURN)
+        except BlockedPageError:
+            raise
         except Exception:
             pass
 
@@ -100,6 +268,9 @@ class BumeranScraper(BaseScraper):
         anchors = container.find_elements(By.TAG_NAME, "a")
         payloads: List[JobData] = []
         seen = set()
+        # Avisos que mostró la página, aunque luego no se pueda leer su título
+        cards = set()
+        self._last_card_count = 0
         for anchor in anchors:
             try:
                 href = anchor.get_attribute("href")
@@ -109,6 +280,8 @@ class BumeranScraper(BaseScraper):
                     continue
                 if any(token in href for token in ("busqueda-", "publicacion-menor", "relevantes=", "recientes=")):
                     continue
+                cards.add(href)
+                self._last_card_count = len(cards)
                 if href in seen:
                     continue
                 title = self._extract_title(anchor)
@@ -127,8 +300,11 @@ class BumeranScraper(BaseScraper):
             if elements:
                 text = elements[0].text.strip()
                 if text:
+                    self._branch("titulo", tag)
                     return text
-        return (anchor.text or "").split("\n")[0].strip()
+        text = (anchor.text or "").split("\n")[0].strip()
+        self._branch("titulo", "texto" if text else "ninguno")
+        return text
 
     def _extract_company(self, anchor) -> str:
         """Extract company name from Bumeran card.
@@ -168,12 +344,15 @@ class BumeranScraper(BaseScraper):
             for el in elems:
                 txt = _clean(el.text)
                 if _is_company_candidate(txt):
+                    self._branch("empresa", sel)
                     return txt
 
         # Generic fallback: any h3 inside the anchor that passes filters
         for el in anchor.find_elements(By.CSS_SELECTOR, "h3"):
             txt = _clean(el.text)
             if _is_company_candidate(txt):
+                self._branch("empresa", "h3")
                 return txt
 
+        self._branch("empresa", "ninguno")
         return ""
\ No newline at end of file
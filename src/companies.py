@@ -0,0 +1,178 @@
+"""Company name normalisation and alias resolution shared by every source."""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from .text import fold
+
+JobRecord = Dict[str, str]
+
+logger = logging.getLogger(__name__)
+
+# Sufijos societarios que no distinguen a una empresa de otra
+LEGAL_SUFFIXES = frozenset(
+    {"sac", "sa", "saa", "srl", "eirl", "sacs", "scrl", "ltda", "sas", "inc", "llc", "ltd"}
+)
+# Líneas de ubicación que el fallback genérico a veces toma por empresa
+LOCATIONS = frozenset(
+    {
+        "lima", "callao", "arequipa", "cusco", "la libertad", "trujillo", "piura", "lambayeque", "chiclayo",
+        "junin", "huancayo", "ica", "ancash", "puno", "tacna", "loreto", "iquitos", "cajamarca", "peru",
+        "miraflores", "san isidro", "surco", "santiago de surco",
+        "san borja", "la molina", "ate", "cercado de lima", "san miguel", "los olivos", "lince", "jesus maria",
+    }
+)
+# Modalidades de trabajo: nunca son nombre de empresa
+WORK_MODES = frozenset({"remoto", "presencial", "hibrido"})
+_PUNCTUATION = re.compile(r"[^\w\s&]")
+_SPACES = re.compile(r"\s+")
+_DOTTED = re.compile(r"\b((?:[a-z]\.){2,})")
+
+
+def _fold_name(text: str) -> str:
+    text = fold(text)
+    # "S.A.C." -> "sac" antes de quitar la puntuación
+    text = _DOTTED.sub(lambda m: m.group(1).replace(".", ""), text)
+    text = _PUNCTUATION.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def company_tokens(name: str) -> Tuple[str, ...]:
+    tokens = _fold_name(name).split()
+    # Los sufijos solo se descartan al final ("Banco de Crédito del Perú SA" -> banco de credito del peru)
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return tuple(tokens)
+
+
+def company_key(name: str) -> str:
+    """Normalised key: accent-free, casefolded, no punctuation nor legal suffix."""
+    return " ".join(company_tokens(name))
+
+
+def is_location(name: str) -> bool:
+    """``True`` for texts like "Lima, Lima", "San Isidro, Lima - Perú" or "Remoto".
+
+    A single place name ("Ica") is not enough: companies are named after
+    places too, so it also needs a second place or a work mode next to it.
+    """
+    parts = [part.strip() for part in re.split(r"[,\-/|]", fold(name)) if part.strip()]
+    if not parts or not all(part in LOCATIONS or part in WORK_MODES for part in parts):
+        return False
+    return len(parts) > 1 or parts[0] in WORK_MODES
+
+
+class CompanyIndex:
+    """Hash index from normalised company keys to a canonical display name.
+
+    Curated aliases always win. Otherwise the canonical name is the variant
+    seen most often for the key (learned from every record passed to
+    :meth:`apply`). Lookups are memoised per raw string and fall back to an
+    order-insensitive token key, so the per-record cost is a couple of dict hits.
+    """
+
+    MEMO_LIMIT = 100_000
+
+    def __init__(self) -> None:
+        self._curated: Dict[str, str] = {}
+        self._by_tokens: Dict[frozenset, str] = {}
+        self._observed: Dict[str, Counter] = {}
+        self._memo: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(set(self._curated) | set(self._observed))
+
+    def add_alias(self, alias: str, canonical: str) -> None:
+        """Curate ``alias`` (and ``canonical`` itself) to resolve to ``canonical``."""
+        with self._lock:
+            for name in (alias, canonical):
+                key = company_key(name)
+                if key:
+                    self._curated[key] = canonical
+                    self._by_tokens[frozenset(key.split())] = key
+            self._memo.clear()
+
+    def key_for(self, name: str) -> str:
+        """Resolve a raw company text to its index key ("" when it is not a company)."""
+        cached = self._memo.get(name)
+        if cached is not None:
+            return cached
+        key = company_key(name)
+        if key not in self._curated and is_location(name):
+            key = ""
+        if key and key not in self._curated and key not in self._observed:
+            key = self._by_tokens.get(frozenset(key.split()), key)
+        if len(self._memo) >= self.MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[name] = key
+        return key
+
+    def canonical(self, key: str) -> str:
+        curated = self._curated.get(key)
+        if curated is not None:
+            return curated
+        variants = self._observed.get(key)
+        if not variants:
+            return ""
+        return variants.most_common(1)[0][0]
+
+    def learn(self, name: str) -> str:
+        key = self.key_for(name)
+        if not key:
+            return key
+        display = _SPACES.sub(" ", name).strip()
+        with self._lock:
+            variants = self._observed.get(key)
+            if variants is None:
+                variants = self._observed[key] = Counter()
+                self._by_tokens.setdefault(frozenset(key.split()), key)
+            variants[display] += 1
+        return key
+
+    def apply(self, record: JobRecord) -> JobRecord:
+        """Set the canonical ``empresa`` and an ``empresa_id`` on ``record`` (in place)."""
+        raw = record.get("empresa") or ""
+        key = self.learn(raw) if raw else ""
+        record["empresa"] = self.canonical(key) if key else ""
+        record["empresa_id"] = key
+        return record
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, aliases_csv: Optional[str] = None) -> "CompanyIndex":
+        index = cls()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            for alias, canonical in data.get("aliases", {}).items():
+                index.add_alias(alias, canonical)
+            for key, variants in data.get("observed", {}).items():
+                index._observed[key] = Counter(variants)
+                index._by_tokens.setdefault(frozenset(key.split()), key)
+        if aliases_csv:
+            with open(aliases_csv, "r", encoding="utf-8", newline="") as handle:
+                for row in csv.DictReader(handle):
+                    if row.get("alias") and row.get("empresa"):
+                        index.add_alias(row["alias"], row["empresa"])
+        return index
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            data = {
+                "aliases": dict(sorted(self._curated.items())),
+                "observed": {key: dict(variants) for key, variants in sorted(self._observed.items())},
+            }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        logger.info("Índice de empresas guardado en %s (%d empresas)", path, len(self))
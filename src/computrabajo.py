@@ -2,25 +2,38 @@
 
 from __future__ import annotations
 
-import re
 import time
 from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from .computrabajo_urls import (
+    SITE_ROOT,
+    detail_url,
+    keyword_from_url,
+    page_search_url,
+    replace_page,
+    search_base_url,
+)
 from .core.base import BaseScraper
+from .core.blocking import BlockedPageError
 
 JobData = Dict[str, Any]
 
 
 class ComputrabajoScraper(BaseScraper):
+    source_name = "computrabajo"
     BASE_URL = "https://www.computrabajo.com.pe/"
-    SITE_ROOT = "https://pe.computrabajo.com"
+    SITE_ROOT = SITE_ROOT
+    SHARD_STATE = ("pubdate", "last_keyword")
+    page_size = 20
+    TOTAL_RESULTS_SELECTORS = ("div.box_title", "h1 span.fwB", "h1")
 
-    def __init__(self, driver=None, headless: Optional[bool] = True) -> None:
-        super().__init__(driver=driver, headless=headless)
+    def __init__(self, driver=None, headless: Optional[bool] = True, backend=None) -> None:
+        super().__init__(driver=driver, headless=headless, backend=backend)
         self.pubdate = 0
         self.last_keyword = ""
         self._last_page_url: str = ""
@@ -32,31 +45,38 @@ class ComputrabajoScraper(BaseScraper):
             self.pubdate = 3
         else:
             self.pubdate = 0
-        self.driver.get(self.BASE_URL)
+        if self.direct_entry:
+            # Las búsquedas se construyen sobre SITE_ROOT: la portada solo redirige
+            self._last_page_url = ""
+            return
+        self._navigate(self.BASE_URL)
         self._last_page_url = getattr(self.driver, "current_url", self.BASE_URL)
 
     def buscar_vacante(self, palabra_clave: str = "") -> None:
-        keyword = palabra_clave.replace(" ", "-").lower()
-        url = f"{self.SITE_ROOT}/trabajo-de-{keyword}"
-        if self.pubdate:
-            url = f"{url}?pubdate={self.pubdate}"
+        url = search_base_url(palabra_clave, self.pubdate)
         try:
-            self.driver.get(url)
             self.last_keyword = palabra_clave
-            self._last_page_url = getattr(self.driver, "current_url", url)
+            self._open_listing(url)
+            self._last_page_url = "" if self._pending_listing else getattr(self.driver, "current_url", url)
+        except BlockedPageError:
+            raise
         except Exception:
             pass
 
     def extraer_puestos(self, timeout: int = 10) -> List[JobData]:
+        self._last_card_count = None
         primary_wait = WebDriverWait(self.driver, min(timeout, 3))
         try:
             container = primary_wait.until(
                 EC.presence_of_element_located((By.ID, "offersGridOfferContainer"))
             )
+            self._branch("contenedor", "#offersGridOfferContainer")
         except Exception:
             fallback_wait = WebDriverWait(self.driver, min(timeout, 3))
             container = fallback_wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "main")))
+            self._branch("contenedor", "main")
         anchors = container.find_elements(By.CSS_SELECTOR, "article a.js-o-link.fc_base")
+        self._last_card_count = len(anchors)
         base_url = self._build_base_search_url()
         payloads: List[JobData] = []
         seen = set()
@@ -79,19 +99,21 @@ class ComputrabajoScraper(BaseScraper):
             extractor=lambda: self.extraer_puestos(timeout=timeout),
             navigator=self.navegar_a_pagina,
             page_wait=page_wait,
+            workers=self.page_workers,
+            shard_extractor=lambda shard: shard.extraer_puestos(timeout=timeout),
         )
 
+    def page_url(self, numero: int) -> Optional[str]:
+        if numero < 1 or not self.last_keyword:
+            return None
+        return page_search_url(self._build_base_search_url(), numero)
+
     def navegar_a_pagina(self, numero: int) -> bool:
         try:
-            current = self.driver.current_url or ""
-            if "p=" in current:
-                target = re.sub(r"p=\d+", f"p={numero}", current)
-            else:
-                separator = "&" if "?" in current else "?"
-                target = f"{current}{separator}p={numero}"
+            target = replace_page(self.driver.current_url or "", numero)
             if self._last_page_url and target == self._last_page_url:
                 return False
-            self.driver.get(target)
+            self._navigate(target)
             new_url = getattr(self.driver, "current_url", target)
             # Si la URL no cambia, asumimos que no hay más páginas
             if self._last_page_url and new_url == self._last_page_url:
@@ -99,30 +121,24 @@ class ComputrabajoScraper(BaseScraper):
             self._last_page_url = new_url
             time.sleep(0.2)
             return True
+        except BlockedPageError:
+            raise
         except Exception:
             return False
 
+    def restore_search_state(self, url: str) -> None:
+        # Las URLs de detalle se construyen sobre la búsqueda original
+        keyword = keyword_from_url(url)
+        if keyword:
+            self.last_keyword = keyword
+        pubdate = parse_qs(urlparse(url).query).get("pubdate", ["0"])[0]
+        self.pubdate = int(pubdate) if pubdate.isdigit() else 0
+
     def _build_base_search_url(self) -> str:
-        keyword = self.last_keyword.replace(" ", "-").lower() if self.last_keyword else ""
-        url = f"{self.SITE_ROOT}/trabajo-de-{keyword}"
-        if self.pubdate:
-            url = f"{url}?pubdate={self.pubdate}"
-        return url
+        return search_base_url(self.last_keyword, self.pubdate)
 
     def _build_detail_url(self, href: str, base_search: str) -> str:
-        tokens = re.findall(r"([A-Za-z0-9]{8,})", href)
-        token = None
-        for candidate in tokens:
-            if re.search(r"\d", candidate):
-                token = candidate
-                break
-        if not token and tokens:
-            token = max(tokens, key=len)
-        if token:
-            return f"{base_search}#{token}"
-        if href.startswith("/"):
-            return f"{self.SITE_ROOT}{href}"
-        return href
+        return detail_url(href, base_search)
 
     def _extract_company(self, anchor, title_text: str) -> str:
         # In Computrabajo, the company name is usually within the same article card.
@@ -143,6 +159,7 @@ class ComputrabajoScraper(BaseScraper):
             search_roots.insert(0, card)
 
         for root in search_roots:
+            scope = "article" if root is card else "a"
             for sel in selectors:
                 elems = root.find_elements(By.CSS_SELECTOR, sel)
                 for e in elems:
@@ -154,5 +171,7 @@ class ComputrabajoScraper(BaseScraper):
                         continue
                     if txt.lower().startswith("hace "):
                         continue
+                    self._branch("empresa", f"{scope} {sel}")
                     return txt.split("\n")[0]
+        self._branch("empresa", "ninguno")
         return ""
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""Computrabajo URL builders and offer-ID extraction (precompiled and memoised)."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit
+
+SITE_ROOT = "https://pe.computrabajo.com"
+
+# Identificador de la oferta: bloque alfanumérico largo dentro del href
+_TOKEN = re.compile(r"[A-Za-z0-9]{8,}")
+_PAGE_PARAM = re.compile(r"p=\d+")
+_KEYWORD_PATH = re.compile(r"/trabajo-de-([^/?#]+)")
+
+
+@lru_cache(maxsize=256)
+def search_base_url(keyword: str, pubdate: int = 0) -> str:
+    """Listing URL of a search (page 1); also the base of the detail URLs."""
+    slug = keyword.replace(" ", "-").lower() if keyword else ""
+    url = f"{SITE_ROOT}/trabajo-de-{slug}"
+    if pubdate:
+        url = f"{url}?pubdate={pubdate}"
+    return url
+
+
+def page_search_url(base: str, numero: int) -> str:
+    if numero == 1:
+        return base
+    separator = "&" if "?" in base else "?"
+    return f"{base}{separator}p={numero}"
+
+
+def replace_page(url: str, numero: int) -> str:
+    """Point ``url`` at page ``numero`` (adding the ``p`` parameter when missing)."""
+    if "p=" in url:
+        return _PAGE_PARAM.sub(f"p={numero}", url)
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}p={numero}"
+
+
+def keyword_from_url(url: str) -> Optional[str]:
+    match = _KEYWORD_PATH.search(urlsplit(url).path)
+    return match.group(1) if match else None
+
+
+@lru_cache(maxsize=16384)
+def offer_token(href: str) -> str:
+    """The offer identifier inside a card href ("" when there is none).
+
+    The first long alphanumeric block containing a digit wins; otherwise the
+    longest one. Blocks only hold ASCII letters and digits, so "has a digit"
+    is simply ``not isalpha()``.
+    """
+    longest = ""
+    for match in _TOKEN.finditer(href):
+        token = match.group()
+        if not token.isalpha():
+            return token
+        if len(token) > len(longest):
+            longest = token
+    return longest
+
+
+@lru_cache(maxsize=16384)
+def detail_url(href: str, base_search: str) -> str:
+    """Stable detail URL of a card: ``<search base>#<offer token>``."""
+    token = offer_token(href)
+    if token:
+        return f"{base_search}#{token}"
+    if href.startswith("/"):
+        return f"{SITE_ROOT}{href}"
+    return href
+
+
+def offer_id(url: str) -> Optional[str]:
+    """Offer identifier of a Computrabajo detail URL or card href.
+
+    The same offer listed by two searches (different keyword or ``pubdate``)
+    yields the same identifier, unlike its URL.
+    """
+    if not url:
+        return None
+    _, hash_sign, fragment = url.partition("#")
+    if hash_sign and fragment and _TOKEN.fullmatch(fragment):
+        return fragment
+    # Sin fragmento solo se acepta un bloque con dígitos: "computrabajo" o la
+    # palabra clave de la ruta no identifican una oferta.
+    token = offer_token(url)
+    return token if token and not token.isalpha() else None
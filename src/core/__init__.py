@@ -1,9 +1,25 @@
 """Core utilities for scraper infrastructure."""
 
-from .browser import create_firefox_driver
+from .backend import (
+    DriverBackend,
+    LocalChromiumBackend,
+    LocalFirefoxBackend,
+    RemoteGridBackend,
+    resolve_backend,
+)
+from .browser import create_chromium_driver, create_firefox_driver, create_remote_driver
 from .base import BaseScraper
+from .network import NetworkCapture
 
 __all__ = [
     "BaseScraper",
+    "DriverBackend",
+    "LocalChromiumBackend",
+    "LocalFirefoxBackend",
+    "NetworkCapture",
+    "RemoteGridBackend",
+    "create_chromium_driver",
     "create_firefox_driver",
+    "create_remote_driver",
+    "resolve_backend",
 ]
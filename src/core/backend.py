@@ -0,0 +1,246 @@
+"""Driver backends deciding where browser sessions are started."""
+
+from __future__ import annotations
+
+import logging
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .browser import create_chromium_driver, create_firefox_driver, create_remote_driver
+from .profiles import ProfileTemplate
+
+logger = logging.getLogger(__name__)
+
+
+class DriverBackend(ABC):
+    """Source of WebDriver sessions for scrapers.
+
+    ``capacity`` is the number of sessions that may be alive at the same time;
+    ``0`` means unbounded.
+    """
+
+    capacity: int = 0
+
+    @abstractmethod
+    def acquire(self, headless: Optional[bool] = None, timeout: Optional[float] = None) -> WebDriver:
+        """Start or hand out a session; raise ``TimeoutError`` if none is free within ``timeout``."""
+
+    def release(self, driver: WebDriver) -> None:
+        driver.quit()
+
+    def shutdown(self) -> None:
+        """Terminate any session kept alive by the backend."""
+
+
+class LocalFirefoxBackend(DriverBackend):
+    """Starts a local ``webdriver.Firefox`` per session (historic behaviour).
+
+    With a ``profile_template`` every session starts on a clone of it; with a
+    ``capacity`` at most that many sessions are alive at once.
+    """
+
+    def __init__(self, profile_template: Optional[ProfileTemplate] = None, capacity: int = 0) -> None:
+        self.profile_template = profile_template
+        self.capacity = capacity
+        self._slots = threading.BoundedSemaphore(capacity) if capacity else None
+
+    def acquire(self, headless: Optional[bool] = None, timeout: Optional[float] = None) -> WebDriver:
+        if self._slots is not None and not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"Ninguna sesión de Firefox libre en {timeout}s")
+        try:
+            return create_firefox_driver(headless=headless, profile_template=self.profile_template)
+        except Exception:
+            if self._slots is not None:
+                self._slots.release()
+            raise
+
+    def release(self, driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+
+class LocalChromiumBackend(DriverBackend):
+    """Starts local Chromium sessions with DevTools network capture enabled.
+
+    With a ``capacity`` at most that many sessions are alive at once.
+    """
+
+    def __init__(self, capture_network: bool = True, capacity: int = 0) -> None:
+        self.capture_network = capture_network
+        self.capacity = capacity
+        self._slots = threading.BoundedSemaphore(capacity) if capacity else None
+
+    def acquire(self, headless: Optional[bool] = None, timeout: Optional[float] = None) -> WebDriver:
+        if self._slots is not None and not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"Ninguna sesión de Chromium libre en {timeout}s")
+        try:
+            return create_chromium_driver(headless=headless, capture_network=self.capture_network)
+        except Exception:
+            if self._slots is not None:
+                self._slots.release()
+            raise
+
+    def release(self, driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+
+class _GridNode:
+    def __init__(self, url: str, slots: int) -> None:
+        self.url = url
+        self.slots = slots
+        self.active = 0
+        self.idle: List[Tuple[Optional[bool], WebDriver]] = []
+
+    @property
+    def free(self) -> int:
+        return self.slots - self.active
+
+
+class RemoteGridBackend(DriverBackend):
+    """Runs sessions on one or more Selenium Grid / standalone nodes.
+
+    Each node contributes ``slots_per_node`` concurrent sessions. ``acquire``
+    picks the least loaded node and blocks while every slot is busy. Released
+    sessions are kept idle and handed out again (after clearing cookies) so the
+    remote browser does not have to be started for every source; an idle
+    session still holds its slot, so it is closed before a new session (e.g.
+    with another ``headless`` setting) would overflow the node.
+    """
+
+    def __init__(
+        self,
+        grid_urls: Sequence[str],
+        slots_per_node: int = 1,
+        reuse_sessions: bool = True,
+    ) -> None:
+        if not grid_urls:
+            raise ValueError("Se requiere al menos una URL de Selenium Grid")
+        self.nodes = [_GridNode(url, max(1, slots_per_node)) for url in grid_urls]
+        self.capacity = sum(node.slots for node in self.nodes)
+        self.reuse_sessions = reuse_sessions
+        self._owners: Dict[int, _GridNode] = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, headless: Optional[bool] = None, timeout: Optional[float] = None) -> WebDriver:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                node = max(self.nodes, key=lambda candidate: candidate.free)
+                if node.free > 0:
+                    node.active += 1
+                    reusable = self._pop_idle(node, headless)
+                    evicted = self._evict_idle(node) if reusable is None else []
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No hay sesiones libres en Selenium Grid")
+                self._condition.wait(remaining)
+
+        if reusable is not None and self._is_alive(reusable):
+            logger.debug("Reutilizando sesión remota en %s", node.url)
+            with self._condition:
+                self._owners[id(reusable)] = node
+            return reusable
+        if reusable is not None:
+            self._quit_quietly(reusable)
+        for idle in evicted:
+            self._quit_quietly(idle)
+
+        try:
+            driver = create_remote_driver(node.url, headless=headless)
+        except Exception:
+            with self._condition:
+                node.active -= 1
+                self._condition.notify()
+            raise
+        logger.debug("Sesión remota creada en %s", node.url)
+        setattr(driver, "_scraper_headless", headless)
+        with self._condition:
+            self._owners[id(driver)] = node
+        return driver
+
+    def release(self, driver: WebDriver) -> None:
+        with self._condition:
+            node = self._owners.pop(id(driver), None)
+        if node is None:
+            self._quit_quietly(driver)
+            return
+        keep = self.reuse_sessions and self._reset_session(driver)
+        with self._condition:
+            node.active -= 1
+            if keep:
+                node.idle.append((getattr(driver, "_scraper_headless", None), driver))
+            self._condition.notify()
+        if not keep:
+            self._quit_quietly(driver)
+
+    def shutdown(self) -> None:
+        with self._condition:
+            idle = [driver for node in self.nodes for _, driver in node.idle]
+            for node in self.nodes:
+                node.idle.clear()
+        for driver in idle:
+            self._quit_quietly(driver)
+
+    def _pop_idle(self, node: _GridNode, headless: Optional[bool]) -> Optional[WebDriver]:
+        for index, (idle_headless, driver) in enumerate(node.idle):
+            if idle_headless == headless:
+                del node.idle[index]
+                return driver
+        return None
+
+    def _evict_idle(self, node: _GridNode) -> List[WebDriver]:
+        """Oldest idle sessions to close so a new session fits in the node's slots."""
+        excess = max(0, node.active + len(node.idle) - node.slots)
+        evicted = [driver for _, driver in node.idle[:excess]]
+        del node.idle[:excess]
+        return evicted
+
+    def _is_alive(self, driver: WebDriver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _reset_session(self, driver: WebDriver) -> bool:
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception:
+            logger.debug("No se pudo reutilizar la sesión remota, se descarta")
+            return False
+
+    def _quit_quietly(self, driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            logger.debug("Fallo al cerrar sesión remota", exc_info=True)
+
+
+def resolve_backend(grid_urls: Optional[Sequence[str]] = None, slots_per_node: int = 1) -> Optional[DriverBackend]:
+    """Build the backend for the given Grid URLs.
+
+    When no URL is passed the ``SCRAPER_GRID_URL`` environment variable
+    (comma separated) is used. Returns ``None`` to keep local Firefox sessions.
+    """
+    urls = [url for url in (grid_urls or []) if url]
+    if not urls:
+        env_value = os.getenv("SCRAPER_GRID_URL", "")
+        urls = [url.strip() for url in env_value.split(",") if url.strip()]
+    if not urls:
+        return None
+    return RemoteGridBackend(urls, slots_per_node=slots_per_node)
@@ -2,54 +2,441 @@
 
 from __future__ import annotations
 
+import copy
+import logging
+import math
+import re
+import threading
 import time
-from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
+from .backend import DriverBackend
+from .blocking import BlockedPageError, BlockRegistry, detect_block, host_of
 from .browser import create_firefox_driver
+from .cache import CachedPage, PageCache
+from .extraction import ExtractionStats
+from .logcontext import in_current_context, log_context
+from .network import NetworkCapture
+from .redirects import RedirectCache
+from .resources import ResourceGovernor
 
 JobPayload = Dict[str, str]
 
+logger = logging.getLogger(__name__)
+
+_COUNT_NEAR_LABEL = re.compile(
+    r"(\d{1,3}(?:[.,]\d{3})+|\d+)\s*(?:empleos?|ofertas?|avisos?|resultados?|vacantes?)",
+    re.IGNORECASE,
+)
+_BARE_COUNT = re.compile(r"\d{1,3}(?:[.,]\d{3})+|\d+")
+
+
+def parse_results_count(text: str) -> Optional[int]:
+    """Read a results counter such as ``"1.234 empleos"`` or ``"Página 1 de 56 ofertas"``.
+
+    Only numbers followed by a results label, or a text that is just a number,
+    are accepted so titles like "Analista 3D" are not taken for a counter.
+    """
+    text = (text or "").strip()
+    match = _COUNT_NEAR_LABEL.search(text)
+    if match:
+        value = match.group(1)
+    elif _BARE_COUNT.fullmatch(text):
+        value = text
+    else:
+        return None
+    return int(re.sub(r"[.,]", "", value))
+
 
 class BaseScraper:
     """Base Selenium scraper with pagination helpers."""
 
     max_pages: int = 50
+    # "dom" lee las tarjetas del DOM; "network" usa las respuestas JSON
+    # capturadas por DevTools (requiere Chromium) y cae al DOM si no hay datos.
+    extraction_mode: str = "dom"
+    NETWORK_PATTERNS: Tuple[str, ...] = ()
+    # Número de navegadores que se reparten las páginas de una misma búsqueda
+    page_workers: int = 1
+    # Segundos que se espera un navegador libre para cada shard adicional
+    shard_acquire_timeout: float = 5.0
+    # Intentos por página en un shard antes de darla por fallida
+    shard_page_attempts: int = 2
+    # Atributos de estado de búsqueda que necesita un shard para construir
+    # las URLs de página (ver ``page_url``)
+    SHARD_STATE: Tuple[str, ...] = ()
+    # Tarjetas de una página completa: una página más corta es la última
+    page_size: Optional[int] = None
+    # Resultados que avanza cada página (para convertir el total en páginas)
+    results_per_page: Optional[int] = None
+    TOTAL_RESULTS_SELECTORS: Tuple[str, ...] = ()
+    page_cache: Optional[PageCache] = None
+    # Archivo de snapshots HTML (ver ``src/replay.py``); se rellena por ejecución
+    snapshot_archive: Optional[Any] = None
+    source_name: str = ""
+    # Reinicia el navegador a mitad de la paginación por memoria o páginas
+    resource_governor: Optional[ResourceGovernor] = None
+    # Entrada directa: se calcula la URL de búsqueda y se navega una sola vez,
+    # sin cargar antes la portada del sitio
+    direct_entry: bool = True
+    # Redirecciones de dominio ya vistas (ver ``src/core/redirects.py``)
+    redirect_cache: Optional[RedirectCache] = None
+    # Hosts bloqueados y su enfriamiento (ver ``src/core/blocking.py``)
+    block_registry: Optional[BlockRegistry] = None
 
     def __init__(
         self,
         driver: Optional[WebDriver] = None,
         headless: Optional[bool] = True,
+        backend: Optional[DriverBackend] = None,
     ) -> None:
-        self.driver: WebDriver = driver or create_firefox_driver(headless=headless)
+        self.headless = headless
+        self.backend = backend
+        self._driver: Optional[WebDriver] = driver
+        self._network: Optional[NetworkCapture] = None
+        self._pending_listing: Optional[str] = None
+        self._announced_total: Optional[int] = None
+        self._pages_on_driver = 0
+        # Tarjetas que mostró la última página del DOM, antes de descartar
+        # las que no generan registro (ver ``_observed_page_size``)
+        self._last_card_count: Optional[int] = None
+        # Tarjetas por página y rama de selector de cada campo (ver src/core/extraction.py)
+        self.extraction_stats = ExtractionStats()
+
+    @property
+    def driver(self) -> WebDriver:
+        """Browser session, started on first use."""
+        if self._driver is None:
+            self._driver = self._create_driver()
+        return self._driver
+
+    @driver.setter
+    def driver(self, value: Optional[WebDriver]) -> None:
+        self._driver = value
+
+    def _create_driver(self, timeout: Optional[float] = None) -> WebDriver:
+        governor = self.resource_governor
+        if governor is not None:
+            governor.wait_for_budget()
+        if self.backend is not None:
+            driver = self.backend.acquire(headless=self.headless, timeout=timeout)
+        else:
+            driver = create_firefox_driver(headless=self.headless)
+        if governor is not None:
+            governor.register(driver)
+        return driver
 
     def close(self) -> None:
-        """Terminate the underlying browser session."""
-        if not getattr(self, "driver", None):
+        """Terminate (or hand back to the backend) the underlying browser session."""
+        driver = getattr(self, "_driver", None)
+        if not driver:
             return
         try:
-            self.driver.quit()
+            if self.resource_governor is not None:
+                self.resource_governor.unregister(driver)
+            if self.backend is not None:
+                self.backend.release(driver)
+            else:
+                driver.quit()
         finally:
-            self.driver = None  # type: ignore[assignment]
+            self._driver = None
+            self._network = None
+            self._pages_on_driver = 0
+
+    def _extract_from_network(self, timeout: float = 3.0) -> List[JobPayload]:
+        """Build payloads from captured JSON responses (empty outside network mode)."""
+        if self.extraction_mode != "network":
+            return []
+        self._network_capture()
+        deadline = time.monotonic() + timeout
+        while True:
+            records: List[JobPayload] = []
+            for _url, payload in self._network.json_payloads():
+                records.extend(self._records_from_payload(payload))
+            if records or time.monotonic() >= deadline:
+                for _ in records:
+                    self._branch("origen", "red")
+                return records
+            time.sleep(0.2)
+
+    def _network_capture(self) -> NetworkCapture:
+        if self._network is None:
+            self._network = NetworkCapture(self.driver, self.NETWORK_PATTERNS)
+        return self._network
+
+    def _branch(self, field_name: str, branch: str) -> None:
+        self.extraction_stats.branch(field_name, branch)
+
+    def _records_from_payload(self, payload: Any) -> List[JobPayload]:
+        """Map a captured JSON document to job payloads; sources override it."""
+        return []
+
+    def page_url(self, numero: int) -> Optional[str]:
+        """Deterministic listing URL for page ``numero`` (``None`` if unknown)."""
+        return None
+
+    def read_total_results(self) -> Optional[int]:
+        """Total results announced by the current listing page, if shown."""
+        for selector in self.TOTAL_RESULTS_SELECTORS:
+            try:
+                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                for element in elements:
+                    total = parse_results_count(element.text or "")
+                    if total is not None:
+                        return total
+            except Exception:
+                continue
+        return None
+
+    def estimate_total_pages(self) -> Optional[int]:
+        """Pages needed for the announced total, or ``None`` when unknown."""
+        per_page = self.results_per_page or self.page_size
+        if not per_page:
+            return None
+        total = self.read_total_results()
+        self._announced_total = total
+        return self._pages_for_total(total)
+
+    def _pages_for_total(self, total: Optional[int]) -> Optional[int]:
+        per_page = self.results_per_page or self.page_size
+        if total is None or not per_page:
+            return None
+        pages = max(1, math.ceil(total / per_page))
+        logger.debug("%s anuncia %d resultados (%d páginas)", self.__class__.__name__, total, pages)
+        return pages
+
+    def is_last_page(self, payloads: List[JobPayload]) -> bool:
+        """Short-page detection against ``page_size``."""
+        if not self.page_size:
+            return False
+        return self._observed_page_size(payloads) < self.page_size
+
+    def _observed_page_size(self, payloads: List[JobPayload]) -> int:
+        # Tarjetas sin enlace, patrocinadas o repetidas no generan registro;
+        # se cuenta lo que la página mostró para no cortar antes de tiempo.
+        if self._last_card_count is not None:
+            return max(self._last_card_count, len(payloads))
+        return len(payloads)
+
+    def _is_short_cached(self, cached: CachedPage) -> bool:
+        if not self.page_size:
+            return False
+        seen = cached.card_count if cached.card_count is not None else len(cached.records)
+        return seen < self.page_size
+
+    def _navigate(self, url: str) -> None:
+        """``driver.get`` through the redirect cache, aborting on captchas and blocked hosts."""
+        cache = self.redirect_cache
+        target = cache.resolve(url) if cache is not None else url
+        if self.block_registry is not None:
+            self.block_registry.check(target)
+        if self.extraction_mode == "network":
+            # Lo recibido antes (portada, página anterior) no pertenece a la página que se abre
+            self._network_capture().discard()
+        if self._network is not None:
+            self._network.last_document_status = None
+        self.driver.get(target)
+        landed = getattr(self.driver, "current_url", "")
+        self._check_block(landed if isinstance(landed, str) and landed else target)
+        if cache is not None:
+            cache.learn(target, landed)
+
+    def _check_block(self, url: str) -> None:
+        """Raise :class:`BlockedPageError` when the page just loaded is a captcha or block."""
+        status = None
+        if self._network is not None:
+            self._network.drain()
+            status = self._network.last_document_status
+        reason = detect_block(self.driver, status)
+        if reason:
+            raise BlockedPageError(host_of(url), reason, url)
+
+    def _open_listing(self, url: str) -> None:
+        """Load the first listing page, deferring it while page 1 is cached."""
+        if self._cached_page(1) is not None:
+            self._pending_listing = url
+            return
+        self._pending_listing = None
+        self._navigate(url)
+
+    def _cached_page(self, numero: int) -> Optional[CachedPage]:
+        if self.page_cache is None:
+            return None
+        url = self.page_url(numero)
+        if not url:
+            return None
+        cached = self.page_cache.get(url)
+        if cached is not None:
+            logger.debug("Página %d servida desde caché: %s", numero, url)
+        return cached
+
+    def _store_page(self, numero: int, records: List[JobPayload]) -> None:
+        """Persist a freshly loaded page to the cache and/or snapshot archive."""
+        wants_cache_html = self.page_cache is not None and self.page_cache.store_html
+        if self.page_cache is None and self.snapshot_archive is None:
+            return
+        html = self._page_html() if (wants_cache_html or self.snapshot_archive is not None) else None
+        url = self.page_url(numero) or getattr(self.driver, "current_url", "") or ""
+        if self.snapshot_archive is not None and html is not None:
+            try:
+                self.snapshot_archive.capture(self.source_name, numero, url, html)
+            except OSError:
+                logger.warning("No se pudo archivar la página %d", numero, exc_info=True)
+        if self.page_cache is None or not self.page_url(numero):
+            return
+        try:
+            self.page_cache.put(
+                url,
+                records,
+                html=html,
+                total=self._announced_total if numero == 1 else None,
+                card_count=self._observed_page_size(records),
+            )
+        except OSError:
+            logger.warning("No se pudo guardar la página %d en caché", numero, exc_info=True)
+
+    def _page_html(self) -> Optional[str]:
+        try:
+            source = self.driver.page_source
+        except Exception:
+            return None
+        return source if isinstance(source, str) else None
+
+    def restore_search_state(self, url: str) -> None:
+        """Rebuild the search state from a listing URL (used when replaying pages)."""
+
+    def _maybe_recycle(self, numero: int) -> bool:
+        """Restart the browser before page ``numero`` when the governor asks for it.
+
+        Only done when the page can be reopened by URL; returns ``True`` if the
+        driver was replaced, so the caller must navigate directly to the page.
+        """
+        governor = self.resource_governor
+        if governor is None or self._driver is None or not self.page_url(numero):
+            return False
+        if not governor.should_recycle(self._driver, self._pages_on_driver):
+            return False
+        try:
+            self.close()
+        except Exception:
+            logger.warning("Fallo al cerrar el navegador a reciclar", exc_info=True)
+        return True
+
+    def _load_page(
+        self,
+        numero: int,
+        navigator: Optional[Callable[[int], bool]],
+        page_wait: float,
+        jumped: bool = False,
+    ) -> bool:
+        """Bring the driver to page ``numero``; ``jumped`` means the previous page came from cache."""
+        if numero == 1:
+            if self._pending_listing:
+                self._navigate(self._pending_listing)
+                self._pending_listing = None
+            self._pages_on_driver += 1
+            return True
+        target = self.page_url(numero) if (jumped or self._pending_listing) else None
+        if target:
+            # El navegador no está en la página anterior: se va directo a la URL
+            self._pending_listing = None
+            self._navigate(target)
+        elif navigator and not navigator(numero):
+            return False
+        self._pages_on_driver += 1
+        if page_wait:
+            time.sleep(page_wait)
+        return True
+
+    def spawn_shard(self) -> "BaseScraper":
+        """Create a sibling scraper with its own driver and the same search state."""
+        shard = self.__class__(headless=self.headless, backend=self.backend)
+        for attr in self.SHARD_STATE:
+            setattr(shard, attr, copy.copy(getattr(self, attr)))
+        shard.extraction_mode = self.extraction_mode
+        shard.page_cache = self.page_cache
+        shard.snapshot_archive = self.snapshot_archive
+        shard.resource_governor = self.resource_governor
+        shard.direct_entry = self.direct_entry
+        shard.redirect_cache = self.redirect_cache
+        shard.block_registry = self.block_registry
+        shard.extraction_stats = self.extraction_stats
+        return shard
+
+    def _reserve_shards(self, count: int) -> List["BaseScraper"]:
+        """Spawn up to ``count`` shards that already hold a browser.
+
+        Each shard waits at most ``shard_acquire_timeout`` for a session, so a
+        backend without free slots (e.g. a Grid with one slot held by this
+        scraper) paginates with fewer shards instead of blocking forever.
+        """
+        shards: List[BaseScraper] = []
+        for _ in range(count):
+            shard = self.spawn_shard()
+            try:
+                shard.driver = shard._create_driver(timeout=self.shard_acquire_timeout)
+            except Exception:
+                logger.info(
+                    "Sin navegador libre para otro shard; se pagina con %d", len(shards) + 1, exc_info=True
+                )
+                break
+            shards.append(shard)
+        return shards
 
     def gather_paginated(
         self,
         extractor: Callable[[], List[JobPayload]],
         navigator: Optional[Callable[[int], bool]] = None,
         page_wait: float = 1.0,
+        workers: int = 1,
+        shard_extractor: Optional[Callable[["BaseScraper"], List[JobPayload]]] = None,
     ) -> List[JobPayload]:
-        """Aggregate job payloads across paginated listings."""
+        """Aggregate job payloads across paginated listings.
+
+        With ``workers > 1`` and a ``shard_extractor`` the page space is split
+        across shards (see ``_gather_sharded``) when the scraper can build its
+        page URLs up front. When a page is blocked the payloads of the pages
+        read before it travel in :attr:`BlockedPageError.partial`.
+        """
+        if workers > 1 and shard_extractor is not None and self.page_url(2):
+            return self._gather_sharded(shard_extractor, workers, page_wait)
         results: List[JobPayload] = []
+        try:
+            self._gather_sequential(results, extractor, navigator, page_wait)
+        except BlockedPageError as error:
+            # Las páginas anteriores al bloqueo siguen siendo válidas
+            error.partial = results
+            raise
+        return results
+
+    def _gather_sequential(
+        self,
+        results: List[JobPayload],
+        extractor: Callable[[], List[JobPayload]],
+        navigator: Optional[Callable[[int], bool]],
+        page_wait: float,
+    ) -> None:
+        """Load pages one after another, appending new payloads to ``results``."""
         seen: set[str] = set()
+        page_limit = self.max_pages
         page = 1
-        while page <= self.max_pages:
-            if page > 1:
-                if navigator and not navigator(page):
-                    break
-                if page_wait:
-                    time.sleep(page_wait)
-            current = extractor()
+        jumped = False
+        while page <= page_limit:
+            with log_context(page=page):
+                cached = self._cached_page(page)
+                if cached is not None:
+                    current = cached.records
+                else:
+                    recycled = page > 1 and self._maybe_recycle(page)
+                    if not self._load_page(page, navigator, page_wait, jumped=jumped or recycled):
+                        break
+                    current = extractor()
+                    self.extraction_stats.page(len(current))
+            jumped = cached is not None
             new_found = 0
             for payload in current:
                 url = payload.get("url")
@@ -60,5 +447,156 @@ class BaseScraper:
                 new_found += 1
             if new_found == 0:
                 break
+            if page == 1:
+                if cached is not None:
+                    estimated = self._pages_for_total(cached.total)
+                else:
+                    estimated = self.estimate_total_pages()
+                if estimated is not None:
+                    page_limit = min(page_limit, estimated)
+            if cached is None:
+                self._store_page(page, current)
+            # Evita cargar una página extra solo para descubrir que está vacía
+            if self._is_short_cached(cached) if cached is not None else self.is_last_page(current):
+                break
             page += 1
+
+    def _gather_sharded(
+        self,
+        extractor: Callable[["BaseScraper"], List[JobPayload]],
+        workers: int,
+        page_wait: float,
+    ) -> List[JobPayload]:
+        """Load pages 2..N concurrently on ``workers`` drivers.
+
+        Shards claim the next unread page from a shared counter. Finished pages
+        are merged in page order as soon as they are contiguous, applying the
+        same rule as the sequential loop (stop at the first page without new
+        URLs), so the output matches it and no shard claims pages past the end.
+        A page that keeps failing is skipped when merging (and counted in
+        ``extraction_stats``) rather than taken for the end of the results,
+        and the shard goes on claiming the following pages.
+        """
+        lock = threading.Lock()
+        first_cached = self._cached_page(1)
+        if first_cached is not None:
+            first_page = first_cached.records
+            estimated = self._pages_for_total(first_cached.total)
+            first_is_last = self._is_short_cached(first_cached)
+        else:
+            self._load_page(1, None, 0)
+            first_page = extractor(self)
+            self.extraction_stats.page(len(first_page))
+            estimated = self.estimate_total_pages() if first_page else None
+            first_is_last = self.is_last_page(first_page)
+            self._store_page(1, first_page)
+        pages: Dict[int, List[JobPayload]] = {1: first_page}
+        results: List[JobPayload] = []
+        seen: set[str] = set()
+        state = {"next": 2, "frontier": 1, "end": self.max_pages + 1}
+        blocked: List[BlockedPageError] = []
+        failed: set[int] = set()
+
+        def merge_ready() -> None:
+            while state["frontier"] < state["end"] and state["frontier"] in pages:
+                if state["frontier"] in failed:
+                    pages.pop(state["frontier"])
+                    state["frontier"] += 1
+                    continue
+                new_found = 0
+                for payload in pages.pop(state["frontier"]):
+                    url = payload.get("url")
+                    if not url or url in seen:
+                        continue
+                    seen.add(url)
+                    results.append(payload)
+                    new_found += 1
+                if new_found == 0:
+                    state["end"] = state["frontier"]
+                    break
+                state["frontier"] += 1
+
+        def claim() -> Optional[int]:
+            with lock:
+                page = state["next"]
+                if page >= state["end"]:
+                    return None
+                state["next"] += 1
+                return page
+
+        def load_shard_page(shard: BaseScraper, page: int) -> Optional[Tuple[List[JobPayload], bool]]:
+            """Payloads of ``page`` and whether it is the last one; ``None`` if it kept failing."""
+            cached = shard._cached_page(page)
+            if cached is not None:
+                return cached.records, shard._is_short_cached(cached)
+            for attempt in range(1, self.shard_page_attempts + 1):
+                try:
+                    shard._maybe_recycle(page)
+                    shard._navigate(shard.page_url(page))
+                    shard._pages_on_driver += 1
+                    if page_wait:
+                        time.sleep(page_wait)
+                    payloads = extractor(shard)
+                except BlockedPageError:
+                    raise
+                except Exception:
+                    logger.debug("Fallo al cargar la página %d en un shard (intento %d)", page, attempt, exc_info=True)
+                    continue
+                shard.extraction_stats.page(len(payloads))
+                shard._store_page(page, payloads)
+                return payloads, shard.is_last_page(payloads)
+            return None
+
+        def run_shard(shard: BaseScraper) -> None:
+            try:
+                while True:
+                    page = claim()
+                    if page is None:
+                        return
+                    try:
+                        with log_context(page=page):
+                            loaded = load_shard_page(shard, page)
+                    except BlockedPageError as error:
+                        # Los demás shards no reclaman más páginas contra el bloqueo;
+                        # las anteriores que estén en curso aún se combinan
+                        with lock:
+                            blocked.append(error)
+                            state["end"] = min(state["end"], page)
+                        return
+                    if loaded is None:
+                        # No es el final de los resultados: se salta al combinar y el shard sigue
+                        logger.warning("Página %d descartada tras %d intentos", page, self.shard_page_attempts)
+                        self.extraction_stats.failed(page)
+                        with lock:
+                            failed.add(page)
+                            pages[page] = []
+                            merge_ready()
+                        continue
+                    payloads, is_last = loaded
+                    with lock:
+                        pages[page] = payloads
+                        if not payloads:
+                            state["end"] = min(state["end"], page)
+                        elif is_last:
+                            state["end"] = min(state["end"], page + 1)
+                        merge_ready()
+            finally:
+                if shard is not self:
+                    shard.close()
+
+        with lock:
+            if estimated is not None:
+                state["end"] = min(state["end"], estimated + 1)
+            if first_is_last:
+                state["end"] = min(state["end"], 2)
+            merge_ready()
+        shards = [self] + self._reserve_shards(workers - 1)
+        workers = len(shards)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(in_current_context(run_shard), shards))
+        merge_ready()
+        if blocked:
+            blocked[0].partial = results
+            raise blocked[0]
+        logger.debug("Paginación en %d shards finalizada en la página %d", workers, state["end"] - 1)
         return results
@@ -0,0 +1,195 @@
+"""Detection of captcha/interstitial pages and per-host cooldowns after a block."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from selenium.webdriver.common.by import By
+
+logger = logging.getLogger(__name__)
+
+# Estados HTTP con los que los sitios rechazan a un cliente automatizado
+BLOCK_STATUSES = (403, 429)
+# Fragmentos (en minúsculas) del título de páginas de desafío o bloqueo
+TITLE_MARKERS = (
+    "just a moment",
+    "un momento",
+    "attention required",
+    "access denied",
+    "acceso denegado",
+    "security check",
+    "verificación de seguridad",
+    "verify you are human",
+    "are you a robot",
+    "request unsuccessful",
+    "hcaptcha",
+)
+# Widgets que solo aparecen en páginas de desafío (Cloudflare, hCaptcha, PerimeterX, DataDome)
+MARKER_SELECTOR = ", ".join(
+    (
+        "#challenge-form",
+        "#challenge-stage",
+        "#cf-challenge-running",
+        "iframe[src*='challenges.cloudflare.com']",
+        "iframe[src*='hcaptcha.com']",
+        "#px-captcha",
+        "iframe[src*='captcha-delivery.com']",
+    )
+)
+COOLDOWN = 30 * 60.0
+MAX_COOLDOWN = 6 * 3600.0
+
+
+class BlockedPageError(RuntimeError):
+    """The site answered with a captcha, an interstitial or a blocking status."""
+
+    def __init__(self, host: str, reason: str, url: str = "", cooling: bool = False) -> None:
+        super().__init__(f"{host}: {reason}")
+        self.host = host
+        self.reason = reason
+        self.url = url
+        # True cuando no se llegó a navegar porque el host ya estaba en enfriamiento
+        self.cooling = cooling
+        # Registros de las páginas leídas antes del bloqueo (los rellena la paginación)
+        self.partial: List[Dict[str, Any]] = []
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url or "").netloc.lower()
+
+
+def classify_page(title: str = "", status: Optional[int] = None, has_marker: bool = False) -> Optional[str]:
+    """Reason why a loaded page is a block, or ``None`` for a normal page."""
+    if status in BLOCK_STATUSES:
+        return f"HTTP {status}"
+    lowered = (title or "").strip().lower()
+    for marker in TITLE_MARKERS:
+        if marker in lowered:
+            return f"título '{title.strip()}'"
+    if has_marker:
+        return "desafío en la página"
+    return None
+
+
+def detect_block(driver, status: Optional[int] = None) -> Optional[str]:
+    """Classify the page loaded in ``driver`` with two cheap calls (title and one selector)."""
+    if status in BLOCK_STATUSES:
+        return classify_page(status=status)
+    try:
+        title = driver.title
+    except Exception:
+        title = ""
+    reason = classify_page(title if isinstance(title, str) else "")
+    if reason:
+        return reason
+    try:
+        has_marker = len(driver.find_elements(By.CSS_SELECTOR, MARKER_SELECTOR)) > 0
+    except Exception:
+        has_marker = False
+    return classify_page(has_marker=has_marker)
+
+
+class BlockRegistry:
+    """Blocks seen per host and the cooldown each host is under.
+
+    Every block puts its host in cooldown for ``cooldown`` seconds, doubled
+    for each further block that arrives within ``max_cooldown`` of the
+    previous one (capped at ``max_cooldown``). Scrapers refuse to navigate to
+    a host in cooldown and the scheduler skips sources whose hosts are
+    cooling down. Optionally persisted to ``path`` so the cooldown outlives
+    the run.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        cooldown: float = COOLDOWN,
+        max_cooldown: float = MAX_COOLDOWN,
+    ) -> None:
+        self.path = path
+        self.cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def record(self, source: str, error: BlockedPageError, now: Optional[float] = None) -> float:
+        """Put ``error.host`` in cooldown and return the cooldown length in seconds."""
+        if error.cooling:
+            return self.remaining(error.host, now)
+        now = time.time() if now is None else now
+        with self._lock:
+            previous = self.hosts.get(error.host)
+            strikes = 1
+            if previous is not None and now - previous["until"] < self.max_cooldown:
+                strikes = previous["strikes"] + 1
+            seconds = min(self.max_cooldown, self.cooldown * 2 ** (strikes - 1))
+            until = max(now + seconds, previous["until"] if previous else 0.0)
+            self.hosts[error.host] = {
+                "source": source,
+                "until": until,
+                "strikes": strikes,
+                "reason": error.reason,
+                "url": error.url,
+            }
+            self.events.append({"time": now, "source": source, "host": error.host, "reason": error.reason})
+        logger.warning(
+            "Bloqueo en %s (%s): %s; en enfriamiento %.0f min", source, error.host, error.reason, seconds / 60
+        )
+        return seconds
+
+    def remaining(self, host: str, now: Optional[float] = None) -> float:
+        """Seconds left in ``host``'s cooldown (0 when it is not cooling down)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self.hosts.get(host)
+        return max(0.0, entry["until"] - now) if entry else 0.0
+
+    def source_remaining(self, source: str, now: Optional[float] = None) -> float:
+        """Longest cooldown left among the hosts blocked while running ``source``."""
+        now = time.time() if now is None else now
+        with self._lock:
+            untils = [entry["until"] for entry in self.hosts.values() if entry["source"] == source]
+        return max([0.0] + [until - now for until in untils])
+
+    def check(self, url: str) -> None:
+        """Raise :class:`BlockedPageError` if ``url``'s host is cooling down."""
+        host = host_of(url)
+        left = self.remaining(host) if host else 0.0
+        if left > 0:
+            raise BlockedPageError(host, f"en enfriamiento ({left / 60:.0f} min restantes)", url, cooling=True)
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            logger.warning("No se pudo leer el estado de bloqueos %s", path)
+            return
+        self.hosts.update(data.get("hosts", {}))
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        now = time.time()
+        with self._lock:
+            # Se olvidan los hosts cuyo enfriamiento ya no puede escalar
+            data = {
+                "hosts": {
+                    host: entry for host, entry in self.hosts.items() if now - entry["until"] < self.max_cooldown
+                }
+            }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
@@ -3,20 +3,21 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional
 
 from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options
 
+from .profiles import startup_stats
 
-def create_firefox_driver(headless: Optional[bool] = None) -> webdriver.Firefox:
-    """Create a Firefox WebDriver instance.
+if TYPE_CHECKING:
+    from .profiles import ProfileTemplate
 
-    Headless mode is enabled by default. You can toggle it via the ``headless``
-    argument or the ``SCRAPER_HEADLESS`` environment variable (set to ``0`` or
-    ``false`` to disable).
-    """
-    options = Options()
+
+def resolve_headless(headless: Optional[bool] = None) -> bool:
+    """Resolve the effective headless flag from the argument and environment."""
     resolved_headless = headless
     if resolved_headless is None:
         env_value = os.getenv("SCRAPER_HEADLESS")
@@ -24,6 +25,57 @@ def create_firefox_driver(headless: Optional[bool] = None) -> webdriver.Firefox:
             resolved_headless = env_value not in {"0", "false", "False"}
     if resolved_headless is None:
         resolved_headless = True
-    if resolved_headless:
+    return resolved_headless
+
+
+def create_firefox_driver(
+    headless: Optional[bool] = None,
+    profile_template: Optional["ProfileTemplate"] = None,
+    profile_dir: Optional[str] = None,
+    record_startup: bool = True,
+) -> webdriver.Firefox:
+    """Create a Firefox WebDriver instance.
+
+    Headless mode is enabled by default. You can toggle it via the ``headless``
+    argument or the ``SCRAPER_HEADLESS`` environment variable (set to ``0`` or
+    ``false`` to disable). With ``profile_template`` the browser starts on a
+    clone of that pre-initialised profile instead of a brand new one
+    (``profile_dir`` uses an existing directory as is).
+    """
+    start_time = time.perf_counter()
+    options = Options()
+    if resolve_headless(headless):
         options.add_argument("-headless")
-    return webdriver.Firefox(options=options)
+    clone = profile_template.clone() if profile_template is not None and profile_dir is None else None
+    if clone or profile_dir:
+        # geckodriver usa el directorio tal cual, sin copiarlo ni empaquetarlo
+        options.add_argument("-profile")
+        options.add_argument(clone or profile_dir)
+    driver = webdriver.Firefox(options=options)
+    if clone:
+        profile_template.attach(driver, clone)
+    if record_startup:
+        startup_stats.record("template" if clone else "fresh", time.perf_counter() - start_time)
+    return driver
+
+
+def create_remote_driver(command_executor: str, headless: Optional[bool] = None):
+    """Create a Firefox session on a remote Selenium Grid / standalone node."""
+    options = Options()
+    if resolve_headless(headless):
+        options.add_argument("-headless")
+    return webdriver.Remote(command_executor=command_executor, options=options)
+
+
+def create_chromium_driver(headless: Optional[bool] = None, capture_network: bool = True):
+    """Create a Chromium WebDriver instance.
+
+    With ``capture_network`` the DevTools performance log is enabled so the
+    ``Network.*`` events (and response bodies) can be read back through CDP.
+    """
+    options = ChromeOptions()
+    if resolve_headless(headless):
+        options.add_argument("--headless=new")
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return webdriver.Chrome(options=options)
@@ -0,0 +1,148 @@
+"""Content-addressed cache of listing pages."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_listing_url(url: str) -> str:
+    """Canonical form of a listing URL: lowercase host, sorted query, no fragment."""
+    parsed = urlparse(url.strip())
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    path = parsed.path or "/"
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, parsed.params, query, ""))
+
+
+@dataclass
+class CachedPage:
+    url: str
+    fetched_at: float
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    html: Optional[str] = None
+    payload: Any = None
+    total: Optional[int] = None
+    card_count: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional GET revalidating this entry."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """Gzip-compressed page snapshots stored under ``sha256(normalized url)``.
+
+    Entries hold the extracted records (and optionally the page HTML or the raw
+    JSON payload) together with ``ETag``/``Last-Modified`` validators. Entries
+    older than ``ttl`` seconds are not served by :meth:`get` but stay on disk so
+    they can be revalidated or re-extracted later.
+    """
+
+    def __init__(self, directory: str, ttl: float = 6 * 3600, store_html: bool = True) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.store_html = store_html
+
+    def key(self, url: str) -> str:
+        return hashlib.sha256(normalize_listing_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[CachedPage]:
+        page = self._read(self._path(self.key(url)))
+        if page is None or (not allow_stale and self.is_stale(page)):
+            return None
+        return page
+
+    def is_stale(self, page: CachedPage) -> bool:
+        return time.time() - page.fetched_at > self.ttl
+
+    def put(
+        self,
+        url: str,
+        records: Optional[List[Dict[str, Any]]] = None,
+        html: Optional[str] = None,
+        payload: Any = None,
+        total: Optional[int] = None,
+        card_count: Optional[int] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CachedPage:
+        page = CachedPage(
+            url=normalize_listing_url(url),
+            fetched_at=time.time(),
+            records=list(records or []),
+            html=html if self.store_html else None,
+            payload=payload,
+            total=total,
+            card_count=card_count,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._write(self._path(self.key(url)), page)
+        return page
+
+    def touch(self, page: CachedPage) -> None:
+        """Mark a revalidated (HTTP 304) entry as fresh again."""
+        page.fetched_at = time.time()
+        self._write(self._path(self.key(page.url)), page)
+
+    def iter_pages(self) -> Iterator[CachedPage]:
+        """Yield every stored entry, fresh or stale."""
+        for path in self.iter_files():
+            page = self.load(path)
+            if page is not None:
+                yield page
+
+    def iter_files(self) -> Iterator[str]:
+        if not os.path.isdir(self.directory):
+            return
+        for root, dirs, files in os.walk(self.directory):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(".json.gz"):
+                    yield os.path.join(root, name)
+
+    def load(self, path: str) -> Optional[CachedPage]:
+        """Read one entry file as returned by :meth:`iter_files`."""
+        return self._read(path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def _read(self, path: str) -> Optional[CachedPage]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                return CachedPage(**json.load(handle))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError):
+            logger.warning("Entrada de caché corrupta, se ignora: %s", path)
+            return None
+
+    def _write(self, path: str, page: CachedPage) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as handle:
+                handle.write(json.dumps(asdict(page), ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,54 @@
+"""Extraction counters kept by each scraper (cards per page, selector branch per field)."""
+
+from __future__ import annotations
+
+import statistics
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+JobRecord = Dict[str, Any]
+Metrics = Dict[str, Any]
+
+
+class ExtractionStats:
+    """Counters filled by a scraper while it extracts (shared with its shards)."""
+
+    def __init__(self) -> None:
+        self.page_counts: List[int] = []
+        # Páginas que no se pudieron cargar y se saltaron
+        self.failed_pages: List[int] = []
+        self.branches: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def page(self, cards: int) -> None:
+        with self._lock:
+            self.page_counts.append(cards)
+
+    def failed(self, page: int) -> None:
+        with self._lock:
+            self.failed_pages.append(page)
+
+    def branch(self, field_name: str, branch: str) -> None:
+        """Note that ``branch`` (a selector or path) produced ``field_name`` for one record."""
+        with self._lock:
+            self.branches.setdefault(field_name, Counter())[branch] += 1
+
+    def metrics(self, records: Sequence[JobRecord]) -> Metrics:
+        with self._lock:
+            pages = list(self.page_counts)
+            failed = len(self.failed_pages)
+            branches = {name: dict(counter) for name, counter in self.branches.items()}
+        filled = sum(1 for record in records if str(record.get("empresa") or "").strip())
+        return {
+            "records": len(records),
+            "pages": len(pages),
+            "per_page": statistics.fmean(pages) if pages else None,
+            "empty_pages": sum(1 for cards in pages if cards == 0),
+            "failed_pages": failed,
+            "empresa_fill": filled / len(records) if records else None,
+            "branches": {
+                name: {branch: count / sum(counter.values()) for branch, count in counter.items()}
+                for name, counter in branches.items()
+            },
+        }
@@ -0,0 +1,294 @@
+"""Minimal HTML document exposing the WebDriver lookup API used by extractors.
+
+Replay and offline re-extraction run the scraper extractors over stored HTML.
+``HtmlDriver`` / ``HtmlElement`` implement the subset of Selenium the
+extractors call (``find_element(s)`` by id, tag, CSS selector and the
+``ancestor::tag[n]`` XPath, ``text`` and ``get_attribute``) on top of
+``html.parser``, so no browser is needed.
+"""
+
+from __future__ import annotations
+
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+try:
+    from selenium.common.exceptions import NoSuchElementException
+except ImportError:  # pragma: no cover - selenium stubbed or missing
+
+    class NoSuchElementException(Exception):  # type: ignore[no-redef]
+        pass
+
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+SKIP_TEXT_TAGS = {"script", "style", "template", "noscript"}
+URL_ATTRIBUTES = {"href", "src"}
+_WHITESPACE = re.compile(r"\s+")
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["Node"]) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List[object] = []
+        self.parent = parent
+
+    def iter_descendants(self) -> Iterator["Node"]:
+        stack = [child for child in reversed(self.children) if isinstance(child, Node)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, Node))
+
+    def classes(self) -> List[str]:
+        return self.attrs.get("class", "").split()
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {}, None)
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self._stack[-1])
+        self._stack[-1].children.append(node)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self._stack) - 1, 0, -1):
+            if self._stack[index].tag == tag:
+                del self._stack[index:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html or "")
+    builder.close()
+    return builder.root
+
+
+# --- CSS selectors -------------------------------------------------------
+
+_COMPOUND_PART = re.compile(
+    r"""(?P<tag>^[a-zA-Z][\w-]*|^\*)
+      |\#(?P<id>[\w-]+)
+      |\.(?P<cls>[\w-]+)
+      |\[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?P<quote>["']?)(?P<value>.*?)(?P=quote))?\s*\]""",
+    re.VERBOSE,
+)
+
+Matcher = Callable[[Node], bool]
+
+
+def _attr_matcher(name: str, op: Optional[str], value: str) -> Matcher:
+    def match(node: Node) -> bool:
+        if name not in node.attrs:
+            return False
+        actual = node.attrs[name]
+        if op is None:
+            return True
+        if op == "=":
+            return actual == value
+        if op == "*=":
+            return bool(value) and value in actual
+        if op == "^=":
+            return bool(value) and actual.startswith(value)
+        if op == "$=":
+            return bool(value) and actual.endswith(value)
+        if op == "~=":
+            return value in actual.split()
+        return actual == value or actual.startswith(f"{value}-")
+
+    return match
+
+
+def _compile_compound(text: str) -> Matcher:
+    checks: List[Matcher] = []
+    position = 0
+    while position < len(text):
+        match = _COMPOUND_PART.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Selector CSS no soportado: {text!r}")
+        if match.group("tag") and match.group("tag") != "*":
+            tag = match.group("tag").lower()
+            checks.append(lambda node, tag=tag: node.tag == tag)
+        elif match.group("id"):
+            ident = match.group("id")
+            checks.append(lambda node, ident=ident: node.attrs.get("id") == ident)
+        elif match.group("cls"):
+            cls = match.group("cls")
+            checks.append(lambda node, cls=cls: cls in node.classes())
+        elif match.group("attr"):
+            checks.append(_attr_matcher(match.group("attr"), match.group("op"), match.group("value") or ""))
+        position = match.end()
+    return lambda node: all(check(node) for check in checks)
+
+
+def _compile_complex(selector: str) -> List[Tuple[str, Matcher]]:
+    """Return ``[(combinator, matcher), ...]`` from left to right."""
+    tokens = re.sub(r"\s*>\s*", " > ", selector.strip()).split()
+    steps: List[Tuple[str, Matcher]] = []
+    combinator = " "
+    for token in tokens:
+        if token == ">":
+            combinator = ">"
+            continue
+        steps.append((combinator, _compile_compound(token)))
+        combinator = " "
+    return steps
+
+
+def _matches(node: Node, steps: List[Tuple[str, Matcher]]) -> bool:
+    combinator, matcher = steps[-1]
+    if not matcher(node):
+        return False
+    if len(steps) == 1:
+        return True
+    parent = node.parent
+    if combinator == ">":
+        return parent is not None and _matches(parent, steps[:-1])
+    while parent is not None:
+        if _matches(parent, steps[:-1]):
+            return True
+        parent = parent.parent
+    return False
+
+
+_SELECTOR_CACHE: Dict[str, List[List[Tuple[str, Matcher]]]] = {}
+
+
+def select(root: Node, selector: str) -> List[Node]:
+    groups = _SELECTOR_CACHE.get(selector)
+    if groups is None:
+        groups = [_compile_complex(part) for part in selector.split(",") if part.strip()]
+        _SELECTOR_CACHE[selector] = groups
+    return [node for node in root.iter_descendants() if any(_matches(node, steps) for steps in groups)]
+
+
+_ANCESTOR_XPATH = re.compile(r"^ancestor::([\w*-]+)(?:\[(\d+)\])?$")
+
+
+def _find(root: Node, by: str, value: str, base_url: str) -> List["HtmlElement"]:
+    if by == "id":
+        nodes = [node for node in root.iter_descendants() if node.attrs.get("id") == value]
+    elif by == "tag name":
+        nodes = [node for node in root.iter_descendants() if node.tag == value.lower()]
+    elif by == "css selector":
+        nodes = select(root, value)
+    elif by == "xpath":
+        match = _ANCESTOR_XPATH.match(value.strip())
+        if not match:
+            raise ValueError(f"XPath no soportado: {value!r}")
+        tag, position = match.group(1).lower(), int(match.group(2) or 0)
+        nodes = []
+        parent = root.parent
+        while parent is not None and parent.tag != "#document":
+            if tag in ("*", parent.tag):
+                nodes.append(parent)
+            parent = parent.parent
+        if position:
+            nodes = nodes[position - 1 : position]
+    else:
+        raise ValueError(f"Estrategia de búsqueda no soportada: {by!r}")
+    return [HtmlElement(node, base_url) for node in nodes]
+
+
+def _render_text(node: Node) -> str:
+    parts: List[str] = []
+
+    def walk(current: Node) -> None:
+        for child in current.children:
+            if isinstance(child, Node):
+                if child.tag in SKIP_TEXT_TAGS:
+                    continue
+                block = child.tag in BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                walk(child)
+                if block:
+                    parts.append("\n")
+            else:
+                # Los saltos de línea del fuente son espacios al renderizar
+                parts.append(_WHITESPACE.sub(" ", child))
+
+    walk(node)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class HtmlElement:
+    def __init__(self, node: Node, base_url: str = "") -> None:
+        self._node = node
+        self._base_url = base_url
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        return _render_text(self._node)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        value = self._node.attrs.get(name)
+        if value is not None and name in URL_ATTRIBUTES and self._base_url:
+            # Como Selenium, href/src se devuelven como URL absoluta
+            return urljoin(self._base_url, value)
+        return value
+
+    def find_elements(self, by: str, value: str) -> List["HtmlElement"]:
+        return _find(self._node, by, value, self._base_url)
+
+    def find_element(self, by: str, value: str) -> "HtmlElement":
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
+
+
+class HtmlDriver:
+    """Read-only stand-in for a WebDriver positioned on a stored page."""
+
+    def __init__(self, html: str, url: str = "") -> None:
+        self.page_source = html
+        self.current_url = url
+        self._document = parse_html(html)
+        titles = _find(self._document, "tag name", "title", url)
+        self.title = titles[0].text if titles else ""
+
+    def find_elements(self, by: str, value: str) -> List[HtmlElement]:
+        return _find(self._document, by, value, self.current_url)
+
+    def find_element(self, by: str, value: str) -> HtmlElement:
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
+
+    def get(self, url: str) -> None:
+        raise RuntimeError("HtmlDriver no puede navegar; solo expone la página almacenada")
+
+    def quit(self) -> None:
+        pass
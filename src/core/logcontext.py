@@ -0,0 +1,48 @@
+"""Per-task logging context fields (fuente, busqueda, page, ...) shared across threads."""
+
+from __future__ import annotations
+
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Campos de contexto (fuente, busqueda, page, ...) del hilo/tarea actual
+_CONTEXT: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("log_context", default={})
+# Campos fijos del proceso (run id)
+_STATIC: Dict[str, Any] = {}
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Add ``fields`` to every record logged inside the block (thread/task local)."""
+    token = _CONTEXT.set({**_CONTEXT.get(), **fields})
+    try:
+        yield
+    finally:
+        _CONTEXT.reset(token)
+
+
+def set_static_fields(**fields: Any) -> None:
+    """Replace the process-wide fields (e.g. ``run``) added to every record."""
+    _STATIC.clear()
+    _STATIC.update(fields)
+
+
+def current_context() -> Dict[str, Any]:
+    return {**_STATIC, **_CONTEXT.get()}
+
+
+def in_current_context(func: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``func`` so that worker threads inherit the caller's log context.
+
+    Threads and executors start with an empty context; each call runs in its
+    own copy, so concurrent calls never share context changes.
+    """
+    context = contextvars.copy_context()
+
+    def runner(*args: Any, **kwargs: Any) -> T:
+        return context.copy().run(func, *args, **kwargs)
+
+    return runner
@@ -0,0 +1,95 @@
+"""DevTools network capture for Chromium sessions."""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+from typing import Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+JSON_MIME_MARKERS = ("json", "javascript")
+
+
+class NetworkCapture:
+    """Collects JSON responses observed by a Chromium session.
+
+    Entries come from the ``performance`` log enabled in
+    ``create_chromium_driver``. Each call to :meth:`json_payloads` only returns
+    responses received since the previous call (or :meth:`discard`), which
+    maps to the page that was just loaded.
+    """
+
+    def __init__(self, driver, url_patterns: Sequence[str] = ()) -> None:
+        self.driver = driver
+        self.url_patterns = tuple(url_patterns)
+        self.last_document_status: Optional[int] = None
+        self._pending: List[Tuple[str, str]] = []
+
+    def drain(self) -> None:
+        """Read pending performance log entries and keep matching responses."""
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception:
+            logger.debug("El driver no expone el log de rendimiento", exc_info=True)
+            return
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get("method") != "Network.responseReceived":
+                continue
+            params = message.get("params", {})
+            response = params.get("response", {})
+            url = response.get("url", "")
+            if params.get("type") == "Document":
+                self.last_document_status = response.get("status")
+            mime = (response.get("mimeType") or "").lower()
+            if not any(marker in mime for marker in JSON_MIME_MARKERS):
+                continue
+            if self.url_patterns and not any(pattern in url for pattern in self.url_patterns):
+                continue
+            self._pending.append((params.get("requestId", ""), url))
+
+    def discard(self) -> None:
+        """Forget every response received so far, e.g. right before loading a listing page."""
+        self.drain()
+        self._pending = []
+
+    def json_payloads(self) -> List[Tuple[str, Any]]:
+        """Return ``(url, decoded_json)`` for the matching responses seen so far."""
+        self.drain()
+        payloads: List[Tuple[str, Any]] = []
+        pending, self._pending = self._pending, []
+        for request_id, url in pending:
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            except Exception:
+                logger.debug("Cuerpo no disponible para %s", url)
+                continue
+            text = body.get("body", "")
+            if body.get("base64Encoded"):
+                text = base64.b64decode(text).decode("utf-8", errors="replace")
+            try:
+                payloads.append((url, json.loads(text)))
+            except ValueError:
+                continue
+        return payloads
+
+
+def find_dicts_with_keys(payload: Any, keys: Sequence[str]) -> List[dict]:
+    """Walk a decoded JSON document and return every dict holding all ``keys``."""
+    found: List[dict] = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if all(key in node for key in keys):
+                found.append(node)
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return found
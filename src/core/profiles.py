@@ -0,0 +1,212 @@
+"""Pre-initialised Firefox profile templates and cheap per-driver clones."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Preferencias que evitan trabajo de primer arranque y tráfico de fondo
+DEFAULT_PREFS: Dict[str, Any] = {
+    "app.normandy.enabled": False,
+    "app.shield.optoutstudies.enabled": False,
+    "app.update.auto": False,
+    "app.update.checkInstallTime": False,
+    "app.update.disabledForTesting": True,
+    "app.update.enabled": False,
+    "browser.aboutwelcome.enabled": False,
+    "browser.cache.disk.capacity": 262144,
+    "browser.cache.disk.enable": True,
+    "browser.cache.disk.smart_size.enabled": False,
+    "browser.cache.memory.enable": True,
+    "browser.discovery.enabled": False,
+    "browser.newtabpage.enabled": False,
+    "browser.ping-centre.telemetry": False,
+    "browser.safebrowsing.blockedURIs.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.search.update": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.startup.page": 0,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "extensions.getAddons.cache.enabled": False,
+    "extensions.update.enabled": False,
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+    "startup.homepage_welcome_url": "",
+    "toolkit.telemetry.enabled": False,
+    "toolkit.telemetry.unified": False,
+}
+
+# Archivos que Firefox no reescribe en el sitio: se comparten por hardlink.
+# El resto (bases SQLite, prefs.js, ...) se copia para no alterar la plantilla.
+SHARED_SUFFIXES = (".xpi", ".jar", ".lz4", ".mozlz4")
+SHARED_DIRS = ("extensions", "startupCache")
+WARM_MARKER = ".warmed"
+
+
+def _user_js(prefs: Dict[str, Any]) -> str:
+    return "".join(f'user_pref("{name}", {json.dumps(value)});\n' for name, value in sorted(prefs.items()))
+
+
+def _is_shared(relative_path: str) -> bool:
+    top = relative_path.split(os.sep, 1)[0]
+    return top in SHARED_DIRS or relative_path.endswith(SHARED_SUFFIXES)
+
+
+class StartupStats:
+    """Driver spin-up times grouped by kind (``fresh``/``template``)."""
+
+    def __init__(self) -> None:
+        self._times: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, seconds: float) -> None:
+        with self._lock:
+            self._times.setdefault(kind, []).append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                kind: {"count": len(times), "mean": sum(times) / len(times), "max": max(times)}
+                for kind, times in self._times.items()
+                if times
+            }
+
+    def log(self) -> None:
+        for kind, stats in sorted(self.summary().items()):
+            logger.info(
+                "Arranque de navegadores (%s): %d, media %.2fs, máximo %.2fs",
+                kind,
+                stats["count"],
+                stats["mean"],
+                stats["max"],
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._times.clear()
+
+
+startup_stats = StartupStats()
+
+
+class ProfileTemplate:
+    """A Firefox profile prepared once and cloned for every driver.
+
+    :meth:`prepare` writes ``user.js`` with :data:`DEFAULT_PREFS` (plus any
+    ``prefs`` given) and, with ``warm=True``, starts Firefox once on the
+    template so that the profile databases, the startup cache and the add-on
+    scan already exist. :meth:`clone` then gives each driver its own copy:
+    immutable files are hardlinked and only the small mutable ones are
+    copied. Clones are deleted when their driver is garbage collected or at
+    exit.
+    """
+
+    def __init__(self, directory: str, prefs: Optional[Dict[str, Any]] = None) -> None:
+        self.directory = os.path.abspath(directory)
+        self.prefs = {**DEFAULT_PREFS, **(prefs or {})}
+        self._clone_root: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def warmed(self) -> bool:
+        return os.path.exists(os.path.join(self.directory, WARM_MARKER))
+
+    def prepare(self, warm: bool = False, launcher: Optional[Callable[[str], Any]] = None) -> "ProfileTemplate":
+        os.makedirs(self.directory, exist_ok=True)
+        user_js = os.path.join(self.directory, "user.js")
+        content = _user_js(self.prefs)
+        current = None
+        if os.path.exists(user_js):
+            with open(user_js, "r", encoding="utf-8") as handle:
+                current = handle.read()
+        if current != content:
+            with open(user_js, "w", encoding="utf-8") as handle:
+                handle.write(content)
+            # Preferencias nuevas: el perfil debe volver a inicializarse
+            self._remove_marker()
+        if warm and not self.warmed:
+            self._warm(launcher)
+        return self
+
+    def _remove_marker(self) -> None:
+        try:
+            os.remove(os.path.join(self.directory, WARM_MARKER))
+        except FileNotFoundError:
+            pass
+
+    def _warm(self, launcher: Optional[Callable[[str], Any]]) -> None:
+        if launcher is None:
+            from .browser import create_firefox_driver
+
+            def launcher(profile_dir: str):
+                return create_firefox_driver(headless=True, profile_dir=profile_dir, record_startup=False)
+
+        started = time.perf_counter()
+        try:
+            driver = launcher(self.directory)
+            try:
+                driver.get("about:blank")
+            finally:
+                driver.quit()
+        except Exception:
+            logger.warning("No se pudo precalentar el perfil %s", self.directory, exc_info=True)
+            return
+        # Bloqueos y estado de sesión no deben viajar a los clones
+        for name in ("lock", ".parentlock", "parent.lock", "sessionstore-backups"):
+            path = os.path.join(self.directory, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.lexists(path):
+                os.remove(path)
+        with open(os.path.join(self.directory, WARM_MARKER), "w", encoding="utf-8") as handle:
+            handle.write(str(time.time()))
+        logger.info("Perfil plantilla precalentado en %.2fs: %s", time.perf_counter() - started, self.directory)
+
+    def clone(self) -> str:
+        """Return a private copy of the template (removed at exit, or with :meth:`attach`)."""
+        with self._lock:
+            if self._clone_root is None:
+                self._clone_root = tempfile.mkdtemp(prefix="ka-profiles-")
+                weakref.finalize(self, shutil.rmtree, self._clone_root, True)
+        target = tempfile.mkdtemp(prefix="profile-", dir=self._clone_root)
+        for root, dirs, files in os.walk(self.directory):
+            relative_root = os.path.relpath(root, self.directory)
+            destination = target if relative_root == "." else os.path.join(target, relative_root)
+            os.makedirs(destination, exist_ok=True)
+            for name in files:
+                if name == WARM_MARKER:
+                    continue
+                source = os.path.join(root, name)
+                relative = name if relative_root == "." else os.path.join(relative_root, name)
+                _link_or_copy(source, os.path.join(target, relative), shared=_is_shared(relative))
+        return target
+
+    def attach(self, owner: Any, clone: str) -> None:
+        """Delete ``clone`` once ``owner`` (its driver) is garbage collected."""
+        try:
+            weakref.finalize(owner, shutil.rmtree, clone, True)
+        except TypeError:
+            pass
+
+
+def _link_or_copy(source: str, destination: str, shared: bool) -> None:
+    if shared:
+        try:
+            os.link(source, destination)
+            return
+        except OSError:
+            pass
+    shutil.copy2(source, destination)
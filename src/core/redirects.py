@@ -0,0 +1,123 @@
+"""Memo of site-level redirects observed by the browser (e.g. domain moves)."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Una redirección memorizada se vuelve a comprobar pasada una semana
+MAX_AGE = 7 * 24 * 3600.0
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}" if parts.scheme and parts.netloc else ""
+
+
+class RedirectCache:
+    """Map from a requested origin to the origin the site redirected it to.
+
+    Only redirects that keep the path and query, or go from the site root to
+    another site root, are learned, so a single observation such as
+    ``www.computrabajo.com.pe -> pe.computrabajo.com`` rewrites every later
+    URL on that origin and the browser lands on the final host in one hop.
+    Redirects that change the page (logins, captchas, expired offers) are
+    never cached, and a learned redirect is forgotten after ``max_age``
+    seconds. Optionally persisted to ``path`` between runs.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age: float = MAX_AGE) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._origins: Dict[str, str] = {}
+        # Momento en que se observó cada redirección
+        self._seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._origins)
+
+    def resolve(self, url: str, now: Optional[float] = None) -> str:
+        """``url`` moved to its cached final origin (unchanged when unknown or expired)."""
+        origin = _origin(url)
+        now = time.time() if now is None else now
+        with self._lock:
+            final = self._origins.get(origin)
+            if final and now - self._seen.get(origin, now) > self.max_age:
+                del self._origins[origin]
+                self._seen.pop(origin, None)
+                self._dirty = True
+                final = None
+            if final:
+                self.hits += 1
+        if not final:
+            return url
+        return final + url[len(origin):]
+
+    def learn(self, requested: str, landed: str, now: Optional[float] = None) -> bool:
+        """Record the redirect from ``requested`` to ``landed``; returns whether it was cached."""
+        if not isinstance(landed, str) or not landed:
+            return False
+        source, target = _origin(requested), _origin(landed)
+        if not source or not target or source == target:
+            return False
+        asked, got = urlsplit(requested), urlsplit(landed)
+        if asked.path in ("", "/"):
+            # Desde la portada solo vale otra portada: una portada que lleva a
+            # /auth o a un desafío no es un cambio de dominio
+            if got.path not in ("", "/"):
+                return False
+        elif (asked.path, asked.query) != (got.path, got.query):
+            return False
+        now = time.time() if now is None else now
+        with self._lock:
+            self._seen[source] = now
+            if self._origins.get(source) == target:
+                return False
+            self._origins[source] = target
+            # Evita cadenas: lo que apuntaba al origen anterior va directo al final
+            for key, value in self._origins.items():
+                if value == source:
+                    self._origins[key] = target
+            self._dirty = True
+        logger.debug("Redirección memorizada: %s -> %s", source, target)
+        return True
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            logger.warning("No se pudo leer la caché de redirecciones %s", path)
+            return
+        self._origins.update(data.get("origins", {}))
+        # Cachés sin fecha se tratan como recién vistas
+        now = time.time()
+        self._seen.update({origin: data.get("seen", {}).get(origin, now) for origin in self._origins})
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            if not self._dirty and os.path.exists(path):
+                return
+            data = {"origins": dict(self._origins), "seen": dict(self._seen)}
+            self._dirty = False
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
@@ -0,0 +1,176 @@
+"""Browser memory accounting and recycling policy."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import psutil
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+MB = 1024 * 1024
+
+
+def _process_rss(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm", "r", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _children_by_parent() -> Dict[int, list]:
+    children: Dict[int, list] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r", encoding="ascii", errors="replace") as handle:
+                stat = handle.read()
+        except OSError:
+            continue
+        # El nombre del proceso puede contener espacios: se parte tras el último ")"
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """Resident memory in bytes of ``pid`` and all its descendants."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    if not os.path.isdir("/proc"):
+        return None
+    children = _children_by_parent()
+    total = 0
+    found = False
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        rss = _process_rss(current)
+        if rss is not None:
+            total += rss
+            found = True
+        stack.extend(children.get(current, []))
+    return total if found else None
+
+
+def driver_process_id(driver) -> Optional[int]:
+    """PID at the root of a local driver's process tree (driver binary + browser)."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    pid = getattr(process, "pid", None)
+    if isinstance(pid, int):
+        return pid
+    capabilities = getattr(driver, "capabilities", None)
+    if isinstance(capabilities, dict):
+        pid = capabilities.get("moz:processID")
+        if isinstance(pid, int):
+            return pid
+    return None
+
+
+class ResourceGovernor:
+    """Decides when a browser must be restarted and gates new ones on a memory budget.
+
+    ``max_rss_mb`` and ``max_pages`` apply to each browser; ``pool_rss_mb``
+    bounds the sum over every browser registered with the governor. Remote
+    sessions have no local process, so only the page limit applies to them.
+    """
+
+    def __init__(
+        self,
+        max_rss_mb: Optional[float] = None,
+        max_pages: Optional[int] = None,
+        pool_rss_mb: Optional[float] = None,
+        budget_timeout: float = 300.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.max_rss = int(max_rss_mb * MB) if max_rss_mb else None
+        self.max_pages = max_pages or None
+        self.pool_rss = int(pool_rss_mb * MB) if pool_rss_mb else None
+        self.budget_timeout = budget_timeout
+        self.poll_interval = poll_interval
+        self._condition = threading.Condition()
+        self._drivers: Dict[int, object] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_rss or self.max_pages or self.pool_rss)
+
+    def driver_rss(self, driver) -> Optional[int]:
+        pid = driver_process_id(driver)
+        return process_tree_rss(pid) if pid is not None else None
+
+    def total_rss(self) -> int:
+        with self._condition:
+            drivers = list(self._drivers.values())
+        return sum(self.driver_rss(driver) or 0 for driver in drivers)
+
+    def register(self, driver) -> None:
+        with self._condition:
+            self._drivers[id(driver)] = driver
+
+    def unregister(self, driver) -> None:
+        with self._condition:
+            self._drivers.pop(id(driver), None)
+            self._condition.notify_all()
+
+    def wait_for_budget(self) -> None:
+        """Block a new browser while the pool is over its memory budget."""
+        if not self.pool_rss:
+            return
+        deadline = time.monotonic() + self.budget_timeout
+        while True:
+            with self._condition:
+                if not self._drivers:
+                    return
+            used = self.total_rss()
+            if used < self.pool_rss:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    "Memoria de navegadores %.0f MB sobre el límite de %.0f MB; se abre otro igualmente",
+                    used / MB,
+                    self.pool_rss / MB,
+                )
+                return
+            with self._condition:
+                self._condition.wait(min(self.poll_interval, remaining))
+
+    def should_recycle(self, driver, pages_loaded: int) -> bool:
+        if self.max_pages and pages_loaded >= self.max_pages:
+            logger.info("Reciclando navegador tras %d páginas", pages_loaded)
+            return True
+        if not (self.max_rss or self.pool_rss):
+            return False
+        rss = self.driver_rss(driver)
+        if rss is None:
+            return False
+        if self.max_rss and rss >= self.max_rss:
+            logger.info("Reciclando navegador con %.0f MB tras %d páginas", rss / MB, pages_loaded)
+            return True
+        if self.pool_rss and pages_loaded > 0 and self.total_rss() >= self.pool_rss:
+            logger.info("Reciclando navegador (%.0f MB) por límite de memoria del pool", rss / MB)
+            return True
+        return False
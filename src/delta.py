@@ -0,0 +1,162 @@
+"""Change feed between consecutive runs of the same search."""
+
+from __future__ import annotations
+
+import dbm
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from .postprocess import canonicalize_urls, record_key
+
+JobRecord = Dict[str, str]
+
+logger = logging.getLogger(__name__)
+
+TRACKED_FIELDS = ("titulo", "empresa")
+
+
+def search_key(busqueda: str, dias: int, sources: Sequence[str]) -> str:
+    """Stable identifier of a search: same busqueda, dias and sources share an index."""
+    raw = f"{busqueda.strip().lower()}|{dias}|{','.join(sorted(s.lower() for s in sources))}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def canonical_urls(urls: Sequence[str]) -> List[str]:
+    """Same canonical form as post-processing: https, lowercase host, no tracking parameters."""
+    return canonicalize_urls(pd.Series(list(urls), dtype=object)).tolist()
+
+
+def canonical_url(url: str) -> str:
+    return canonical_urls([url])[0]
+
+
+def _fingerprint(record: JobRecord) -> str:
+    joined = "\x1f".join(str(record.get(field) or "").strip() for field in TRACKED_FIELDS)
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:16]
+
+
+class DeltaIndex:
+    """On-disk hash index (``dbm``) of the offers last seen for one search.
+
+    Each key is the record's deduplication key (:func:`postprocess.record_key`
+    over the canonical URL, so an offer listed under two URLs keeps one
+    entry); the value keeps the URL, the tracked fields and
+    their fingerprint, so comparing a run costs one lookup per current record.
+    The removal pass then walks every key stored for this search, so its cost
+    grows with the offers kept for the search, not with the size of the run.
+    """
+
+    def __init__(self, directory: str, key: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{key}.idx")
+
+    def diff(
+        self,
+        records: Iterable[JobRecord],
+        run_id: Optional[str] = None,
+        blocked: Iterable[str] = (),
+    ) -> List[Dict[str, object]]:
+        """Compare ``records`` with the stored state, update it and return the events.
+
+        ``blocked`` names sources whose records are partial (a block cut them
+        short): their missing offers are not reported as removed.
+        """
+        blocked_sources = {source.lower() for source in blocked}
+        run_id = run_id or datetime.now().strftime("%Y%m%dT%H%M%S")
+        events: List[Dict[str, object]] = []
+        current: set[str] = set()
+        fuentes: set[str] = set()
+        records = list(records)
+        urls = canonical_urls([record.get("url") or "" for record in records])
+        with dbm.open(self.path, "c") as index:
+            for record, url in zip(records, urls):
+                key = record_key({**record, "url": url})
+                if not key or key in current:
+                    continue
+                current.add(key)
+                fuentes.add(record.get("fuente", ""))
+                entry = {field: record.get(field) or "" for field in TRACKED_FIELDS}
+                entry["fuente"] = record.get("fuente", "")
+                entry["url"] = url
+                entry["fp"] = _fingerprint(record)
+                stored = index.get(key.encode("utf-8"))
+                previous = json.loads(stored) if stored is not None else None
+                if previous is None:
+                    events.append({"op": "added", "url": url, **_public(entry)})
+                elif previous.get("fp") != entry["fp"]:
+                    events.append(
+                        {"op": "changed", "url": url, **_public(entry), "previous": _public(previous)}
+                    )
+                else:
+                    continue
+                index[key.encode("utf-8")] = json.dumps(entry, ensure_ascii=False)
+            # Solo se dan por desaparecidas las ofertas de fuentes que respondieron
+            # por completo en esta ejecución: una fuente caída o bloqueada no vacía su historial.
+            removed: List[bytes] = []
+            for raw_key in index.keys():
+                key = raw_key.decode("utf-8")
+                if key in current:
+                    continue
+                previous = json.loads(index[raw_key])
+                fuente = previous.get("fuente", "")
+                if fuente not in fuentes or fuente.lower() in blocked_sources:
+                    continue
+                # Índices anteriores usaban la URL como clave y no la guardaban
+                events.append({"op": "removed", "url": previous.get("url") or key, **_public(previous)})
+                removed.append(raw_key)
+            for raw_key in removed:
+                del index[raw_key]
+        for event in events:
+            event["run"] = run_id
+        return events
+
+
+def _public(entry: Dict[str, str]) -> Dict[str, str]:
+    return {key: entry.get(key, "") for key in ("fuente",) + TRACKED_FIELDS}
+
+
+def write_delta(events: List[Dict[str, object]], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as handle:
+        for event in events:
+            handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def emit_delta(
+    records: Iterable[JobRecord],
+    busqueda: str,
+    dias: int,
+    sources: Sequence[str],
+    output_dir: str,
+    blocked: Iterable[str] = (),
+) -> Optional[str]:
+    """Diff ``records`` against the previous run of the same search and write a JSONL feed.
+
+    Returns the path of the feed, or ``None`` when nothing changed. ``blocked``
+    is passed to :meth:`DeltaIndex.diff`.
+    """
+    start_time = time.perf_counter()
+    key = search_key(busqueda, dias, sources)
+    run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+    events = DeltaIndex(os.path.join(output_dir, "index"), key).diff(records, run_id=run_id, blocked=blocked)
+    counts = {op: sum(1 for e in events if e["op"] == op) for op in ("added", "changed", "removed")}
+    logger.info(
+        "Delta '%s': %d nuevas, %d modificadas, %d desaparecidas (%.2fs)",
+        busqueda,
+        counts["added"],
+        counts["changed"],
+        counts["removed"],
+        time.perf_counter() - start_time,
+    )
+    if not events:
+        return None
+    path = os.path.join(output_dir, f"delta_{busqueda.lower()}_d{dias}_{run_id}.jsonl")
+    write_delta(events, path)
+    return path
@@ -0,0 +1,227 @@
+"""Extraction-quality telemetry per search and run, compared against rolling baselines."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .core.extraction import ExtractionStats, JobRecord, Metrics
+
+logger = logging.getLogger(__name__)
+
+# Umbrales de alerta frente a la línea base (mediana de las ejecuciones sanas)
+PER_PAGE_RATIO = 0.5
+FILL_DROP = 0.3
+BRANCH_SHIFT = 0.4
+MIN_RECORDS_FOR_RATES = 5
+
+
+@dataclass
+class HealthReport:
+    source: str
+    busqueda: str
+    dias: int
+    score: float
+    metrics: Metrics
+    alerts: List[str] = field(default_factory=list)
+    baseline_runs: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "time": time.time(),
+            "fuente": self.source,
+            "busqueda": self.busqueda,
+            "dias": self.dias,
+            "score": self.score,
+            "alerts": self.alerts,
+            "metrics": self.metrics,
+        }
+
+
+def post_json(url: str, payload: Dict[str, Any], timeout: float = 5.0) -> None:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout):
+        pass
+
+
+def search_key(source: str, busqueda: str, dias: int) -> str:
+    return f"{source}|{busqueda.strip().lower()}|{dias}"
+
+
+class HealthMonitor:
+    """Rolling per-search baselines and alerts for extraction quality.
+
+    Each run's metrics (cards per page, ``empresa`` fill rate, share of every
+    selector branch per field) are compared with the median of the last
+    ``window`` healthy runs of the same search (source, query and ``dias``),
+    since a niche query legitimately yields fewer offers than a popular one.
+    Until a search has ``min_history`` runs it is compared with the other
+    searches of its source, but only on the metrics that do not depend on the
+    query (fill rate and selector branches). Runs that raise alerts are kept
+    out of the baseline so a broken parser does not become the new normal.
+    Alerts are appended as JSON lines to ``alert_path`` and, when ``webhook``
+    is set, POSTed to it.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        window: int = 10,
+        min_history: int = 3,
+        alert_path: Optional[str] = None,
+        webhook: Optional[str] = None,
+        poster: Callable[[str, Dict[str, Any]], None] = post_json,
+    ) -> None:
+        self.path = path
+        self.window = window
+        self.min_history = min_history
+        self.alert_path = alert_path
+        self.webhook = webhook
+        self.poster = poster
+        # Ejecuciones por búsqueda (ver ``search_key``)
+        self.history: Dict[str, List[Metrics]] = {}
+        self.reports: List[HealthReport] = []
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def baseline(self, source: str, busqueda: str, dias: int) -> Tuple[List[Metrics], bool]:
+        """Healthy runs to compare with and whether they belong to the same search."""
+        with self._lock:
+            own = [run for run in self.history.get(search_key(source, busqueda, dias), []) if not run.get("alerts")]
+            if len(own) >= self.min_history:
+                return own[-self.window :], True
+            pooled = [
+                run
+                for runs in self.history.values()
+                for run in runs
+                if run.get("source") == source and not run.get("alerts")
+            ]
+        pooled.sort(key=lambda run: run.get("time", 0.0))
+        return pooled[-self.window :], False
+
+    def check(self, source: str, busqueda: str, dias: int, stats: ExtractionStats, records: Sequence[JobRecord]) -> HealthReport:
+        metrics = stats.metrics(records)
+        baseline, same_search = self.baseline(source, busqueda, dias)
+        report = HealthReport(source, busqueda, dias, 1.0, metrics, baseline_runs=len(baseline))
+        if len(baseline) >= self.min_history:
+            report.score, report.alerts = evaluate(metrics, baseline, volume=same_search)
+        with self._lock:
+            runs = self.history.setdefault(search_key(source, busqueda, dias), [])
+            runs.append({**metrics, "source": source, "alerts": report.alerts, "time": time.time()})
+            del runs[: -self.window * 2]
+            self.reports.append(report)
+        if report.alerts:
+            logger.warning(
+                "Salud de '%s' para '%s': %.2f — %s", source, busqueda, report.score, "; ".join(report.alerts)
+            )
+            self._emit(report)
+        else:
+            logger.info("Salud de '%s' para '%s': %.2f", source, busqueda, report.score)
+        return report
+
+    def _emit(self, report: HealthReport) -> None:
+        payload = report.to_dict()
+        if self.alert_path:
+            os.makedirs(os.path.dirname(self.alert_path) or ".", exist_ok=True)
+            with self._lock, open(self.alert_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        if self.webhook:
+            try:
+                self.poster(self.webhook, payload)
+            except (urllib.error.URLError, OSError, ValueError):
+                logger.warning("No se pudo enviar la alerta de salud a %s", self.webhook, exc_info=True)
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            logger.warning("No se pudo leer el historial de salud %s", path)
+            return
+        self.history = {key: list(runs) for key, runs in data.get("searches", {}).items()}
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            data = {"searches": {key: list(runs) for key, runs in self.history.items()}}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+def evaluate(metrics: Metrics, baseline: Sequence[Metrics], volume: bool = True) -> Tuple[float, List[str]]:
+    """Score ``metrics`` (0 to 1) against ``baseline`` runs and list what regressed.
+
+    ``volume=False`` skips the offer-count and cards-per-page checks, which
+    only make sense against runs of the same query.
+    """
+    alerts: List[str] = []
+    factors: List[float] = []
+    recent = list(baseline)
+
+    if volume:
+        _check_volume(metrics, recent, alerts, factors)
+
+    base_fill = _median(run.get("empresa_fill") for run in recent)
+    if metrics["empresa_fill"] is not None and base_fill and metrics["records"] >= MIN_RECORDS_FOR_RATES:
+        factors.append(min(1.0, metrics["empresa_fill"] / base_fill))
+        if metrics["empresa_fill"] < base_fill - FILL_DROP:
+            alerts.append(f"empresa presente en {metrics['empresa_fill']:.0%} (mediana {base_fill:.0%})")
+
+    if metrics["records"] >= MIN_RECORDS_FOR_RATES:
+        for name, shares in metrics["branches"].items():
+            base_shares = [run.get("branches", {}).get(name) for run in recent]
+            base_shares = [shares for shares in base_shares if shares]
+            if not base_shares:
+                continue
+            branches = set(shares).union(*base_shares)
+            shifts = {
+                branch: shares.get(branch, 0.0) - statistics.median(s.get(branch, 0.0) for s in base_shares)
+                for branch in branches
+            }
+            branch, shift = max(shifts.items(), key=lambda item: item[1])
+            factors.append(1.0 - max(0.0, shift))
+            if shift > BRANCH_SHIFT:
+                alerts.append(f"{name}: la rama '{branch}' pasó a producir el {shares.get(branch, 0.0):.0%}")
+
+    score = 1.0
+    for factor in factors:
+        score *= factor
+    return round(score, 3), alerts
+
+
+def _check_volume(metrics: Metrics, recent: List[Metrics], alerts: List[str], factors: List[float]) -> None:
+    base_records = statistics.median(run["records"] for run in recent)
+    if metrics["records"] == 0 and base_records >= 1:
+        alerts.append(f"0 ofertas (mediana {base_records:g})")
+        factors.append(0.0)
+
+    base_per_page = _median(run.get("per_page") for run in recent)
+    if metrics["per_page"] is not None and base_per_page:
+        ratio = metrics["per_page"] / base_per_page
+        factors.append(min(1.0, ratio))
+        if ratio < PER_PAGE_RATIO:
+            alerts.append(f"{metrics['per_page']:.1f} tarjetas por página (mediana {base_per_page:.1f})")
+
+
+def _median(values) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return statistics.median(present) if present else None
@@ -3,32 +3,51 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
-from urllib.parse import urlencode, urljoin, urlparse, urlunparse, parse_qs
+from urllib.parse import urlencode, urljoin, urlparse, urlunparse
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from .core.base import BaseScraper
+from .core.blocking import BlockedPageError
+from .core.network import find_dicts_with_keys
+from .indeed_links import TRACKING_PATHS, LinkResolver, job_key, job_url
 
 JobData = Dict[str, Any]
 
 
 class IndeedScraper(BaseScraper):
+    source_name = "indeed"
     SITE_ROOT = "https://pe.indeed.com"
     SEARCH_PATH = "/jobs"
     EXPECTED_PAGE_SIZE = 15  # Indeed typically shows 15 cards per page
+    PAGE_STEP = 10  # El parámetro start avanza de 10 en 10
+    page_size = EXPECTED_PAGE_SIZE
+    results_per_page = PAGE_STEP
+    TOTAL_RESULTS_SELECTORS = (
+        "div.jobsearch-JobCountAndSortPane-jobCount span",
+        "div.jobsearch-JobCountAndSortPane-jobCount",
+        "[data-testid='jobsearch-JobCountAndSortPane-jobCount']",
+    )
+    NETWORK_PATTERNS = ("/jobs", "/api/", "mosaic")
+    SHARD_STATE = ("_search_params", "_fromage")
+    link_resolver: Optional[LinkResolver] = None
 
-    def __init__(self, driver=None, headless: Optional[bool] = True) -> None:
-        super().__init__(driver=driver, headless=headless)
+    def __init__(self, driver=None, headless: Optional[bool] = True, backend=None) -> None:
+        super().__init__(driver=driver, headless=headless, backend=backend)
         self._search_params: Dict[str, str] = {}
         self._fromage: Optional[int] = None
         self._last_page_url: Optional[str] = None
 
     def abrir_pagina_empleos(self, dias: int = 0) -> None:
         self._fromage = self._map_dias_to_fromage(dias)
+        if self.direct_entry:
+            # buscar_vacante arma la URL completa de /jobs; la portada no aporta estado
+            self._last_page_url = None
+            return
         landing_url = f"{self.SITE_ROOT}?r=pe"
-        self.driver.get(landing_url)
+        self._navigate(landing_url)
         self._last_page_url = getattr(self.driver, "current_url", landing_url)
 
     def buscar_vacante(self, palabra_clave: str = "") -> None:
@@ -43,23 +62,38 @@ class IndeedScraper(BaseScraper):
             self._search_params["fromage"] = str(self._fromage)
         query = urlencode(self._search_params, doseq=True)
         url = f"{self.SITE_ROOT}{self.SEARCH_PATH}?{query}"
-        self.driver.get(url)
-        self._last_page_url = getattr(self.driver, "current_url", url)
+        self._open_listing(url)
+        if self._pending_listing:
+            self._last_page_url = None
+        else:
+            self._last_page_url = getattr(self.driver, "current_url", url)
 
     def extraer_puestos(self, timeout: int = 1) -> List[JobData]:
+        self._last_card_count = None
+        network_records = self._extract_from_network(timeout=min(timeout, 3))
+        if network_records:
+            return network_records
         # Wait only until at least one job card is present; don't over-wait for full container
         wait = WebDriverWait(self.driver, timeout)
         cards = self._locate_job_cards(wait)
+        self._last_card_count = len(cards)
         results: List[JobData] = []
         for card in cards:
             anchor = self._find_anchor(card)
             if not anchor:
                 continue
-            href = anchor.get_attribute("href") or ""
-            if not href:
-                continue
-            url = href if href.startswith("http") else urljoin(self.SITE_ROOT, href)
-            url = self._normalize_job_url(url)
+            # data-jk identifica la oferta aunque el href sea un enlace de seguimiento
+            key = (anchor.get_attribute("data-jk") or "").strip()
+            if key:
+                url = job_url(key, self.SITE_ROOT)
+                self._branch("url", "data-jk")
+            else:
+                self._branch("url", "href")
+                href = anchor.get_attribute("href") or ""
+                if not href:
+                    continue
+                url = href if href.startswith("http") else urljoin(self.SITE_ROOT, href)
+                url = self._normalize_job_url(url)
             if not url:
                 continue
             title = self._extract_title(anchor, card)
@@ -67,34 +101,66 @@ class IndeedScraper(BaseScraper):
                 continue
             company = self._extract_company(card)
             results.append({"titulo": title, "url": url, "empresa": company})
-        return results
+            self._branch("origen", "dom")
+        return self._resolve_tracking_links(results)
 
     def extraer_todos_los_puestos(self, timeout: int = 1, page_wait: float = 0.1) -> List[JobData]:
         return self.gather_paginated(
             extractor=lambda: self.extraer_puestos(timeout=timeout),
             navigator=self.navegar_a_pagina,
             page_wait=page_wait,
+            workers=self.page_workers,
+            shard_extractor=lambda shard: shard.extraer_puestos(timeout=timeout),
         )
 
+    def page_url(self, numero: int) -> Optional[str]:
+        if numero < 1 or not self._search_params:
+            return None
+        params = dict(self._search_params)
+        params["start"] = str((numero - 1) * self.PAGE_STEP)
+        query = urlencode(params, doseq=True)
+        return f"{self.SITE_ROOT}{self.SEARCH_PATH}?{query}"
+
     def navegar_a_pagina(self, numero: int) -> bool:
         if numero < 1:
             return False
-        params = dict(self._search_params)
-        params["start"] = str((numero - 1) * 10)
-        query = urlencode(params, doseq=True)
-        url = f"{self.SITE_ROOT}{self.SEARCH_PATH}?{query}"
+        url = self.page_url(numero)
+        if not url:
+            return False
         if self._last_page_url and url == self._last_page_url:
             return False
         try:
-            self.driver.get(url)
+            self._navigate(url)
             current_url = getattr(self.driver, "current_url", url)
             if self._last_page_url and current_url == self._last_page_url:
                 return False
             self._last_page_url = current_url
             return True
+        except BlockedPageError:
+            raise
         except Exception:
             return False
 
+    def spawn_shard(self) -> "IndeedScraper":
+        shard = super().spawn_shard()
+        shard.link_resolver = self.link_resolver
+        return shard
+
+    def _resolve_tracking_links(self, records: List[JobData]) -> List[JobData]:
+        # Los enlaces patrocinados se resuelven después de leer la página, en
+        # paralelo, en vez de una petición HEAD por tarjeta durante la extracción.
+        if self.link_resolver is None:
+            return records
+        tracking = [record["url"] for record in records if urlparse(record["url"]).path.startswith(TRACKING_PATHS)]
+        if not tracking:
+            return records
+        keys = self.link_resolver.resolve_many(tracking)
+        for record in records:
+            key = keys.get(record["url"])
+            if key:
+                record["url"] = job_url(key, self.SITE_ROOT)
+        return records
+
     def _locate_job_cards(self, wait: WebDriverWait):
         # Prefer a quick condition: at least 1 card present in either common selector
         selectors = [
@@ -110,10 +176,13 @@ class IndeedScraper(BaseScraper):
             pass
 
         # Read with priority: structured list first
-        cards = self.driver.find_elements(By.CSS_SELECTOR, "ul.jobsearch-ResultsList li")
-        if cards:
-            return cards
-        return self.driver.find_elements(By.CSS_SELECTOR, "div.job_seen_beacon")
+        for selector in ("ul.jobsearch-ResultsList li", "div.job_seen_beacon"):
+            cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            if cards:
+                self._branch("tarjetas", selector)
+                return cards
+        self._branch("tarjetas", "ninguno")
+        return []
 
     def _find_anchor(self, card):
         anchors = card.find_elements(By.CSS_SELECTOR, "a[data-jk], a.tapItem")
@@ -129,10 +198,13 @@ class IndeedScraper(BaseScraper):
             if elements:
                 text = elements[0].text.strip()
                 if text:
+                    self._branch("titulo", selector)
                     return text
         text = anchor.text.strip()
         if text:
+            self._branch("titulo", "texto")
             return text.split("\n")[0]
+        self._branch("titulo", "ninguno")
         return ""
 
     def _extract_company(self, card) -> str:
@@ -147,9 +219,25 @@ class IndeedScraper(BaseScraper):
             if elems:
                 text = elems[0].text.strip()
                 if text:
+                    self._branch("empresa", selector)
                     return text.split("\n")[0]
+        self._branch("empresa", "ninguno")
         return ""
 
+    def _records_from_payload(self, payload: Any) -> List[JobData]:
+        # Las tarjetas del buscador llegan como objetos con "jobkey"
+        results: List[JobData] = []
+        for item in find_dicts_with_keys(payload, ("jobkey",)):
+            title = str(item.get("displayTitle") or item.get("title") or "").strip()
+            jobkey = str(item.get("jobkey") or "").strip()
+            if not title or not jobkey:
+                continue
+            company = str(item.get("company") or item.get("companyName") or "").strip()
+            results.append(
+                {"titulo": title, "url": job_url(jobkey, self.SITE_ROOT), "empresa": company}
+            )
+        return results
+
     def _map_dias_to_fromage(self, dias: int) -> Optional[int]:
         if dias == 1:
             return 1
@@ -160,13 +248,12 @@ class IndeedScraper(BaseScraper):
     def _normalize_job_url(self, url: str) -> str:
         if not url:
             return ""
+        key = job_key(url)
+        if key:
+            return job_url(key, self.SITE_ROOT)
         parsed = urlparse(url)
-        query_params = parse_qs(parsed.query)
-        for key in ("jk", "vjk"):
-            values = query_params.get(key)
-            if values:
-                return f"{self.SITE_ROOT}/viewjob?jk={values[0]}"
-        if parsed.path.startswith("/pagead/clk"):
+        if parsed.path.startswith(TRACKING_PATHS):
+            # Se conserva la consulta para resolverlo con _resolve_tracking_links
             cleaned = parsed._replace(fragment="")
             return urlunparse(cleaned)
         cleaned = parsed._replace(query="", fragment="")
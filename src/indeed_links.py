@@ -0,0 +1,187 @@
+"""Resolution of Indeed tracking/sponsored links to their ``jk`` job key."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urljoin, urlsplit
+
+logger = logging.getLogger(__name__)
+
+SITE_ROOT = "https://pe.indeed.com"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+
+_JOB_KEY = re.compile(r"[?&](?:jk|vjk)=([0-9A-Za-z]+)")
+# Parámetros que identifican el anuncio; el resto (tk, from, cb, ...) cambia en cada impresión
+STABLE_PARAMS = ("ad", "jk", "vjk", "fccid", "mo")
+MAX_HOPS = 4
+# Rutas de los enlaces de seguimiento que esconden el jk tras una redirección
+TRACKING_PATHS = ("/pagead/clk", "/rc/clk")
+
+Probe = Callable[[str], Optional[str]]
+
+
+def job_key(url: str) -> Optional[str]:
+    """``jk``/``vjk`` value of ``url``, if present."""
+    match = _JOB_KEY.search(url or "")
+    return match.group(1) if match else None
+
+
+def job_url(key: str, site_root: str = SITE_ROOT) -> str:
+    return f"{site_root}/viewjob?jk={key}"
+
+
+def link_cache_key(url: str) -> str:
+    """Key of a tracking link without its per-impression parameters."""
+    parts = urlsplit(url)
+    stable = [(name, value) for name, value in parse_qsl(parts.query) if name in STABLE_PARAMS]
+    if not stable:
+        return f"{parts.path}?{parts.query}" if parts.query else parts.path
+    return parts.path + "?" + "&".join(f"{name}={value}" for name, value in sorted(stable))
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def head_location(url: str, timeout: float = 5.0) -> Optional[str]:
+    """``Location`` of a redirect answered to a HEAD request (never followed)."""
+    request = urllib.request.Request(url, method="HEAD", headers={"User-Agent": USER_AGENT})
+    try:
+        with _opener.open(request, timeout=timeout):
+            return None
+    except urllib.error.HTTPError as error:
+        if 300 <= error.code < 400:
+            location = error.headers.get("Location")
+            return urljoin(url, location) if location else None
+        return None
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+
+class LinkResolver:
+    """Persistent map from Indeed tracking links to job keys.
+
+    Links that already carry ``jk`` are resolved without I/O. Others (e.g.
+    ``/pagead/clk`` sponsored links) are probed once with HEAD requests that
+    read the redirect chain instead of following it in the browser; the
+    result, including failures, is cached by :func:`link_cache_key` and
+    optionally persisted to ``path`` so later runs skip the probe. Failures
+    are retried after ``retry_after`` seconds. A link already being probed by
+    another thread is waited for instead of probed again.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        probe: Optional[Probe] = head_location,
+        retry_after: float = 24 * 3600,
+    ) -> None:
+        self.path = path
+        self.probe = probe
+        self.retry_after = retry_after
+        self._keys: Dict[str, str] = {}
+        self._failed: Dict[str, float] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.probes = 0
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def resolve(self, url: str) -> Optional[str]:
+        """Job key behind ``url`` (``None`` when it cannot be determined)."""
+        key = job_key(url)
+        if key:
+            return key
+        cache_key = link_cache_key(url)
+        with self._lock:
+            cached = self._keys.get(cache_key)
+            failed_at = self._failed.get(cache_key)
+            if cached:
+                return cached
+            if self.probe is None or (failed_at is not None and time.time() - failed_at < self.retry_after):
+                return None
+            pending = self._inflight.get(cache_key)
+            if pending is None:
+                self._inflight[cache_key] = threading.Event()
+        if pending is not None:
+            # Otro hilo ya sigue este enlace: se espera su resultado en vez de repetir la sonda
+            pending.wait()
+            with self._lock:
+                return self._keys.get(cache_key)
+        key = None
+        try:
+            key = self._follow(url)
+        finally:
+            with self._lock:
+                if key:
+                    self._keys[cache_key] = key
+                    self._failed.pop(cache_key, None)
+                else:
+                    self._failed[cache_key] = time.time()
+                self._dirty = True
+                self._inflight.pop(cache_key).set()
+        return key
+
+    def resolve_many(self, urls: Iterable[str], workers: int = 4) -> Dict[str, Optional[str]]:
+        """Job key behind each distinct URL, probing up to ``workers`` links at a time."""
+        distinct = list(dict.fromkeys(urls))
+        if workers <= 1 or len(distinct) <= 1:
+            return {url: self.resolve(url) for url in distinct}
+        with ThreadPoolExecutor(max_workers=min(workers, len(distinct))) as pool:
+            return dict(zip(distinct, pool.map(self.resolve, distinct)))
+
+    def _follow(self, url: str) -> Optional[str]:
+        current = url
+        for _ in range(MAX_HOPS):
+            self.probes += 1
+            location = self.probe(current)
+            if not location:
+                return None
+            key = job_key(location)
+            if key:
+                return key
+            current = urljoin(current, location)
+        return None
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            logger.warning("No se pudo leer la caché de enlaces de Indeed %s", path)
+            return
+        self._keys.update(data.get("links", {}))
+        self._failed.update(data.get("failed", {}))
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            if not self._dirty and os.path.exists(path):
+                return
+            data = {"links": dict(self._keys), "failed": dict(self._failed)}
+            self._dirty = False
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        logger.info("Caché de enlaces de Indeed guardada en %s (%d enlaces)", path, len(data["links"]))
@@ -0,0 +1,146 @@
+"""Logging setup: background (queue) handler, JSON lines and sampling of debug events."""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Los campos de contexto viven en src/core para que los scrapers no dependan
+# de la configuración de handlers; se reexportan aquí por compatibilidad.
+from .core.logcontext import current_context, in_current_context, log_context, set_static_fields
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+LOG_FORMATS = ("text", "json")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class ContextFilter(logging.Filter):
+    """Attach the current context to the record in the emitting thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = current_context()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one of every ``rate`` DEBUG records per message template.
+
+    The first occurrence always passes; kept records carry ``sample_rate`` so
+    counts can be re-weighted when analysing the logs.
+    """
+
+    def __init__(self, rate: int = 1) -> None:
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self._counters: Dict[tuple, itertools.count] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate == 1 or record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.msg)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters.setdefault(key, itertools.count())
+        if next(counter) % self.rate:
+            return False
+        record.sample_rate = self.rate
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the context fields at top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        payload.update(getattr(record, "context", None) or {})
+        sample_rate = getattr(record, "sample_rate", None)
+        if sample_rate:
+            payload["sample_rate"] = sample_rate
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = record.stack_info
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # Solo se resuelve el mensaje en el hilo que registra; el formateo final
+    # (texto o JSON) y la escritura ocurren en el hilo del listener.
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+    level: int = logging.INFO,
+    log_format: str = "text",
+    log_file: Optional[str] = None,
+    sample: int = 1,
+    **static_fields: Any,
+) -> logging.handlers.QueueListener:
+    """Route the root logger through a queue drained by a background thread.
+
+    ``static_fields`` (e.g. ``run``) are added to every record. Calling it
+    again replaces the previous configuration.
+    """
+    global _listener
+    shutdown_logging()
+    formatter: logging.Formatter = JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    set_static_fields(**static_fields)
+
+    queue_handler = _QueueHandler(queue.SimpleQueue())
+    if sample > 1:
+        queue_handler.addFilter(SamplingFilter(sample))
+    queue_handler.addFilter(ContextFilter())
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush pending records and stop the background thread."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(shutdown_logging)
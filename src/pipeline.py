@@ -5,20 +5,53 @@ from __future__ import annotations
 import gc
 import logging
 import time
+from contextlib import nullcontext
+from dataclasses import dataclass
 from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from .bumeran import BumeranScraper
 from .computrabajo import ComputrabajoScraper
 from .indeed import IndeedScraper
+from .indeed_links import LinkResolver
+from .core.backend import DriverBackend, LocalChromiumBackend, LocalFirefoxBackend
 from .core.base import BaseScraper
+from .core.blocking import BlockedPageError, BlockRegistry
+from .core.cache import PageCache
+from .core.redirects import RedirectCache
+from .core.resources import ResourceGovernor
+from .companies import CompanyIndex
+from .delta import emit_delta
+from .health import HealthMonitor
+from .core.logcontext import in_current_context, log_context
+from .profiling import RunProfiler
+from .postprocess import AliasTable, postprocess_records, record_key
+from .relevance import RelevanceScorer, rank_records
+from .replay import SnapshotArchive
+from .search_index import SearchIndex
+from .storage import SegmentStore
 from .utils import guardar_resultados
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 JobRecord = Dict[str, str]
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_SOURCES: Sequence[str] = ("bumeran", "computrabajo", "indeed")
+EXTRACTION_MODES: Sequence[str] = ("dom", "network", "api")
+API_MODE_SOURCES: Sequence[str] = ("bumeran",)
+
+
+def _tag_records(puestos: Iterable[JobRecord], fuente: str) -> List[JobRecord]:
+    """Records with a URL, once per URL, labelled with their source."""
+    results: List[JobRecord] = []
+    seen: Set[str] = set()
+    for puesto in puestos:
+        url = puesto.get("url")
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        results.append({"fuente": fuente, **puesto})
+    return results
 
 
 def _collect_bumeran(
@@ -29,20 +62,25 @@ def _collect_bumeran(
     page_wait: float,
 ) -> List[JobRecord]:
     results: List[JobRecord] = []
-    seen: Set[str] = set()
     try:
-        scraper.abrir_pagina_empleos(hoy=dias == 1, dias=dias if dias in (2, 3) else 0)
-        scraper.buscar_vacante(busqueda)
-        logger.info("[bumeran] Esperando %.1f s para carga inicial", initial_wait)
-        time.sleep(initial_wait)
-        puestos = scraper.extraer_todos_los_puestos(timeout=10, page_wait=page_wait)
+        puestos: List[JobRecord] = []
+        if scraper.extraction_mode == "api":
+            try:
+                puestos = scraper.extraer_desde_api(busqueda, hoy=dias == 1, dias=dias)
+                logger.info("[bumeran] API devolvió %d puestos", len(puestos))
+            except Exception:
+                logger.warning("[bumeran] Falló la API de búsqueda, se usa el navegador", exc_info=True)
+        if not puestos:
+            scraper.abrir_pagina_empleos(hoy=dias == 1, dias=dias if dias in (2, 3) else 0)
+            scraper.buscar_vacante(busqueda)
+            logger.info("[bumeran] Esperando %.1f s para carga inicial", initial_wait)
+            time.sleep(initial_wait)
+            puestos = scraper.extraer_todos_los_puestos(timeout=10, page_wait=page_wait)
         logger.info("[bumeran] puestos extraídos: %d", len(puestos))
-        for puesto in puestos:
-            url = puesto.get("url")
-            if not url or url in seen:
-                continue
-            seen.add(url)
-            results.append({"fuente": "Bumeran", **puesto})
+        results = _tag_records(puestos, "Bumeran")
+    except BlockedPageError as error:
+        error.partial = _tag_records(error.partial, "Bumeran")
+        raise
     except Exception:
         logger.exception("[bumeran] Error durante la recolección")
     return results
@@ -56,7 +94,6 @@ def _collect_computrabajo(
     page_wait: float,
 ) -> List[JobRecord]:
     results: List[JobRecord] = []
-    seen: Set[str] = set()
     try:
         scraper.abrir_pagina_empleos(dias=dias)
         scraper.buscar_vacante(busqueda)
@@ -64,12 +101,10 @@ def _collect_computrabajo(
         time.sleep(initial_wait)
         puestos = scraper.extraer_todos_los_puestos(timeout=10, page_wait=page_wait)
         logger.info("[computrabajo] puestos extraídos: %d", len(puestos))
-        for puesto in puestos:
-            url = puesto.get("url")
-            if not url or url in seen:
-                continue
-            seen.add(url)
-            results.append({"fuente": "Computrabajo", **puesto})
+        results = _tag_records(puestos, "Computrabajo")
+    except BlockedPageError as error:
+        error.partial = _tag_records(error.partial, "Computrabajo")
+        raise
     except Exception:
         logger.exception("[computrabajo] Error durante la recolección")
     return results
@@ -83,7 +118,6 @@ def _collect_indeed(
     page_wait: float,
 ) -> List[JobRecord]:
     results: List[JobRecord] = []
-    seen: Set[str] = set()
     try:
         scraper.abrir_pagina_empleos(dias=dias)
         scraper.buscar_vacante(busqueda)
@@ -95,12 +129,10 @@ def _collect_indeed(
         time.sleep(effective_initial_wait)
         puestos = scraper.extraer_todos_los_puestos(timeout=4, page_wait=effective_page_wait)
         logger.info("[indeed] puestos extraídos: %d", len(puestos))
-        for puesto in puestos:
-            url = puesto.get("url")
-            if not url or url in seen:
-                continue
-            seen.add(url)
-            results.append({"fuente": "Indeed", **puesto})
+        results = _tag_records(puestos, "Indeed")
+    except BlockedPageError as error:
+        error.partial = _tag_records(error.partial, "Indeed")
+        raise
     except Exception:
         logger.exception("[indeed] Error durante la recolección")
     return results
@@ -110,8 +142,9 @@ def _cleanup_driver(scraper: BaseScraper, label: str | None = None) -> None:
     source_label = label or scraper.__class__.__name__
     logger.debug("Liberando recursos adicionales para '%s'", source_label)
     try:
-        if hasattr(scraper, "driver") and scraper.driver:
-            scraper.driver.quit()
+        driver = getattr(scraper, "_driver", None)
+        if driver:
+            driver.quit()
     except Exception:
         logger.exception("Fallo al cerrar driver para '%s'", source_label)
     gc.collect()
@@ -122,12 +155,131 @@ CollectorFn = Callable[[Any, str, int, float, float], List[JobRecord]]
 
 
 SCRAPER_REGISTRY: Dict[str, Tuple[Callable[..., BaseScraper], CollectorFn, bool]] = {
-    "bumeran": (lambda headless=None: BumeranScraper(headless=headless), _collect_bumeran, True),
-    "computrabajo": (lambda headless=None: ComputrabajoScraper(headless=headless), _collect_computrabajo, False),
-    "indeed": (lambda headless=None: IndeedScraper(headless=headless), _collect_indeed, False),
+    "bumeran": (
+        lambda headless=None, backend=None: BumeranScraper(headless=headless, backend=backend),
+        _collect_bumeran,
+        True,
+    ),
+    "computrabajo": (
+        lambda headless=None, backend=None: ComputrabajoScraper(headless=headless, backend=backend),
+        _collect_computrabajo,
+        False,
+    ),
+    "indeed": (
+        lambda headless=None, backend=None: IndeedScraper(headless=headless, backend=backend),
+        _collect_indeed,
+        False,
+    ),
 }
 
 
+@dataclass
+class RunContext:
+    """Services shared by every scraper of a run; each one is optional."""
+
+    page_cache: Optional[PageCache] = None
+    snapshot_archive: Optional[SnapshotArchive] = None
+    resource_governor: Optional[ResourceGovernor] = None
+    company_index: Optional[CompanyIndex] = None
+    profiler: Optional[RunProfiler] = None
+    link_resolver: Optional[LinkResolver] = None
+    redirect_cache: Optional[RedirectCache] = None
+    direct_entry: bool = True
+    health_monitor: Optional[HealthMonitor] = None
+    block_registry: Optional[BlockRegistry] = None
+
+    def configure(self, scraper: BaseScraper) -> None:
+        """Hand the run's services to a freshly built scraper."""
+        if self.page_cache is not None:
+            scraper.page_cache = self.page_cache
+        if self.snapshot_archive is not None:
+            scraper.snapshot_archive = self.snapshot_archive
+        if self.resource_governor is not None and self.resource_governor.enabled:
+            scraper.resource_governor = self.resource_governor
+        if self.link_resolver is not None and isinstance(scraper, IndeedScraper):
+            scraper.link_resolver = self.link_resolver
+        if self.redirect_cache is not None:
+            scraper.redirect_cache = self.redirect_cache
+        if not self.direct_entry:
+            scraper.direct_entry = False
+        if self.block_registry is not None:
+            scraper.block_registry = self.block_registry
+
+
+class SourceResults(List[JobRecord]):
+    """Records of one source for one search.
+
+    ``blocked`` is set when a block cut the pagination short: the records are
+    then those of the pages read before it.
+    """
+
+    def __init__(self, records: Iterable[JobRecord] = (), blocked: Optional[BlockedPageError] = None) -> None:
+        super().__init__(records)
+        self.blocked = blocked
+
+
+class MergedResults(List[JobRecord]):
+    """Combined records of several sources; ``blocked`` names those whose records are partial."""
+
+    def __init__(self, records: Iterable[JobRecord] = (), blocked: Iterable[str] = ()) -> None:
+        super().__init__(records)
+        self.blocked = list(blocked)
+
+
+def _build_scraper(
+    factory: Callable[..., BaseScraper],
+    headless: Optional[bool],
+    backend: Optional[DriverBackend],
+) -> BaseScraper:
+    if backend is None:
+        return factory(headless=headless)
+    return factory(headless=headless, backend=backend)
+
+
+def _pool_size(task_count: int, backend: Optional[DriverBackend]) -> int:
+    size = task_count
+    if backend is not None and backend.capacity:
+        size = min(size, backend.capacity)
+    return max(1, size)
+
+
+def _network_backend(
+    source_modes: Dict[str, str], backend: Optional[DriverBackend], workers: int
+) -> Optional[DriverBackend]:
+    """Local Chromium backend for "network" sources, bounded by the run's ``workers``."""
+    network_sources = sorted(source for source, mode in source_modes.items() if mode == "network")
+    if not network_sources:
+        return None
+    if backend is not None:
+        # La captura de DevTools necesita Chromium local: estas fuentes no usan el backend configurado
+        logger.warning(
+            "Las fuentes en modo 'network' (%s) usan Chromium local en lugar de %s (máx. %d sesiones)",
+            ", ".join(network_sources),
+            type(backend).__name__,
+            workers,
+        )
+    return LocalChromiumBackend(capacity=workers)
+
+
+def _budget_backend(
+    backend: Optional[DriverBackend], budget: int, page_workers: int
+) -> Optional[DriverBackend]:
+    """Backend that counts task and page-shard browsers against the same ``budget``.
+
+    The budget is raised to ``page_workers`` so a single search can still use
+    all of its shards. Without shards each task holds one browser and the pool
+    size already bounds them; a backend with its own capacity (Grid) is kept.
+    """
+    if page_workers <= 1 or (backend is not None and backend.capacity):
+        return backend
+    capacity = max(budget, page_workers)
+    if backend is None:
+        return LocalFirefoxBackend(capacity=capacity)
+    if isinstance(backend, LocalFirefoxBackend):
+        return LocalFirefoxBackend(backend.profile_template, capacity=capacity)
+    return backend
+
+
 def _normalize_sources(sources: Iterable[str] | None) -> List[str]:
     if not sources:
         return list(DEFAULT_SOURCES)
@@ -148,6 +300,20 @@ def _normalize_sources(sources: Iterable[str] | None) -> List[str]:
     return ordered_unique or list(DEFAULT_SOURCES)
 
 
+def _normalize_modes(modes: Dict[str, str] | None) -> Dict[str, str]:
+    normalized: Dict[str, str] = {}
+    for source, mode in (modes or {}).items():
+        mode = (mode or "").lower()
+        if mode not in EXTRACTION_MODES:
+            logger.warning("Modo de extracción desconocido '%s' para '%s', se usa 'dom'.", mode, source)
+            continue
+        if mode == "api" and source.lower() not in API_MODE_SOURCES:
+            logger.warning("La fuente '%s' no tiene modo 'api', se usa 'dom'.", source)
+            continue
+        normalized[source.lower()] = mode
+    return normalized
+
+
 def run_combined(
     busqueda: str,
     dias: int,
@@ -155,23 +321,53 @@ def run_combined(
     page_wait: float,
     sources: Iterable[str] | None = None,
     headless: Optional[bool] = None,
+    backend: Optional[DriverBackend] = None,
+    modes: Dict[str, str] | None = None,
+    page_workers: int = 1,
+    context: Optional[RunContext] = None,
+    delta_dir: Optional[str] = None,
+    normalize: bool = False,
+    company_aliases: Optional[AliasTable] = None,
+    search_index: Optional[SearchIndex] = None,
+    min_relevance: Optional[float] = None,
+    relevance_scorer: Optional[RelevanceScorer] = None,
+    segment_store: Optional[SegmentStore] = None,
+    write_files: bool = True,
 ) -> List[JobRecord]:
-    combined, executed = collect_jobs(
+    merged, executed = collect_jobs(
         busqueda=busqueda,
         dias=dias,
         initial_wait=initial_wait,
         page_wait=page_wait,
         sources=sources,
         headless=headless,
+        backend=backend,
+        modes=modes,
+        page_workers=page_workers,
+        context=context,
     )
     if not executed:
         logger.warning("No se ejecutó ningún scraper válido.")
         return []
+    combined: List[JobRecord] = merged
+    if merged.blocked:
+        logger.warning("Resultados parciales para '%s': bloqueo en %s", busqueda, ", ".join(merged.blocked))
 
+    if normalize or company_aliases is not None:
+        combined = postprocess_records(combined, company_aliases)
+    if min_relevance is not None:
+        combined = rank_records(combined, busqueda, min_relevance, relevance_scorer)
     label = "combined" if len(executed) > 1 else executed[0]
     logger.info("Guardando %d ofertas para '%s' con etiqueta '%s'", len(combined), busqueda, label)
-    guardar_resultados(combined, busqueda, output_dir="output", source=label)
+    guardar_resultados(
+        combined, busqueda, output_dir="output", source=label, store=segment_store, files=write_files
+    )
     logger.info("Guardado completado.")
+    if delta_dir:
+        emit_delta(combined, busqueda, dias, _normalize_sources(sources), delta_dir, blocked=merged.blocked)
+    if search_index is not None:
+        indexed = search_index.add(combined, busqueda)
+        logger.info("Índice de búsqueda actualizado con %d ofertas", indexed)
     return combined
 
 
@@ -182,64 +378,158 @@ def collect_jobs(
     page_wait: float,
     sources: Iterable[str] | None = None,
     headless : Optional[bool] = None,
+    backend: Optional[DriverBackend] = None,
+    modes: Dict[str, str] | None = None,
+    page_workers: int = 1,
+    context: Optional[RunContext] = None,
 ) -> Tuple[List[JobRecord], List[str]]:
     selected_sources = _normalize_sources(sources)
-    combined: List[JobRecord] = []
-    executed: List[str] = []
-    seen_urls: Set[str] = set()
-    
+    source_modes = _normalize_modes(modes)
     # Prepara las tareas para cada fuente
-    tasks = []
-    for source in selected_sources:
-        entry = SCRAPER_REGISTRY.get(source)
-        if not entry:
-            logger.warning("Fuente desconocida '%s', se omite.", source)
-            continue
-        factory, collector, needs_cleanup = entry
-        scraper = factory(headless=headless)
-        tasks.append((source, scraper, collector, needs_cleanup))
-        
-    def run_task(source, scraper, collector, needs_cleanup):
+    tasks = [source for source in selected_sources if _registry_entry(source)]
+    workers = _pool_size(len(tasks), backend)
+    # El modo "network" necesita Chromium con captura de DevTools
+    network_backend = _network_backend(source_modes, backend, workers)
+    # Los shards de página comparten el presupuesto de navegadores de las tareas
+    backend = _budget_backend(backend, workers, page_workers)
+
+    def run_task(source: str) -> Tuple[str, List[JobRecord]]:
+        mode = source_modes.get(source)
+        results = run_source(
+            source,
+            busqueda,
+            dias,
+            initial_wait,
+            page_wait,
+            headless=headless,
+            backend=network_backend if mode == "network" else backend,
+            mode=mode,
+            page_workers=page_workers,
+            context=context,
+        )
+        return source, results
+
+    # Ejecuta en paralelo, limitado por la capacidad del backend
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(in_current_context(run_task), source) for source in tasks]
+        # Se combina en el orden de las fuentes para que la deduplicación no
+        # dependa de qué scraper termina primero.
+        combined, executed = merge_source_results(future.result() for future in futures)
+
+    logger.info("Total ofertas combinadas tras deduplicación: %d", len(combined))
+    return combined, executed
+
+
+def _registry_entry(source: str):
+    entry = SCRAPER_REGISTRY.get(source)
+    if not entry:
+        logger.warning("Fuente desconocida '%s', se omite.", source)
+    return entry
+
+
+def run_source(
+    source: str,
+    busqueda: str,
+    dias: int,
+    initial_wait: float,
+    page_wait: float,
+    headless: Optional[bool] = None,
+    backend: Optional[DriverBackend] = None,
+    mode: Optional[str] = None,
+    page_workers: int = 1,
+    context: Optional[RunContext] = None,
+) -> SourceResults:
+    """Run one source for one search and return its records (never raises).
+
+    A block keeps the records of the pages read before it, flagged through
+    :attr:`SourceResults.blocked`.
+    """
+    context = context or RunContext()
+    entry = SCRAPER_REGISTRY.get(source)
+    if not entry:
+        return SourceResults()
+    factory, collector, needs_cleanup = entry
+    block_registry = context.block_registry
+    if block_registry is not None:
+        left = block_registry.source_remaining(source)
+        if left > 0:
+            logger.warning("Fuente '%s' bloqueada, en enfriamiento %.0f min más: se omite", source, left / 60)
+            return SourceResults()
+    profiler = context.profiler
+    profiled = profiler.profile(f"{source}_{busqueda}_d{dias}") if profiler is not None else nullcontext()
+    with log_context(fuente=source, busqueda=busqueda, dias=dias), profiled:
         logger.info("Iniciando scraper '%s'", source)
         start_time = time.perf_counter()
-        results: List[JobRecord] = []
+        results = SourceResults()
+        scraper = None
         try:
-            results = collector(scraper, busqueda, dias, initial_wait, page_wait)
+            # El scraper se crea dentro del worker para que la sesión del
+            # navegador solo se reserve cuando hay capacidad para usarla.
+            scraper = _build_scraper(factory, headless, backend)
+            if mode:
+                scraper.extraction_mode = mode
+            if page_workers > 1:
+                scraper.page_workers = page_workers
+            context.configure(scraper)
+            try:
+                results = SourceResults(collector(scraper, busqueda, dias, initial_wait, page_wait))
+            except BlockedPageError as error:
+                # Un bloqueo no es "sin resultados": se registra, la fuente se
+                # abandona y se conservan las páginas leídas antes del bloqueo
+                if block_registry is not None:
+                    block_registry.record(source, error)
+                else:
+                    logger.warning("Bloqueo en '%s': %s", source, error)
+                results = SourceResults(error.partial, blocked=error)
+                if results:
+                    logger.warning("Resultados parciales de '%s': %d ofertas antes del bloqueo", source, len(results))
+            else:
+                if context.health_monitor is not None:
+                    context.health_monitor.check(source, busqueda, dias, scraper.extraction_stats, results)
+            if context.company_index is not None:
+                for record in results:
+                    context.company_index.apply(record)
         except Exception:
             logger.exception("Error no controlado ejecutando scraper '%s'", source)
         finally:
-            try:
-                scraper.close()
-            except Exception:
-                logger.exception("Error cerrando scraper '%s'", source)
-            if needs_cleanup:
-                _cleanup_driver(scraper, source)
+            if scraper is not None:
+                try:
+                    scraper.close()
+                except Exception:
+                    logger.exception("Error cerrando scraper '%s'", source)
+                if needs_cleanup:
+                    _cleanup_driver(scraper, source)
         elapsed = time.perf_counter() - start_time
         logger.info("Scraper '%s' finalizado en %.2fs con %d ofertas", source, elapsed, len(results))
-        return source, results
-    
-    # Ejecuta en paralelo
-    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
-        future_to_source = {
-            executor.submit(run_task, source, scraper, collector, needs_cleanup): source
-            for source, scraper, collector, needs_cleanup in tasks
-        }
-        for future in as_completed(future_to_source):
-            source, results = future.result()
-            if not results:
-                logger.info("Scraper '%s' no produjo resultados.", source)
+        return results
+
+
+def merge_source_results(
+    source_results: Iterable[Tuple[str, List[JobRecord]]],
+) -> Tuple[MergedResults, List[str]]:
+    """Combine per-source results in the given order, dropping repeated URLs.
+
+    Sources whose :class:`SourceResults` were cut short by a block are listed
+    in ``combined.blocked``.
+    """
+    combined = MergedResults()
+    executed: List[str] = []
+    seen_keys: Set[str] = set()
+    for source, results in source_results:
+        if getattr(results, "blocked", None) is not None:
+            combined.blocked.append(source)
+        if not results:
+            logger.info("Scraper '%s' no produjo resultados.", source)
+            continue
+        executed.append(source)
+        for job in results:
+            key = record_key(job)
+            if not key:
+                logger.debug("Oferta sin URL descartado de '%s'", source)
                 continue
-            executed.append(source)
-            for job in results:
-                url = job.get("url")
-                if not url:
-                    logger.debug("Oferta sin URL descartado de '%s'", source)
-                    continue
-                if url in seen_urls:
-                    logger.debug("Oferta duplicada descartada: %s", url)
-                    continue
-                seen_urls.add(url)
-                combined.append(job)
-                
-    logger.info("Total ofertas combinadas tras deduplicación: %d", len(combined))
-    return combined, executed
\ No newline at end of file
+            if key in seen_keys:
+                logger.debug("Oferta duplicada descartada: %s", job.get("url"))
+                continue
+            seen_keys.add(key)
+            combined.append(job)
+    return combined, executed
@@ -0,0 +1,212 @@
+"""Vectorised normalisation, enrichment and deduplication of job records with pandas."""
+
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+import pandas as pd
+
+from .computrabajo_urls import offer_id as computrabajo_offer_id
+from .storage import MANIFEST, SegmentStore
+from .text import fold_words
+
+JobRecord = Dict[str, str]
+
+logger = logging.getLogger(__name__)
+
+BASE_COLUMNS = ["fuente", "empresa", "titulo", "url"]
+_TRACKING_PARAM = r"(?<=[?&])(?:utm_[a-z]+|from|advn|sjdu|tk|vjs)=[^&#]*&?"
+# Id del aviso de Bumeran al final de la ruta: /empleos/<slug>-<id>.html
+_BUMERAN_AVISO = re.compile(r"-(\d+)\.html(?:[?#]|$)")
+
+AliasTable = Union[pd.DataFrame, Mapping[str, str]]
+
+
+def _on_uniques(series: pd.Series, transform) -> pd.Series:
+    # Empresas, títulos y URLs se repiten mucho (sobre todo al combinar
+    # historial): cada valor distinto se transforma una sola vez.
+    codes, uniques = pd.factorize(series.fillna("").astype(str), sort=False)
+    transformed = transform(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    return pd.Series(transformed[codes], index=series.index, dtype=object)
+
+
+def _normalize_unique(values: pd.Series) -> pd.Series:
+    return values.map(fold_words)
+
+
+def normalize_text(series: pd.Series) -> pd.Series:
+    """Casefold, strip accents and collapse whitespace."""
+    return _on_uniques(series, _normalize_unique)
+
+
+def _collapse_spaces(series: pd.Series) -> pd.Series:
+    return _on_uniques(series, lambda values: values.str.replace(r"\s+", " ", regex=True).str.strip())
+
+
+def _canonicalize_unique(urls: pd.Series) -> pd.Series:
+    urls = urls.str.strip()
+    # Solo se reescriben las URLs que lo necesitan; el resto pasa tal cual
+    insecure = urls.str.startswith("http://")
+    if insecure.any():
+        urls[insecure] = "https://" + urls[insecure].str.slice(len("http://"))
+    upper_host = urls.str.contains(r"^https://[^/?#]*[A-Z]", regex=True)
+    if upper_host.any():
+        parts = urls[upper_host].str.extract(r"^(https://[^/?#]+)(.*)$")
+        urls[upper_host] = parts[0].str.lower() + parts[1]
+    tracked = urls.str.contains(_TRACKING_PARAM, regex=True)
+    if tracked.any():
+        urls[tracked] = (
+            urls[tracked].str.replace(_TRACKING_PARAM, "", regex=True).str.replace(r"[?&]+(?=#|$)", "", regex=True)
+        )
+    return urls
+
+
+def canonicalize_urls(series: pd.Series) -> pd.Series:
+    """https scheme, lowercase host and no tracking parameters (fragments are kept)."""
+    return _on_uniques(series, _canonicalize_unique)
+
+
+def record_key(job: JobRecord) -> Optional[str]:
+    """Deduplication key of a record: the source's offer ID when known, else its URL.
+
+    The same Computrabajo offer found by two searches has two URLs (keyword
+    and ``pubdate`` are part of them) but a single key. Bumeran URLs end in
+    the aviso id, but their slug differs between the DOM and the API (rebuilt
+    from the title), so the id is the key. Indeed URLs already reach here as
+    ``/viewjob?jk=...`` so the URL is their key.
+    """
+    url = job.get("url")
+    if not url:
+        return None
+    if job.get("fuente") == "Computrabajo":
+        offer = computrabajo_offer_id(url)
+        if offer:
+            return f"computrabajo:{offer}"
+    elif job.get("fuente") == "Bumeran":
+        match = _BUMERAN_AVISO.search(url)
+        if match:
+            return f"bumeran:{match.group(1)}"
+    return url
+
+
+# Fuentes cuya clave no es la URL (ver ``record_key``)
+_ID_SOURCES = ("Computrabajo", "Bumeran")
+
+
+def record_keys(fuentes: pd.Series, urls: pd.Series) -> pd.Series:
+    """:func:`record_key` of every row; only rows of ``_ID_SOURCES`` are parsed, once per distinct URL."""
+    keys = urls.copy()
+    for fuente in _ID_SOURCES:
+        rows = (fuentes == fuente).to_numpy()
+        if rows.any():
+            keys[rows] = _on_uniques(
+                urls[rows], lambda values: values.map(lambda url: record_key({"fuente": fuente, "url": url}) or "")
+            )
+    return keys
+
+
+def alias_frame(aliases: AliasTable) -> pd.DataFrame:
+    """Alias table with ``alias`` and ``empresa`` columns, keyed by normalised alias."""
+    if isinstance(aliases, pd.DataFrame):
+        frame = aliases[["alias", "empresa"]].copy()
+    else:
+        frame = pd.DataFrame(list(aliases.items()), columns=["alias", "empresa"])
+    frame["empresa_normalizada"] = normalize_text(frame["alias"])
+    return (
+        frame.drop_duplicates("empresa_normalizada", keep="last")
+        .rename(columns={"empresa": "empresa_canonica"})[["empresa_normalizada", "empresa_canonica"]]
+    )
+
+
+def load_aliases(path: str) -> pd.DataFrame:
+    """Read a CSV with ``alias,empresa`` columns."""
+    return alias_frame(pd.read_csv(path, dtype=str, keep_default_na=False))
+
+
+def to_frame(records: Iterable[JobRecord]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(list(records))
+    for column in BASE_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = ""
+    return frame
+
+
+def postprocess_frame(frame: pd.DataFrame, aliases: Optional[AliasTable] = None) -> pd.DataFrame:
+    """Normalise, enrich and deduplicate a frame of records (first occurrence wins)."""
+    if frame.empty:
+        return frame.assign(empresa_normalizada=pd.Series(dtype=str), titulo_normalizado=pd.Series(dtype=str))
+    urls = canonicalize_urls(frame["url"])
+    keys = pd.util.hash_pandas_object(record_keys(frame["fuente"], urls), index=False).to_numpy()
+    keep = (~pd.Series(keys).duplicated(keep="first").to_numpy()) & (urls != "").to_numpy()
+    # Se deduplica antes de normalizar para no procesar filas descartadas
+    frame = frame.loc[keep].copy()
+    frame["url"] = urls[keep]
+    frame["empresa"] = _collapse_spaces(frame["empresa"])
+    frame["titulo"] = _collapse_spaces(frame["titulo"])
+    frame["empresa_normalizada"] = normalize_text(frame["empresa"])
+    frame["titulo_normalizado"] = normalize_text(frame["titulo"])
+    if aliases is not None:
+        table = aliases if isinstance(aliases, pd.DataFrame) and "empresa_canonica" in aliases else alias_frame(aliases)
+        frame = frame.merge(table, on="empresa_normalizada", how="left", sort=False)
+        matched = frame["empresa_canonica"].notna()
+        frame.loc[matched, "empresa"] = frame.loc[matched, "empresa_canonica"]
+        frame.loc[matched, "empresa_normalizada"] = normalize_text(frame.loc[matched, "empresa_canonica"])
+        frame = frame.drop(columns="empresa_canonica")
+    return frame.reset_index(drop=True)
+
+
+def postprocess_records(records: Iterable[JobRecord], aliases: Optional[AliasTable] = None) -> List[JobRecord]:
+    frame = postprocess_frame(to_frame(records), aliases)
+    ordered = BASE_COLUMNS + [column for column in frame.columns if column not in BASE_COLUMNS]
+    return frame[ordered].fillna("").to_dict(orient="records")
+
+
+def merge_history(directory: str, pattern: str = "*.json", aliases: Optional[AliasTable] = None) -> pd.DataFrame:
+    """Load every saved result file in ``directory`` and deduplicate them in one pass.
+
+    Newer files win: they are read last-modified first. A segment store
+    directory (see :mod:`src.storage`) is read run by run, newest first.
+    """
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        frames = _store_frames(directory)
+    else:
+        frames = _file_frames(directory, pattern)
+    if not frames:
+        return to_frame([])
+    merged = postprocess_frame(pd.concat(frames, ignore_index=True), aliases)
+    logger.info("Historial combinado: %d archivos, %d ofertas únicas", len(frames), len(merged))
+    return merged
+
+
+def _file_frames(directory: str, pattern: str) -> List[pd.DataFrame]:
+    paths = sorted(glob.glob(os.path.join(directory, pattern)), key=os.path.getmtime, reverse=True)
+    frames = []
+    for path in paths:
+        try:
+            frame = pd.read_json(path, orient="records", dtype=False)
+        except ValueError:
+            logger.warning("No se pudo leer %s", path)
+            continue
+        if not frame.empty:
+            frame["archivo"] = os.path.basename(path)
+            frames.append(frame)
+    return frames
+
+
+def _store_frames(directory: str) -> List[pd.DataFrame]:
+    runs = sorted(SegmentStore(directory).iter_runs(), key=lambda item: item[0]["created"], reverse=True)
+    records: List[JobRecord] = []
+    labels: List[str] = []
+    for run, run_records in runs:
+        records.extend(run_records)
+        labels.extend([f"{run['source']}_{run['query']}_{run['run']}"] * len(run_records))
+    if not records:
+        return []
+    # Un único DataFrame para todo el almacén: construir uno por ejecución domina el tiempo
+    frame = pd.DataFrame.from_records(records)
+    frame["archivo"] = labels
+    return [frame]
@@ -0,0 +1,232 @@
+"""Per-task profiling of scraper runs (cProfile or a low-overhead stack sampler)."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+OTHER_THREADS = "otros-hilos"
+# Funciones donde se bloquea un hilo ocioso del pool o del listener de logs
+_IDLE_FRAMES = frozenset({"wait", "_worker", "get", "dequeue", "_monitor"})
+
+FrameKey = Tuple[str, int, str]
+
+# Desde 3.12 cProfile se apoya en sys.monitoring, que admite un solo
+# perfilador activo por proceso: dos tareas a la vez no pueden perfilarse
+SINGLE_CPROFILE = sys.version_info >= (3, 12)
+
+
+def _safe_label(label: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in label.strip().lower()) or "tarea"
+
+
+def _frame_key(frame) -> FrameKey:
+    code = frame.f_code
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def _describe(key: FrameKey) -> str:
+    filename, line, name = key
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+class StackSampler:
+    """Statistical profiler: a daemon thread snapshots registered threads' stacks.
+
+    Every ``interval`` seconds it reads ``sys._current_frames()`` and counts
+    the innermost function (self time) and every function on the stack
+    (inclusive time) for each registered thread. The profiled threads run
+    untouched, so the cost is independent of how many calls they make.
+    Frames of threads that were not registered (e.g. page shards) are
+    counted under ``OTHER_THREADS``.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self._labels: Dict[int, str] = {}
+        self._self_counts: Dict[str, Counter] = {}
+        self._total_counts: Dict[str, Counter] = {}
+        self._stacks: Dict[str, Counter] = {}
+        self._samples: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, label: str, ident: Optional[int] = None) -> None:
+        with self._lock:
+            self._labels[ident or threading.get_ident()] = label
+
+    def unregister(self, ident: Optional[int] = None) -> None:
+        with self._lock:
+            self._labels.pop(ident or threading.get_ident(), None)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        main = threading.main_thread().ident
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                labels = dict(self._labels)
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (ident == main and ident not in labels):
+                    continue
+                self._record(labels.get(ident, OTHER_THREADS), frame)
+
+    def _record(self, label: str, frame) -> None:
+        stack: List[FrameKey] = []
+        while frame is not None and len(stack) < self.max_depth:
+            stack.append(_frame_key(frame))
+            frame = frame.f_back
+        if not stack:
+            return
+        if label == OTHER_THREADS and stack[0][2] in _IDLE_FRAMES:
+            return
+        self._samples[label] += 1
+        self._self_counts.setdefault(label, Counter())[stack[0]] += 1
+        self._total_counts.setdefault(label, Counter()).update(set(stack))
+        self._stacks.setdefault(label, Counter())[";".join(k[2] for k in reversed(stack))] += 1
+
+    def labels(self) -> List[str]:
+        return sorted(self._samples)
+
+    def top(self, label: str, limit: int = 20) -> List[Tuple[str, int, int]]:
+        """``(function, self samples, inclusive samples)`` ordered by self samples."""
+        self_counts = self._self_counts.get(label, Counter())
+        totals = self._total_counts.get(label, Counter())
+        return [(_describe(key), count, totals[key]) for key, count in self_counts.most_common(limit)]
+
+    def write(self, label: str, directory: str, limit: int = 20) -> str:
+        """Write a text report and the collapsed stacks (flamegraph input) for ``label``."""
+        base = os.path.join(directory, _safe_label(label))
+        with open(f"{base}.folded", "w", encoding="utf-8") as handle:
+            for stack, count in self._stacks.get(label, Counter()).most_common():
+                handle.write(f"{stack} {count}\n")
+        samples = self._samples[label]
+        lines = [f"{label}: {samples} muestras cada {self.interval * 1000:.1f} ms", "self%  total%  función"]
+        for name, own, total in self.top(label, limit):
+            lines.append(f"{100 * own / samples:5.1f}  {100 * total / samples:6.1f}  {name}")
+        with open(f"{base}.txt", "w", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+        return f"{base}.txt"
+
+
+class RunProfiler:
+    """Profile each scraper task of a run and write the reports under ``directory``.
+
+    ``mode="cprofile"`` records every call of the profiled thread (exact but
+    slower, a ``.prof`` file per task readable with ``pstats``/snakeviz);
+    ``mode="sample"`` uses :class:`StackSampler` and is cheap enough to leave
+    on in production. On Python 3.12+ cProfile can only profile one task at a
+    time, so with ``concurrent=True`` the sampler is used instead.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        mode: str = "sample",
+        interval: float = 0.005,
+        top: int = 20,
+        concurrent: bool = False,
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Modo de perfilado desconocido: {mode}")
+        if mode == "cprofile" and concurrent and SINGLE_CPROFILE:
+            logger.warning(
+                "cProfile no admite tareas simultáneas en Python 3.12+; se usa el muestreo "
+                "(use --max-workers 1 con una sola fuente para cProfile)"
+            )
+            mode = "sample"
+        self.directory = directory
+        self.mode = mode
+        self.top = top
+        self.reports: Dict[str, str] = {}
+        self._sampler = StackSampler(interval) if mode == "sample" else None
+        self._lock = threading.Lock()
+
+    def start(self) -> "RunProfiler":
+        os.makedirs(self.directory, exist_ok=True)
+        if self._sampler is not None:
+            self._sampler.start()
+        return self
+
+    @contextmanager
+    def profile(self, label: str) -> Iterator[None]:
+        """Profile the calling thread while the block runs."""
+        if self._sampler is not None:
+            self._sampler.register(label)
+            try:
+                yield
+            finally:
+                self._sampler.unregister()
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Otro perfilador ya está activo en este hilo
+            logger.warning("No se pudo perfilar '%s': ya hay un perfilador activo", label)
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._write_cprofile(label, profiler)
+
+    def _write_cprofile(self, label: str, profiler: cProfile.Profile) -> None:
+        base = os.path.join(self.directory, _safe_label(label))
+        profiler.dump_stats(f"{base}.prof")
+        buffer = io.StringIO()
+        stats = pstats.Stats(profiler, stream=buffer)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        with open(f"{base}.txt", "w", encoding="utf-8") as handle:
+            handle.write(buffer.getvalue())
+        with self._lock:
+            self.reports[label] = f"{base}.txt"
+        hottest = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:3]
+        logger.info(
+            "Perfil '%s': %s",
+            label,
+            ", ".join(f"{_describe(key)} {values[2]:.2f}s" for key, values in hottest) or "sin llamadas",
+        )
+
+    def stop(self) -> Dict[str, str]:
+        """Stop sampling, write the pending reports and log the hottest functions."""
+        started = time.perf_counter()
+        if self._sampler is not None:
+            self._sampler.stop()
+            for label in self._sampler.labels():
+                self.reports[label] = self._sampler.write(label, self.directory, self.top)
+                hottest = ", ".join(f"{name} {own}" for name, own, _ in self._sampler.top(label, 3))
+                logger.info("Perfil '%s': %s", label, hottest or "sin muestras")
+        if self.reports:
+            logger.info(
+                "Perfiles (%s) guardados en %s (%.2fs)", self.mode, self.directory, time.perf_counter() - started
+            )
+        return dict(self.reports)
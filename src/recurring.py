@@ -0,0 +1,212 @@
+"""Recurring searches whose refresh interval adapts to how many new offers they yield."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from .delta import DeltaIndex, search_key
+from .scheduler import SearchResult, SearchSpec, run_batch
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+BatchRunner = Callable[..., List[SearchResult]]
+
+
+@dataclass
+class SearchState:
+    """Schedule and yield history of one recurring search."""
+
+    busqueda: str
+    dias: int
+    sources: List[str]
+    interval: float
+    next_due: float = 0.0
+    last_run: Optional[float] = None
+    runs: int = 0
+    # Ofertas nuevas por hora (media móvil exponencial)
+    rate: Optional[float] = None
+    last_new: int = 0
+
+    @property
+    def spec(self) -> SearchSpec:
+        return SearchSpec(self.busqueda, self.dias, tuple(self.sources))
+
+    @property
+    def key(self) -> str:
+        return search_key(self.busqueda, self.dias, self.sources)
+
+
+class RecurringSchedule:
+    """Persistent set of searches, each refreshed when it is due.
+
+    After every run the number of offers not seen before is turned into an
+    arrival rate (new offers per hour, smoothed with ``smoothing``) and the
+    next interval is ``target_new / rate``: a search is revisited roughly when
+    ``target_new`` new offers are expected. Searches that yield nothing back
+    off by ``backoff`` per run. Intervals stay within ``min_interval`` and
+    ``max_interval`` and below half the ``dias`` window of the search, so a
+    "last 24 hours" search is never refreshed so rarely that offers slip out
+    of its window unseen.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        min_interval: float = HOUR,
+        max_interval: float = 2 * DAY,
+        target_new: float = 10.0,
+        smoothing: float = 0.5,
+        backoff: float = 1.5,
+    ) -> None:
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.target_new = max(1.0, target_new)
+        self.smoothing = smoothing
+        self.backoff = backoff
+        self.searches: Dict[str, SearchState] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.searches)
+
+    @property
+    def index_dir(self) -> str:
+        # Índice de ofertas vistas por búsqueda, junto al archivo de estado
+        base, _ = os.path.splitext(self.path)
+        return f"{base}_index"
+
+    def ceiling(self, dias: int) -> float:
+        if dias:
+            return max(self.min_interval, min(self.max_interval, dias * DAY / 2))
+        return self.max_interval
+
+    def add(self, spec: SearchSpec) -> SearchState:
+        """Register ``spec`` (due immediately); existing searches keep their history."""
+        state = SearchState(spec.busqueda, spec.dias, list(spec.sources), self.min_interval)
+        with self._lock:
+            return self.searches.setdefault(state.key, state)
+
+    def sync(self, specs: Iterable[SearchSpec]) -> None:
+        """Make the schedule hold exactly ``specs`` (new ones are added, missing ones dropped)."""
+        wanted = {search_key(s.busqueda, s.dias, s.sources): s for s in specs}
+        with self._lock:
+            for key in [key for key in self.searches if key not in wanted]:
+                del self.searches[key]
+        for spec in wanted.values():
+            self.add(spec)
+
+    def due(self, now: Optional[float] = None) -> List[SearchState]:
+        now = time.time() if now is None else now
+        return sorted((s for s in self.searches.values() if s.next_due <= now), key=lambda s: s.next_due)
+
+    def next_due(self) -> Optional[float]:
+        return min((s.next_due for s in self.searches.values()), default=None)
+
+    def record(self, state: SearchState, new_offers: int, now: Optional[float] = None) -> float:
+        """Update ``state`` after a run that found ``new_offers``; returns the next interval."""
+        now = time.time() if now is None else now
+        ceiling = self.ceiling(state.dias)
+        if state.last_run is None:
+            # Primera ejecución: todo es "nuevo", no dice nada de la frecuencia
+            interval = self.min_interval
+        else:
+            elapsed = max(now - state.last_run, 60.0)
+            observed = new_offers / (elapsed / HOUR)
+            state.rate = (
+                observed if state.rate is None else self.smoothing * observed + (1 - self.smoothing) * state.rate
+            )
+            if new_offers == 0:
+                interval = state.interval * self.backoff
+            else:
+                interval = self.target_new / state.rate * HOUR if state.rate > 0 else state.interval * self.backoff
+        state.interval = min(ceiling, max(self.min_interval, interval))
+        state.last_run = now
+        state.next_due = now + state.interval
+        state.runs += 1
+        state.last_new = new_offers
+        return state.interval
+
+    def count_new(self, state: SearchState, records: Sequence[Dict[str, str]]) -> int:
+        events = DeltaIndex(self.index_dir, state.key).diff(records)
+        return sum(1 for event in events if event["op"] == "added")
+
+    def run_due(
+        self,
+        max_workers: int,
+        source_limits: Optional[Dict[str, int]] = None,
+        now: Optional[float] = None,
+        runner: BatchRunner = run_batch,
+        **options,
+    ) -> List[SearchState]:
+        """Run every due search as one batch, update their intervals and save the schedule."""
+        due = self.due(now)
+        if not due:
+            return []
+        by_spec = {state.spec: state for state in due}
+        results = runner(list(by_spec), max_workers=max_workers, source_limits=source_limits, **options)
+        finished = time.time() if now is None else now
+        for result in results:
+            state = by_spec.get(result.spec)
+            if state is None:
+                continue
+            if not result.executed or result.blocked:
+                # Ninguna fuente respondió o un bloqueo dejó resultados parciales:
+                # se reintenta pronto sin tocar la tasa ni el índice de novedades
+                state.next_due = finished + self.min_interval
+                continue
+            new_offers = self.count_new(state, result.records)
+            interval = self.record(state, new_offers, finished)
+            logger.info(
+                "'%s' (dias=%d): %d ofertas nuevas, próxima en %.1f h",
+                state.busqueda,
+                state.dias,
+                new_offers,
+                interval / HOUR,
+            )
+        self.save()
+        return due
+
+    def run_forever(
+        self,
+        max_workers: int,
+        source_limits: Optional[Dict[str, int]] = None,
+        poll: float = 60.0,
+        stop: Optional[threading.Event] = None,
+        **options,
+    ) -> None:
+        """Keep dispatching due searches until ``stop`` is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.run_due(max_workers, source_limits, **options)
+            upcoming = self.next_due()
+            if upcoming is None:
+                return
+            stop.wait(min(poll, max(1.0, upcoming - time.time())))
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        for item in data.get("searches", []):
+            state = SearchState(**item)
+            self.searches[state.key] = state
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"searches": [asdict(state) for state in self.searches.values()]}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
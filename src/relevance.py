@@ -0,0 +1,198 @@
+"""BM25 relevance of offer titles against the search keyword, vectorised with NumPy."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .text import fold
+
+JobRecord = Dict[str, str]
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Palabras vacías frecuentes en títulos que no aportan al tema del puesto
+STOPWORDS = frozenset({"de", "del", "la", "el", "los", "las", "y", "e", "en", "para", "con", "a", "o", "u", "por"})
+
+
+def title_terms(text: str, ngram: int = 3) -> List[str]:
+    """Words plus character n-grams of each word ("analistas" still matches "analista")."""
+    terms: List[str] = []
+    for word in _WORD.findall(fold(text)):
+        if word in STOPWORDS:
+            continue
+        terms.append(word)
+        if ngram and len(word) > ngram:
+            padded = f"#{word}#"
+            terms.extend(f"~{padded[i:i + ngram]}" for i in range(len(padded) - ngram + 1))
+    return terms
+
+
+class CsrMatrix:
+    """Minimal compressed sparse row matrix (term frequencies per title)."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_cols: int) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, n_cols)
+
+    @property
+    def row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+
+class RelevanceScorer:
+    """BM25 over title terms with a fixed vocabulary and IDF table.
+
+    The vocabulary can be precomputed from historical titles (``fit`` then
+    ``save``) so that batch scores are comparable across runs; otherwise it is
+    fitted on the batch being scored. Scores are normalised by the score the
+    keyword would get against itself, so 1.0 means "every keyword term matched".
+    """
+
+    def __init__(self, ngram: int = 3, k1: float = 1.2, b: float = 0.75) -> None:
+        self.ngram = ngram
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float64)
+        self.avg_length = 1.0
+
+    @property
+    def fitted(self) -> bool:
+        return bool(self.vocabulary)
+
+    def fit(self, titles: Iterable[str]) -> "RelevanceScorer":
+        vocabulary: Dict[str, int] = {}
+        doc_freq: List[int] = []
+        lengths: List[int] = []
+        term_sets: Dict[str, Tuple[int, frozenset]] = {}
+        for title in titles:
+            cached = term_sets.get(title)
+            if cached is None:
+                terms = title_terms(title, self.ngram)
+                cached = term_sets[title] = (len(terms), frozenset(terms))
+            lengths.append(cached[0])
+            for term in cached[1]:
+                index = vocabulary.get(term)
+                if index is None:
+                    vocabulary[term] = len(doc_freq)
+                    doc_freq.append(1)
+                else:
+                    doc_freq[index] += 1
+        total = max(1, len(lengths))
+        df = np.asarray(doc_freq, dtype=np.float64)
+        self.vocabulary = vocabulary
+        self.idf = np.log1p((total - df + 0.5) / (df + 0.5))
+        self.avg_length = float(np.mean(lengths)) if lengths else 1.0
+        return self
+
+    def transform(self, titles: Sequence[str]) -> Tuple[CsrMatrix, np.ndarray]:
+        """Term-frequency CSR matrix (known terms only) and title lengths."""
+        vocabulary = self.vocabulary
+        indptr = np.zeros(len(titles) + 1, dtype=np.int64)
+        lengths = np.zeros(len(titles), dtype=np.float64)
+        indices: List[int] = []
+        data: List[int] = []
+        for row, title in enumerate(titles):
+            terms = title_terms(title, self.ngram)
+            lengths[row] = len(terms)
+            counts = Counter(vocabulary[t] for t in terms if t in vocabulary)
+            for column in sorted(counts):
+                indices.append(column)
+                data.append(counts[column])
+            indptr[row + 1] = len(indices)
+        matrix = CsrMatrix(
+            indptr,
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(data, dtype=np.float64),
+            len(vocabulary),
+        )
+        return matrix, lengths
+
+    def _query_ids(self, query: str) -> np.ndarray:
+        ids = {self.vocabulary[t] for t in title_terms(query, self.ngram) if t in self.vocabulary}
+        return np.fromiter(sorted(ids), dtype=np.int64, count=len(ids))
+
+    def score(self, query: str, titles: Sequence[str]) -> np.ndarray:
+        """Normalised BM25 score (0..1) of each title for ``query``."""
+        titles = list(titles)
+        if not titles:
+            return np.zeros(0, dtype=np.float64)
+        if not self.fitted:
+            self.fit(titles)
+        query_ids = self._query_ids(query)
+        if query_ids.size == 0:
+            return np.zeros(len(titles), dtype=np.float64)
+        # Los títulos se repiten mucho: se puntúa cada título distinto una vez
+        positions: Dict[str, int] = {}
+        inverse = np.fromiter((positions.setdefault(t, len(positions)) for t in titles), dtype=np.int64, count=len(titles))
+        unique_scores = self._score_unique(query_ids, list(positions))
+        return unique_scores[inverse]
+
+    def _score_unique(self, query_ids: np.ndarray, titles: List[str]) -> np.ndarray:
+        matrix, lengths = self.transform(titles)
+        hit = np.isin(matrix.indices, query_ids)
+        rows = matrix.row_ids[hit]
+        tf = matrix.data[hit]
+        norm = self.k1 * (1 - self.b + self.b * lengths[rows] / self.avg_length)
+        contributions = self.idf[matrix.indices[hit]] * tf * (self.k1 + 1) / (tf + norm)
+        scores = np.bincount(rows, weights=contributions, minlength=len(titles))
+        # Puntaje máximo alcanzable: todos los términos de la consulta presentes una vez
+        ceiling = float(np.sum(self.idf[query_ids] * (self.k1 + 1) / (1 + self.k1)))
+        return np.clip(scores / ceiling, 0.0, 1.0) if ceiling > 0 else scores
+
+    def save(self, path: str) -> None:
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        payload = {
+            "ngram": self.ngram,
+            "k1": self.k1,
+            "b": self.b,
+            "avg_length": self.avg_length,
+            "terms": terms,
+            "idf": self.idf.tolist(),
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "RelevanceScorer":
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        scorer = cls(payload.get("ngram", 3), payload.get("k1", 1.2), payload.get("b", 0.75))
+        scorer.vocabulary = {term: index for index, term in enumerate(payload["terms"])}
+        scorer.idf = np.asarray(payload["idf"], dtype=np.float64)
+        scorer.avg_length = float(payload.get("avg_length", 1.0))
+        return scorer
+
+
+def rank_records(
+    records: Sequence[JobRecord],
+    busqueda: str,
+    threshold: float = 0.0,
+    scorer: Optional[RelevanceScorer] = None,
+) -> List[JobRecord]:
+    """Add ``relevancia`` to each record, drop those under ``threshold`` and sort best first."""
+    if not records:
+        return []
+    scorer = scorer or RelevanceScorer()
+    scores = scorer.score(busqueda, [record.get("titulo") or "" for record in records])
+    # Orden estable: a igual puntaje se conserva el orden original
+    order = np.argsort(-scores, kind="stable")
+    ranked: List[JobRecord] = []
+    for position in order:
+        value = float(scores[position])
+        if value < threshold:
+            continue
+        ranked.append({**records[position], "relevancia": round(value, 4)})
+    dropped = len(records) - len(ranked)
+    if dropped:
+        logger.info("Relevancia: %d ofertas bajo el umbral %.2f descartadas para '%s'", dropped, threshold, busqueda)
+    return ranked
@@ -0,0 +1,187 @@
+"""Archive of listing page snapshots and offline re-extraction (replay)."""
+
+from __future__ import annotations
+
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Type
+from urllib.parse import urlparse
+
+from .bumeran import BumeranScraper
+from .computrabajo import ComputrabajoScraper
+from .core.base import BaseScraper
+from .core.cache import PageCache
+from .core.htmldom import HtmlDriver
+from .indeed import IndeedScraper
+
+JobRecord = Dict[str, str]
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_CLASSES: Dict[str, Type[BaseScraper]] = {
+    "bumeran": BumeranScraper,
+    "computrabajo": ComputrabajoScraper,
+    "indeed": IndeedScraper,
+}
+SOURCE_LABELS: Dict[str, str] = {
+    "bumeran": "Bumeran",
+    "computrabajo": "Computrabajo",
+    "indeed": "Indeed",
+}
+SOURCE_HOSTS: Dict[str, str] = {
+    "bumeran.com": "bumeran",
+    "computrabajo.com": "computrabajo",
+    "indeed.com": "indeed",
+}
+
+
+def new_run_id() -> str:
+    """Unique, sortable identifier for one scraping run."""
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def source_for_url(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    for marker, source in SOURCE_HOSTS.items():
+        if marker in host:
+            return source
+    return ""
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One stored listing page: an archived ``.html.gz`` or a page cache entry."""
+
+    source: str
+    url: str
+    path: str
+    page: int = 0
+    kind: str = "html"
+
+
+class SnapshotArchive:
+    """Stores the HTML of each listing page loaded during a run.
+
+    Pages go to ``<root>/<run_id>/<source>/`` gzip-compressed and are listed in
+    ``<root>/<run_id>/manifest.jsonl``.
+    """
+
+    MANIFEST = "manifest.jsonl"
+
+    def __init__(self, root: str, run_id: Optional[str] = None) -> None:
+        self.root = root
+        self.run_id = run_id or new_run_id()
+        self.directory = os.path.join(root, self.run_id)
+        self._lock = threading.Lock()
+
+    def capture(self, source: str, page: int, url: str, html: str) -> str:
+        source = source or source_for_url(url) or "desconocido"
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+        relative = os.path.join(source, f"p{page:04d}-{digest}.html.gz")
+        path = os.path.join(self.directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            handle.write(html)
+        entry = {"source": source, "page": page, "url": url, "file": relative, "captured_at": time.time()}
+        with self._lock, open(os.path.join(self.directory, self.MANIFEST), "a", encoding="utf-8") as manifest:
+            manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return path
+
+
+def iter_archive(root: str) -> Iterator[Snapshot]:
+    """Yield the snapshots of every run stored under ``root`` (or of a single run directory)."""
+    manifests = sorted(glob.glob(os.path.join(root, "*", SnapshotArchive.MANIFEST)))
+    own_manifest = os.path.join(root, SnapshotArchive.MANIFEST)
+    if os.path.exists(own_manifest):
+        manifests.insert(0, own_manifest)
+    for manifest in manifests:
+        base = os.path.dirname(manifest)
+        with open(manifest, "r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                yield Snapshot(
+                    source=entry.get("source", ""),
+                    url=entry.get("url", ""),
+                    path=os.path.join(base, entry["file"]),
+                    page=int(entry.get("page", 0)),
+                )
+
+
+def iter_cached_pages(cache_dir: str) -> Iterator[Snapshot]:
+    """Yield page cache entries that kept their HTML."""
+    cache = PageCache(cache_dir)
+    for path in cache.iter_files():
+        page = cache.load(path)
+        if page is None or not page.html:
+            continue
+        yield Snapshot(source=source_for_url(page.url), url=page.url, path=path, kind="cache")
+
+
+def load_html(snapshot: Snapshot) -> str:
+    if snapshot.kind == "cache":
+        page = PageCache(os.path.dirname(snapshot.path)).load(snapshot.path)
+        return (page.html or "") if page else ""
+    with gzip.open(snapshot.path, "rt", encoding="utf-8") as handle:
+        return handle.read()
+
+
+def extract_snapshot(snapshot: Snapshot) -> List[JobRecord]:
+    """Run the source extractor over one stored page, without a browser."""
+    source = snapshot.source or source_for_url(snapshot.url)
+    scraper_cls = SCRAPER_CLASSES.get(source)
+    if scraper_cls is None:
+        return []
+    try:
+        driver = HtmlDriver(load_html(snapshot), snapshot.url)
+        scraper = scraper_cls(driver=driver)
+        scraper.restore_search_state(snapshot.url)
+        puestos = scraper.extraer_puestos(timeout=0)
+    except Exception:
+        logger.debug("No se pudo re-extraer %s", snapshot.path, exc_info=True)
+        return []
+    label = SOURCE_LABELS.get(source, source)
+    return [{"fuente": label, **puesto} for puesto in puestos]
+
+
+def replay(
+    snapshots: Iterable[Snapshot],
+    workers: Optional[int] = None,
+    chunksize: int = 32,
+) -> List[JobRecord]:
+    """Re-extract records from stored pages in parallel across processes.
+
+    Results keep snapshot order and are deduplicated by URL.
+    """
+    items = list(snapshots)
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    if workers <= 1 or len(items) <= 1:
+        batches: Iterable[List[JobRecord]] = map(extract_snapshot, items)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(extract_snapshot, items, chunksize=chunksize))
+    results: List[JobRecord] = []
+    seen = set()
+    for batch in batches:
+        for record in batch:
+            url = record.get("url")
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            results.append(record)
+    logger.info(
+        "Replay de %d páginas en %.2fs con %d ofertas", len(items), time.perf_counter() - start_time, len(results)
+    )
+    return results
@@ -0,0 +1,263 @@
+"""Fan-out of many searches (keyword × source × dias) under a shared worker budget."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .core.backend import DriverBackend
+from .pipeline import (
+    DEFAULT_SOURCES,
+    JobRecord,
+    RunContext,
+    _budget_backend,
+    _network_backend,
+    _normalize_modes,
+    _normalize_sources,
+    merge_source_results,
+    run_source,
+)
+from .delta import emit_delta
+from .core.logcontext import in_current_context
+from .postprocess import AliasTable, postprocess_records
+from .relevance import RelevanceScorer, rank_records
+from .search_index import SearchIndex
+from .storage import SegmentStore
+from .utils import guardar_resultados
+
+logger = logging.getLogger(__name__)
+
+# Filtros de fecha más recientes primero; "todos" (0) al final
+DIAS_PRIORITY: Dict[int, int] = {1: 0, 2: 1, 3: 2, 0: 3}
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    busqueda: str
+    dias: int = 0
+    sources: Tuple[str, ...] = tuple(DEFAULT_SOURCES)
+
+
+@dataclass(order=True)
+class WorkUnit:
+    """One source run for one search; ordered by priority, then submission."""
+
+    priority: int
+    sequence: int
+    spec: SearchSpec = field(compare=False)
+    source: str = field(compare=False)
+
+
+@dataclass
+class SearchResult:
+    spec: SearchSpec
+    records: List[JobRecord]
+    executed: List[str]
+    # Fuentes cuyos registros son parciales porque un bloqueo cortó la paginación
+    blocked: List[str] = field(default_factory=list)
+
+
+SourceRunner = Callable[..., List[JobRecord]]
+
+
+def build_specs(
+    keywords: Iterable[str],
+    dias_options: Sequence[int] = (0,),
+    sources: Iterable[str] | None = None,
+) -> List[SearchSpec]:
+    selected = tuple(_normalize_sources(sources))
+    specs: List[SearchSpec] = []
+    for keyword in keywords:
+        keyword = keyword.strip()
+        if not keyword:
+            continue
+        for dias in dias_options:
+            spec = SearchSpec(keyword, dias, selected)
+            if spec not in specs:
+                specs.append(spec)
+    return specs
+
+
+class SearchScheduler:
+    """Runs work units from a priority queue under global and per-source caps.
+
+    Each worker thread takes the highest-priority pending unit whose source
+    still has room, so a slow source never holds back the others and idle
+    workers immediately pick up whatever is runnable next.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        source_limits: Optional[Dict[str, int]] = None,
+        runner: SourceRunner = run_source,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.source_limits = {k.lower(): max(1, v) for k, v in (source_limits or {}).items()}
+        self.runner = runner
+        self._condition = threading.Condition()
+        self._pending: List[WorkUnit] = []
+        self._active: Dict[str, int] = {}
+
+    def plan(self, specs: Iterable[SearchSpec]) -> List[WorkUnit]:
+        counter = itertools.count()
+        units = [
+            WorkUnit(self.priority(spec, source), next(counter), spec, source)
+            for spec in specs
+            for source in spec.sources
+        ]
+        units.sort()
+        return units
+
+    def priority(self, spec: SearchSpec, source: str) -> int:
+        return DIAS_PRIORITY.get(spec.dias, len(DIAS_PRIORITY))
+
+    def run(
+        self,
+        specs: Iterable[SearchSpec],
+        initial_wait: float = 2.0,
+        page_wait: float = 1.0,
+        headless: Optional[bool] = None,
+        backend: Optional[DriverBackend] = None,
+        modes: Dict[str, str] | None = None,
+        page_workers: int = 1,
+        context: Optional[RunContext] = None,
+    ) -> List[SearchResult]:
+        block_registry = context.block_registry if context is not None else None
+        spec_list = list(dict.fromkeys(specs))
+        source_modes = _normalize_modes(modes)
+        self._pending = self.plan(spec_list)
+        self._active = {}
+        outputs: Dict[Tuple[SearchSpec, str], List[JobRecord]] = {}
+        workers = self.max_workers
+        if backend is not None and backend.capacity:
+            workers = min(workers, backend.capacity)
+        workers = max(1, min(workers, len(self._pending)))
+        network_backend = _network_backend(source_modes, backend, workers)
+        # Los shards de página comparten el presupuesto de navegadores de las tareas
+        backend = _budget_backend(backend, self.max_workers, page_workers)
+        start_time = time.perf_counter()
+        logger.info("Planificadas %d tareas para %d búsquedas con %d workers", len(self._pending), len(spec_list), workers)
+
+        def worker() -> None:
+            while True:
+                unit = self._claim()
+                if unit is None:
+                    return
+                mode = source_modes.get(unit.source)
+                if block_registry is not None and block_registry.source_remaining(unit.source) > 0:
+                    # La fuente quedó bloqueada en esta u otra ejecución: no se gasta un navegador
+                    logger.info("Se omite '%s' para '%s': fuente en enfriamiento", unit.source, unit.spec.busqueda)
+                    outputs[(unit.spec, unit.source)] = []
+                    self._release(unit)
+                    continue
+                try:
+                    records = self.runner(
+                        unit.source,
+                        unit.spec.busqueda,
+                        unit.spec.dias,
+                        initial_wait,
+                        page_wait,
+                        headless=headless,
+                        backend=network_backend if mode == "network" else backend,
+                        mode=mode,
+                        page_workers=page_workers,
+                        context=context,
+                    )
+                except Exception:
+                    logger.exception("Error no controlado en '%s' para '%s'", unit.source, unit.spec.busqueda)
+                    records = []
+                outputs[(unit.spec, unit.source)] = records
+                self._release(unit)
+
+        threads = [threading.Thread(target=in_current_context(worker), daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        results: List[SearchResult] = []
+        for spec in spec_list:
+            combined, executed = merge_source_results(
+                (source, outputs.get((spec, source), [])) for source in spec.sources
+            )
+            results.append(SearchResult(spec, combined, executed, combined.blocked))
+        logger.info("Lote completado en %.2fs", time.perf_counter() - start_time)
+        return results
+
+    def _claim(self) -> Optional[WorkUnit]:
+        with self._condition:
+            while self._pending:
+                for index, unit in enumerate(self._pending):
+                    limit = self.source_limits.get(unit.source)
+                    if limit is None or self._active.get(unit.source, 0) < limit:
+                        del self._pending[index]
+                        self._active[unit.source] = self._active.get(unit.source, 0) + 1
+                        return unit
+                # Todo lo pendiente es de fuentes saturadas: esperar a que se libere una
+                self._condition.wait()
+            return None
+
+    def _release(self, unit: WorkUnit) -> None:
+        with self._condition:
+            self._active[unit.source] -= 1
+            self._condition.notify_all()
+
+
+def run_batch(
+    specs: Sequence[SearchSpec],
+    max_workers: int,
+    source_limits: Optional[Dict[str, int]] = None,
+    output_dir: str = "output",
+    delta_dir: Optional[str] = None,
+    normalize: bool = False,
+    company_aliases: Optional[AliasTable] = None,
+    search_index: Optional[SearchIndex] = None,
+    min_relevance: Optional[float] = None,
+    relevance_scorer: Optional[RelevanceScorer] = None,
+    segment_store: Optional[SegmentStore] = None,
+    write_files: bool = True,
+    **options,
+) -> List[SearchResult]:
+    """Run a batch of searches and save each one like :func:`pipeline.run_combined`."""
+    scheduler = SearchScheduler(max_workers, source_limits)
+    results = scheduler.run(specs, **options)
+    repeated = {spec.busqueda for spec in specs if sum(s.busqueda == spec.busqueda for s in specs) > 1}
+    for result in results:
+        if not result.executed:
+            logger.warning("Ninguna fuente produjo resultados para '%s' (dias=%d).", result.spec.busqueda, result.spec.dias)
+            continue
+        if normalize or company_aliases is not None:
+            result.records = postprocess_records(result.records, company_aliases)
+        if min_relevance is not None:
+            result.records = rank_records(result.records, result.spec.busqueda, min_relevance, relevance_scorer)
+        if result.blocked:
+            logger.warning(
+                "Resultados parciales para '%s' (dias=%d): bloqueo en %s",
+                result.spec.busqueda,
+                result.spec.dias,
+                ", ".join(result.blocked),
+            )
+        label = "combined" if len(result.executed) > 1 else result.executed[0]
+        query = result.spec.busqueda
+        if query in repeated:
+            query = f"{query}_d{result.spec.dias}"
+        guardar_resultados(
+            result.records, query, output_dir=output_dir, source=label, store=segment_store, files=write_files
+        )
+        if delta_dir:
+            emit_delta(
+                result.records,
+                result.spec.busqueda,
+                result.spec.dias,
+                result.spec.sources,
+                delta_dir,
+                blocked=result.blocked,
+            )
+        if search_index is not None:
+            search_index.add(result.records, result.spec.busqueda)
+    return results
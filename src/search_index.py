@@ -0,0 +1,184 @@
+"""Full-text index (SQLite FTS5) over every collected offer."""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+JobRecord = Dict[str, str]
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    fuente TEXT NOT NULL DEFAULT '',
+    empresa TEXT NOT NULL DEFAULT '',
+    titulo TEXT NOT NULL DEFAULT '',
+    descripcion TEXT NOT NULL DEFAULT '',
+    busqueda TEXT NOT NULL DEFAULT '',
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS offers_fts USING fts5(
+    titulo, empresa, descripcion,
+    content='offers', content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2"
+);
+CREATE TRIGGER IF NOT EXISTS offers_ai AFTER INSERT ON offers BEGIN
+    INSERT INTO offers_fts(rowid, titulo, empresa, descripcion)
+    VALUES (new.id, new.titulo, new.empresa, new.descripcion);
+END;
+CREATE TRIGGER IF NOT EXISTS offers_ad AFTER DELETE ON offers BEGIN
+    INSERT INTO offers_fts(offers_fts, rowid, titulo, empresa, descripcion)
+    VALUES ('delete', old.id, old.titulo, old.empresa, old.descripcion);
+END;
+CREATE TRIGGER IF NOT EXISTS offers_au AFTER UPDATE OF titulo, empresa, descripcion ON offers
+WHEN old.titulo IS NOT new.titulo OR old.empresa IS NOT new.empresa OR old.descripcion IS NOT new.descripcion
+BEGIN
+    INSERT INTO offers_fts(offers_fts, rowid, titulo, empresa, descripcion)
+    VALUES ('delete', old.id, old.titulo, old.empresa, old.descripcion);
+    INSERT INTO offers_fts(rowid, titulo, empresa, descripcion)
+    VALUES (new.id, new.titulo, new.empresa, new.descripcion);
+END;
+CREATE TABLE IF NOT EXISTS imported_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO offers (url, fuente, empresa, titulo, descripcion, busqueda, first_seen, last_seen)
+VALUES (:url, :fuente, :empresa, :titulo, :descripcion, :busqueda, :seen, :seen)
+ON CONFLICT(url) DO UPDATE SET
+    fuente = CASE WHEN excluded.last_seen >= offers.last_seen THEN excluded.fuente ELSE offers.fuente END,
+    empresa = CASE WHEN excluded.last_seen >= offers.last_seen THEN excluded.empresa ELSE offers.empresa END,
+    titulo = CASE WHEN excluded.last_seen >= offers.last_seen THEN excluded.titulo ELSE offers.titulo END,
+    descripcion = CASE
+        WHEN excluded.descripcion != '' AND excluded.last_seen >= offers.last_seen THEN excluded.descripcion
+        ELSE offers.descripcion
+    END,
+    busqueda = CASE WHEN excluded.last_seen >= offers.last_seen THEN excluded.busqueda ELSE offers.busqueda END,
+    first_seen = MIN(offers.first_seen, excluded.first_seen),
+    last_seen = MAX(offers.last_seen, excluded.last_seen)
+"""
+
+# Pesos de bm25() por columna: titulo, empresa, descripcion
+_RANK = "bm25(offers_fts, 5.0, 2.0, 1.0)"
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str, prefix: bool = True) -> str:
+    """Turn free text into an FTS5 query: every word must match (the last one as a prefix)."""
+    tokens = _TOKEN.findall(text or "")
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Inverted index of offers keyed by URL; accent-insensitive (``remove_diacritics``)."""
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM offers").fetchone()[0]
+
+    def add(self, records: Iterable[JobRecord], busqueda: str = "", seen_at: Optional[float] = None) -> int:
+        """Insert or refresh ``records`` (older data never overwrites newer).
+
+        Only rows whose indexed text changed are re-tokenised.
+        """
+        seen = seen_at if seen_at is not None else time.time()
+        rows = [
+            {
+                "url": record.get("url") or "",
+                "fuente": record.get("fuente") or "",
+                "empresa": record.get("empresa") or "",
+                "titulo": record.get("titulo") or "",
+                "descripcion": record.get("descripcion") or "",
+                "busqueda": record.get("busqueda") or busqueda,
+                "seen": seen,
+            }
+            for record in records
+            if record.get("url")
+        ]
+        with self._conn:
+            self._conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        fuente: Optional[str] = None,
+        raw: bool = False,
+    ) -> List[Dict[str, object]]:
+        """Ranked hits for ``text`` (best first). ``raw`` passes FTS5 syntax through."""
+        match = text if raw else build_match_query(text)
+        if not match:
+            return []
+        sql = (
+            f"SELECT o.url, o.fuente, o.empresa, o.titulo, o.busqueda, o.last_seen, {_RANK} AS score "
+            "FROM offers_fts JOIN offers o ON o.id = offers_fts.rowid "
+            "WHERE offers_fts MATCH ?"
+        )
+        params: List[object] = [match]
+        if fuente:
+            sql += " AND o.fuente = ? COLLATE NOCASE"
+            params.append(fuente)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def import_directory(self, directory: str, pattern: str = "*.json") -> int:
+        """Index saved result files not seen before (or modified since); returns offers added."""
+        total = 0
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            mtime = os.path.getmtime(path)
+            row = self._conn.execute("SELECT mtime FROM imported_files WHERE path = ?", (path,)).fetchone()
+            if row is not None and row["mtime"] >= mtime:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    records = json.load(handle)
+            except (OSError, ValueError):
+                logger.warning("No se pudo importar %s", path)
+                continue
+            if not isinstance(records, list):
+                continue
+            total += self.add((r for r in records if isinstance(r, dict)), seen_at=mtime)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO imported_files (path, mtime) VALUES (?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime",
+                    (path, mtime),
+                )
+        return total
@@ -0,0 +1,369 @@
+"""Compressed, append-only storage of run results with compaction and retention."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime, timedelta
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+JobRecord = Dict[str, Any]
+SegmentEntry = Dict[str, Any]
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+# Candado compartido por todos los procesos que escriben en el mismo directorio
+MANIFEST_LOCK = "manifest.lock"
+CODECS = ("zstd", "gzip")
+EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+# Tamaño al que se agrupan los segmentos pequeños de una misma fecha
+TARGET_BYTES = 8 * 1024 * 1024
+_SLUG = re.compile(r"[^0-9a-z]+")
+_LEGACY_NAME = re.compile(r"^(?P<source>[^_]+)_(?P<query>.+)_(?P<date>\d{4}-\d{2}-\d{2})\.json$")
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _slug(text: str) -> str:
+    return _SLUG.sub("-", text.lower()).strip("-") or "sin-query"
+
+
+@contextmanager
+def open_segment(path: str, mode: str = "r", codec: Optional[str] = None) -> Iterator[BinaryIO]:
+    """Binary stream over a compressed segment (``mode`` is ``"r"`` or ``"w"``), one JSON object per line."""
+    codec = codec or ("zstd" if path.endswith(EXTENSIONS["zstd"]) else "gzip")
+    if codec == "gzip":
+        with gzip.open(path, f"{mode}b", compresslevel=6) as handle:
+            yield handle
+        return
+    if zstandard is None:
+        raise RuntimeError(f"Se necesita el paquete 'zstandard' para leer {path}")
+    with open(path, f"{mode}b") as raw:
+        if mode == "w":
+            with zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False) as stream:
+                yield stream
+        else:
+            with io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)) as stream:
+                yield stream
+
+
+def _write_lines(handle: BinaryIO, records: Iterable[JobRecord]) -> int:
+    count = 0
+    for record in records:
+        handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+        count += 1
+    return count
+
+
+def _parse_lines(lines: List[bytes]) -> List[JobRecord]:
+    # Un solo json.loads por ejecución es bastante más rápido que uno por línea
+    return json.loads(b"[" + b",".join(line.rstrip(b"\n") for line in lines) + b"]") if lines else []
+
+
+class SegmentStore:
+    """Directory of compressed JSONL segments indexed by ``manifest.json``.
+
+    Every call to :meth:`write` creates a new segment under ``<date>/`` named
+    after the source, the query and a unique id, so runs of the same day never
+    overwrite each other. :meth:`compact` merges the small segments of past
+    days into date-partitioned parts of about ``target_bytes``; the manifest
+    keeps, for every part, which line range belongs to which run, so readers
+    can select one query's runs and skip the other lines without parsing them.
+    :meth:`apply_retention` drops old partitions or the oldest segments over a
+    disk budget. Records are always streamed, one line at a time.
+
+    Every read-modify-write of the manifest holds an exclusive ``flock`` on
+    ``manifest.lock``, so several processes (e.g. scheduled runs that
+    overlap) can share a directory without losing each other's segments.
+    Readers hold it shared, so compaction and retention never remove a
+    segment that is being read.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        run_id: Optional[str] = None,
+        codec: Optional[str] = None,
+        target_bytes: int = TARGET_BYTES,
+    ) -> None:
+        codec = codec or default_codec()
+        if codec not in CODECS:
+            raise ValueError(f"Códec desconocido: {codec}")
+        if codec == "zstd" and zstandard is None:
+            logger.warning("'zstandard' no está instalado; los segmentos se comprimen con gzip")
+            codec = "gzip"
+        self.directory = directory
+        self.run_id = run_id
+        self.codec = codec
+        self.target_bytes = target_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST)
+
+    @contextmanager
+    def _manifest_lock(self, shared: bool = False) -> Iterator[None]:
+        """Exclusive access to the manifest, across threads and processes.
+
+        ``shared`` readers only exclude writers; without ``fcntl`` they take no lock.
+        """
+        with nullcontext() if shared else self._lock:
+            if fcntl is None:
+                yield
+                return
+            # Cada apertura es una descripción de archivo propia: el flock
+            # también separa a lectores y escritores de distintos hilos
+            with open(os.path.join(self.directory, MANIFEST_LOCK), "a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def segments(self) -> List[SegmentEntry]:
+        return self._load_manifest()
+
+    def total_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self.segments())
+
+    def write(
+        self,
+        records: Iterable[JobRecord],
+        query: str,
+        source: str,
+        run_id: Optional[str] = None,
+        when: Optional[datetime] = None,
+    ) -> str:
+        """Store one run's records as a new segment and return its path."""
+        when = when or datetime.now()
+        run_id = run_id or self.run_id or f"{when.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        day = when.strftime("%Y-%m-%d")
+        name = f"{source}_{_slug(query)}_{when.strftime('%H%M%S')}-{uuid.uuid4().hex[:6]}{EXTENSIONS[self.codec]}"
+        relative = os.path.join(day, name)
+        path = os.path.join(self.directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open_segment(path, "w", self.codec) as handle:
+            count = _write_lines(handle, records)
+        entry = {
+            "file": relative,
+            "date": day,
+            "codec": self.codec,
+            "records": count,
+            "bytes": os.path.getsize(path),
+            "created": when.timestamp(),
+            "runs": [{"run": run_id, "query": query, "source": source, "start": 0, "count": count}],
+        }
+        with self._manifest_lock():
+            manifest = self._load_manifest()
+            manifest.append(entry)
+            self._save_manifest(manifest)
+        logger.info("Segmento guardado: %s (%d ofertas, %d bytes)", path, count, entry["bytes"])
+        return path
+
+    def iter_runs(
+        self,
+        query: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Iterator[Tuple[Dict[str, Any], List[JobRecord]]]:
+        """Yield ``(run, records)`` in write order, filtered by query, source and date range.
+
+        The manifest stays locked (shared) until the iteration ends, so do not
+        write to the store from inside the loop.
+        """
+        with self._manifest_lock(shared=True):
+            for entry in self._load_manifest():
+                if (since and entry["date"] < since) or (until and entry["date"] > until):
+                    continue
+                wanted = [
+                    run
+                    for run in entry["runs"]
+                    if (query is None or run["query"] == query) and (source is None or run["source"] == source)
+                ]
+                if not wanted:
+                    continue
+                path = os.path.join(self.directory, entry["file"])
+                with open_segment(path, "r", entry["codec"]) as handle:
+                    position = 0
+                    for run in sorted(wanted, key=lambda run: run["start"]):
+                        # Las líneas de otras ejecuciones se saltan sin decodificar
+                        for _ in range(run["start"] - position):
+                            next(handle)
+                        records = _parse_lines([next(handle) for _ in range(run["count"])])
+                        position = run["start"] + run["count"]
+                        yield {**run, "date": entry["date"], "created": entry["created"]}, records
+
+    def iter_records(self, **filters) -> Iterator[JobRecord]:
+        for _, records in self.iter_runs(**filters):
+            yield from records
+
+    def compact(self, before: Optional[str] = None) -> int:
+        """Merge the small segments of each day before ``before`` (default: today).
+
+        Returns the number of segments merged away.
+        """
+        before = before or date.today().isoformat()
+        with self._manifest_lock():
+            manifest = self._load_manifest()
+            groups: Dict[str, List[SegmentEntry]] = {}
+            for entry in manifest:
+                if entry["date"] < before and entry["bytes"] < self.target_bytes:
+                    groups.setdefault(entry["date"], []).append(entry)
+            merged_away = 0
+            for day, entries in sorted(groups.items()):
+                for batch in self._pack(entries):
+                    if len(batch) < 2:
+                        continue
+                    part = self._merge(day, batch)
+                    merged = {id(entry) for entry in batch}
+                    position = next(i for i, entry in enumerate(manifest) if id(entry) in merged)
+                    manifest = [entry for entry in manifest if id(entry) not in merged]
+                    manifest.insert(position, part)
+                    self._save_manifest(manifest)
+                    for entry in batch:
+                        self._remove_file(entry)
+                    merged_away += len(batch)
+        if merged_away:
+            logger.info("Compactación: %d segmentos combinados", merged_away)
+        return merged_away
+
+    def _pack(self, entries: List[SegmentEntry]) -> Iterator[List[SegmentEntry]]:
+        batch: List[SegmentEntry] = []
+        size = 0
+        for entry in entries:
+            if batch and size + entry["bytes"] > self.target_bytes:
+                yield batch
+                batch, size = [], 0
+            batch.append(entry)
+            size += entry["bytes"]
+        if batch:
+            yield batch
+
+    def _merge(self, day: str, batch: List[SegmentEntry]) -> SegmentEntry:
+        relative = os.path.join(day, f"part-{uuid.uuid4().hex[:8]}{EXTENSIONS[self.codec]}")
+        path = os.path.join(self.directory, relative)
+        tmp_path = f"{path}.tmp"
+        runs: List[Dict[str, Any]] = []
+        offset = 0
+        try:
+            with open_segment(tmp_path, "w", self.codec) as out:
+                for entry in batch:
+                    with open_segment(os.path.join(self.directory, entry["file"]), "r", entry["codec"]) as handle:
+                        # Las líneas se copian tal cual: no hace falta decodificar JSON
+                        count = 0
+                        for line in handle:
+                            out.write(line)
+                            count += 1
+                    for run in entry["runs"]:
+                        runs.append({**run, "start": offset + run["start"]})
+                    offset += count
+            os.replace(tmp_path, path)
+        finally:
+            # Tras un fallo no queda un .tmp huérfano en la partición
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return {
+            "file": relative,
+            "date": day,
+            "codec": self.codec,
+            "records": offset,
+            "bytes": os.path.getsize(path),
+            "created": max(entry["created"] for entry in batch),
+            "runs": runs,
+        }
+
+    def apply_retention(
+        self,
+        max_age_days: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        today: Optional[date] = None,
+    ) -> int:
+        """Drop partitions older than ``max_age_days`` and the oldest segments over ``max_bytes``."""
+        today = today or date.today()
+        with self._manifest_lock():
+            manifest = self._load_manifest()
+            keep = list(manifest)
+            if max_age_days is not None:
+                cutoff = (today - timedelta(days=max_age_days)).isoformat()
+                keep = [entry for entry in keep if entry["date"] >= cutoff]
+            if max_bytes is not None:
+                keep.sort(key=lambda entry: (entry["date"], entry["created"]))
+                total = sum(entry["bytes"] for entry in keep)
+                while keep and total > max_bytes:
+                    total -= keep.pop(0)["bytes"]
+            kept = {id(entry) for entry in keep}
+            removed = [entry for entry in manifest if id(entry) not in kept]
+            if not removed:
+                return 0
+            self._save_manifest([entry for entry in manifest if id(entry) in kept])
+            for entry in removed:
+                self._remove_file(entry)
+        logger.info("Retención: %d segmentos eliminados", len(removed))
+        return len(removed)
+
+    def import_file(self, path: str) -> Optional[str]:
+        """Store a legacy ``<source>_<query>_<YYYY-MM-DD>.json`` result file as a segment."""
+        match = _LEGACY_NAME.match(os.path.basename(path))
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                records = json.load(handle)
+        except (OSError, ValueError):
+            logger.warning("No se pudo leer %s", path)
+            return None
+        if not isinstance(records, list):
+            return None
+        if match:
+            source, query = match.group("source"), match.group("query")
+            when = datetime.strptime(match.group("date"), "%Y-%m-%d")
+        else:
+            source, query = "importado", os.path.splitext(os.path.basename(path))[0]
+            when = datetime.fromtimestamp(os.path.getmtime(path))
+        return self.write(records, query, source, when=when)
+
+    def _remove_file(self, entry: SegmentEntry) -> None:
+        path = os.path.join(self.directory, entry["file"])
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+
+    def _load_manifest(self) -> List[SegmentEntry]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as handle:
+                return json.load(handle).get("segments", [])
+        except FileNotFoundError:
+            return []
+
+    def _save_manifest(self, segments: List[SegmentEntry]) -> None:
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"segments": segments, "updated": time.time()}, handle, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,16 @@
+"""Accent and case folding shared by company keys, relevance terms and post-processing."""
+
+from __future__ import annotations
+
+import unicodedata
+
+
+def fold(text: str) -> str:
+    """Casefold ``text`` and strip its accents ("Perú" -> "peru"); punctuation is kept."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+
+
+def fold_words(text: str) -> str:
+    """:func:`fold` with whitespace runs collapsed to one space and trimmed."""
+    return " ".join(fold(text).split())
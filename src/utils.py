@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 import csv
+import glob
 import json
 import logging
+import mmap
 import os
+import re
+from array import array
+from bisect import bisect_right
 from datetime import datetime
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .storage import SegmentStore
 
 JobRecord = Dict[str, Any]
 
@@ -19,12 +26,19 @@ def guardar_resultados(
     query: str,
     output_dir: str = "output",
     source: str = "bumeran",
+    store: Optional[SegmentStore] = None,
+    files: bool = True,
 ) -> None:
+    """Persist a run as ``<source>_<query>_<date>`` JSON and CSV files and/or a store segment."""
+    records = list(puestos)
+    if store is not None:
+        store.write(records, query, source)
+        if not files:
+            return
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y-%m-%d")
     base_name = f"{source}_{query.lower()}_{timestamp}"
 
-    records = list(puestos)
     json_path = os.path.join(output_dir, f"{base_name}.json")
     csv_path = os.path.join(output_dir, f"{base_name}.csv")
     _save_json(records, json_path)
@@ -51,3 +65,181 @@ def _save_csv(records: List[JobRecord], path: str) -> None:
         writer.writeheader()
         writer.writerows(records)
     logger.info("Resultados guardados en CSV: %s", path)
+
+
+# --- Lectura perezosa del historial ----------------------------------------
+
+_RESULT_NAME = re.compile(r"^(?P<source>[^_]+)_(?P<query>.+)_(?P<date>\d{4}-\d{2}-\d{2})\.(?:json|jsonl)$")
+# Con indent=2 cada oferta del arreglo abre y cierra en su propia línea con
+# dos espacios; dentro de un string JSON nunca hay saltos de línea literales.
+_ARRAY_ITEM_START = re.compile(rb"\n  \{")
+_ARRAY_ITEM_END = re.compile(rb"\n  \}")
+_LINE = re.compile(rb"[^\r\n]*\S[^\r\n]*")
+# Ofertas decodificadas por llamada a json.loads
+_CHUNK = 512
+
+
+class RecordFile:
+    """Memory-mapped, lazily decoded view over one saved result file.
+
+    Works on the indented arrays written by :func:`guardar_resultados` and on
+    newline-delimited JSON. Opening the file only scans it for record
+    boundaries (two offset arrays); records are decoded on access, in chunks,
+    and :meth:`raw` returns a zero-copy ``memoryview`` of one record's bytes.
+    With ``fuente``, :meth:`iter_records` searches the mapping for the
+    ``"fuente": ...`` bytes and decodes only the records that contain them.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._handle = open(path, "rb")
+        size = os.fstat(self._handle.fileno()).st_size
+        self._map: Optional[mmap.mmap] = (
+            mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        )
+        self._starts = array("q")
+        self._ends = array("q")
+        if self._map is not None:
+            self._build_index(self._map)
+
+    def __enter__(self) -> "RecordFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._handle.close()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index: int) -> JobRecord:
+        start, end = self._span(index)
+        return json.loads(self._map[start:end])
+
+    def __iter__(self) -> Iterator[JobRecord]:
+        return self.iter_records()
+
+    def raw(self, index: int) -> memoryview:
+        """Bytes of record ``index`` without copying (release it before :meth:`close`)."""
+        start, end = self._span(index)
+        return memoryview(self._map)[start:end]
+
+    def iter_records(self, fuente: Optional[str] = None) -> Iterator[JobRecord]:
+        indices: Iterable[int] = range(len(self)) if fuente is None else self._matching("fuente", fuente)
+        chunk: List[int] = []
+        for index in indices:
+            chunk.append(index)
+            if len(chunk) == _CHUNK:
+                yield from self._decode(chunk, fuente)
+                chunk = []
+        if chunk:
+            yield from self._decode(chunk, fuente)
+
+    def _decode(self, indices: List[int], fuente: Optional[str]) -> List[JobRecord]:
+        buffer, starts, ends = self._map, self._starts, self._ends
+        records = json.loads(b"[" + b",".join(buffer[starts[i]:ends[i]] for i in indices) + b"]")
+        if fuente is None:
+            return records
+        # El patrón también podría aparecer en un objeto anidado: se confirma
+        return [record for record in records if record.get("fuente") == fuente]
+
+    def _matching(self, field: str, value: str) -> List[int]:
+        starts, ends = self._starts, self._ends
+        found = set()
+        for pattern in _field_patterns(field, value):
+            for match in re.finditer(re.escape(pattern), self._map):
+                index = bisect_right(starts, match.start()) - 1
+                if index >= 0 and match.end() <= ends[index]:
+                    found.add(index)
+        return sorted(found)
+
+    def _span(self, index: int) -> Tuple[int, int]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._starts[index], self._ends[index]
+
+    def _build_index(self, buffer: mmap.mmap) -> None:
+        first = re.search(rb"\S", buffer[:4096].lstrip(b"\xef\xbb\xbf"))
+        if first is None:
+            return
+        if first.group() == b"{":
+            for match in _LINE.finditer(buffer):
+                self._starts.append(match.start())
+                self._ends.append(match.end())
+            return
+        self._starts.extend(match.start() + 3 for match in _ARRAY_ITEM_START.finditer(buffer))
+        self._ends.extend(match.end() for match in _ARRAY_ITEM_END.finditer(buffer))
+        if len(self._starts) != len(self._ends) or (not self._starts and buffer.find(b"{") >= 0):
+            # Arreglo sin el formato de guardar_resultados: se recorre con el decodificador
+            self._starts, self._ends = array("q"), array("q")
+            self._index_decoded(buffer)
+
+    def _index_decoded(self, buffer: mmap.mmap) -> None:
+        text = buffer[:].decode("utf-8-sig")
+        decoder = json.JSONDecoder()
+        position = text.index("[") + 1
+        byte_offset = len(buffer) - len(text[position:].encode("utf-8"))
+        while True:
+            while position < len(text) and text[position] in " \t\r\n,":
+                byte_offset += 1
+                position += 1
+            if position >= len(text) or text[position] == "]":
+                break
+            _, end = decoder.raw_decode(text, position)
+            length = len(text[position:end].encode("utf-8"))
+            self._starts.append(byte_offset)
+            self._ends.append(byte_offset + length)
+            byte_offset += length
+            position = end
+
+
+def _field_patterns(field: str, value: str) -> Tuple[bytes, ...]:
+    key = json.dumps(field)
+    values = {json.dumps(value, ensure_ascii=False), json.dumps(value)}
+    return tuple(f"{key}{separator}{encoded}".encode("utf-8") for encoded in values for separator in (": ", ":"))
+
+
+def result_file_info(path: str) -> Optional[Dict[str, str]]:
+    """``source``, ``query`` and ``date`` encoded in a result file name."""
+    match = _RESULT_NAME.match(os.path.basename(path))
+    return match.groupdict() if match else None
+
+
+def iter_history(
+    directory: str,
+    fuente: Optional[str] = None,
+    busqueda: Optional[str] = None,
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+) -> Iterator[JobRecord]:
+    """Stream the records of every result file in ``directory`` matching the filters.
+
+    ``busqueda`` and the ``desde``/``hasta`` dates (``YYYY-MM-DD``) are
+    resolved from the file names, so other files are never opened; ``fuente``
+    is checked per record byte range (see :class:`RecordFile`).
+    """
+    query = busqueda.lower() if busqueda is not None else None
+    paths = sorted(glob.glob(os.path.join(directory, "*.json")) + glob.glob(os.path.join(directory, "*.jsonl")))
+    for path in paths:
+        info = result_file_info(path)
+        if info is None:
+            if query is not None or desde or hasta:
+                continue
+        elif (
+            (query is not None and info["query"] != query)
+            or (desde and info["date"] < desde)
+            or (hasta and info["date"] > hasta)
+        ):
+            continue
+        try:
+            with RecordFile(path) as records:
+                yield from records.iter_records(fuente=fuente)
+        except (OSError, ValueError):
+            logger.warning("No se pudo leer %s", path)
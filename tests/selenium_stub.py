@@ -21,6 +21,11 @@ def ensure_selenium_stub() -> None:
 
     webdriver.Firefox = dummy_firefox  # type: ignore[attr-defined]
 
+    def dummy_remote(*_args, **_kwargs):
+        return None
+
+    webdriver.Remote = dummy_remote  # type: ignore[attr-defined]
+
     firefox_pkg = _create_module("selenium.webdriver.firefox")
     webdriver.firefox = firefox_pkg  # type: ignore[attr-defined]
 
@@ -36,6 +41,27 @@ def ensure_selenium_stub() -> None:
 
     options_module.Options = DummyOptions  # type: ignore[attr-defined]
 
+    def dummy_chrome(*_args, **_kwargs):
+        return None
+
+    webdriver.Chrome = dummy_chrome  # type: ignore[attr-defined]
+
+    chrome_pkg = _create_module("selenium.webdriver.chrome")
+    webdriver.chrome = chrome_pkg  # type: ignore[attr-defined]
+
+    chrome_options_module = _create_module("selenium.webdriver.chrome.options")
+    chrome_pkg.options = chrome_options_module  # type: ignore[attr-defined]
+
+    class DummyChromeOptions(DummyOptions):
+        def __init__(self) -> None:
+            super().__init__()
+            self.capabilities = {}
+
+        def set_capability(self, name: str, value) -> None:
+            self.capabilities[name] = value
+
+    chrome_options_module.Options = DummyChromeOptions  # type: ignore[attr-defined]
+
     common_pkg = _create_module("selenium.webdriver.common")
     webdriver.common = common_pkg  # type: ignore[attr-defined]
 
@@ -65,7 +91,7 @@ def ensure_selenium_stub() -> None:
     support_pkg.expected_conditions = expected_module  # type: ignore[attr-defined]
 
     def presence_of_element_located(locator):
-        return locator
+        return lambda driver: driver.find_element(*locator)
 
     expected_module.presence_of_element_located = presence_of_element_located  # type: ignore[attr-defined]
 
@@ -73,11 +99,15 @@ def ensure_selenium_stub() -> None:
     support_pkg.ui = ui_module  # type: ignore[attr-defined]
 
     class DummyWebDriverWait:
-        def __init__(self, *_args, **_kwargs) -> None:
-            pass
+        def __init__(self, driver=None, *_args, **_kwargs) -> None:
+            self.driver = driver
 
         def until(self, condition):  # type: ignore[no-untyped-def]
-            return condition
+            # Sin espera real: evalúa la condición una vez, como un timeout de 0
+            result = condition(self.driver)
+            if not result:
+                raise TimeoutError("condition not met")
+            return result
 
     ui_module.WebDriverWait = DummyWebDriverWait  # type: ignore[attr-defined]
 
@@ -0,0 +1,146 @@
+import json
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import unittest
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src import pipeline
+from src.bumeran import BumeranScraper
+from src.core.cache import PageCache
+
+RECORDED_PAGES = {
+    0: {
+        "content": [
+            {"id": 1, "titulo": "Analista de Datos", "empresa": "DataCorp", "confidencial": False},
+            {"id": 2, "titulo": "Analista Contable", "empresa": "FINANCIERA ADES", "confidencial": False},
+        ],
+        "total": 3,
+        "size": 2,
+    },
+    1: {
+        "content": [{"id": 3, "titulo": "Analista QA", "empresa": "", "confidencial": True}],
+        "total": 3,
+        "size": 2,
+    },
+}
+
+
+class RecordedSearchHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):  # noqa: N802 - http.server API
+        params = parse_qs(urlparse(self.path).query)
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        RecordedSearchHandler.requests.append((params, body, self.headers.get("x-site-id")))
+        page = int(params["page"][0])
+        etag = f'"page-{page}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        payload = json.dumps(RECORDED_PAGES.get(page, {"content": [], "total": 3})).encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_args):
+        pass
+
+
+class BumeranApiTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedSearchHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.api_url = f"http://127.0.0.1:{cls.server.server_address[1]}/api/avisos/searchV2"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        RecordedSearchHandler.requests = []
+
+    def test_extraer_desde_api_pages_until_total(self) -> None:
+        scraper = BumeranScraper(driver=Mock())
+        scraper.api_url = self.api_url
+
+        records = scraper.extraer_desde_api("Analista", dias=2, page_size=2)
+
+        self.assertEqual([r["titulo"] for r in records], ["Analista de Datos", "Analista Contable", "Analista QA"])
+        self.assertEqual(records[2]["empresa"], "")
+        self.assertEqual(records[0]["url"], "https://www.bumeran.com.pe/empleos/analista-de-datos-1.html")
+        self.assertEqual(len(RecordedSearchHandler.requests), 2)
+        params, body, site_id = RecordedSearchHandler.requests[0]
+        self.assertEqual(params["pageSize"], ["2"])
+        self.assertEqual(body["query"], "analista")
+        self.assertEqual(body["filtros"], [{"id": "dias_fecha_publicacion", "value": "menor-a-2-dias"}])
+        self.assertEqual(site_id, "BMPE")
+
+    def test_api_pages_are_cached_and_revalidated(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = PageCache(tmpdir, ttl=3600)
+            scraper = BumeranScraper(driver=Mock())
+            scraper.api_url = self.api_url
+            scraper.page_cache = cache
+            first = scraper.extraer_desde_api("Analista", page_size=2)
+            self.assertEqual(len(RecordedSearchHandler.requests), 2)
+
+            fresh = scraper.extraer_desde_api("Analista", page_size=2)
+            self.assertEqual(len(RecordedSearchHandler.requests), 2)
+
+            cache.ttl = 0
+            revalidated = scraper.extraer_desde_api("Analista", page_size=2)
+
+        self.assertEqual(first, fresh)
+        self.assertEqual(first, revalidated)
+        self.assertEqual(len(RecordedSearchHandler.requests), 4)
+
+    def test_api_mode_skips_browser_in_collector(self) -> None:
+        driver = Mock()
+        scraper = BumeranScraper(driver=driver)
+        scraper.api_url = self.api_url
+        scraper.API_PAGE_SIZE = 2
+        scraper.extraction_mode = "api"
+
+        results = pipeline._collect_bumeran(scraper, "Analista", dias=1, initial_wait=0, page_wait=0)
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r["fuente"] == "Bumeran" for r in results))
+        driver.get.assert_not_called()
+        self.assertEqual(RecordedSearchHandler.requests[0][1]["filtros"][0]["value"], "hoy")
+
+    def test_api_failure_falls_back_to_browser(self) -> None:
+        scraper = Mock()
+        scraper.extraction_mode = "api"
+        scraper.extraer_desde_api.side_effect = OSError("connection refused")
+        scraper.extraer_todos_los_puestos.return_value = [
+            {"titulo": "Dom", "url": "https://www.bumeran.com.pe/empleos/dom-9.html", "empresa": ""}
+        ]
+
+        results = pipeline._collect_bumeran(scraper, "Analista", dias=0, initial_wait=0, page_wait=0)
+
+        scraper.abrir_pagina_empleos.assert_called_once_with(hoy=False, dias=0)
+        self.assertEqual([r["url"] for r in results], ["https://www.bumeran.com.pe/empleos/dom-9.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import csv
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.companies import CompanyIndex, company_key, is_location
+
+
+class CompanyKeyTests(unittest.TestCase):
+    def test_key_ignores_case_accents_punctuation_and_legal_suffix(self) -> None:
+        self.assertEqual(company_key("FINANCIERA ADES S.A.C."), "financiera ades")
+        self.assertEqual(company_key("Financiera  Ades SAC"), "financiera ades")
+        self.assertEqual(company_key("Banco de Crédito del Perú S.A."), "banco de credito del peru")
+        self.assertEqual(company_key("SAC"), "sac")
+
+    def test_location_lines_are_not_companies(self) -> None:
+        self.assertTrue(is_location("Lima, Lima"))
+        self.assertTrue(is_location("San Isidro, Lima - Perú"))
+        self.assertFalse(is_location("Clínica San Borja SAC"))
+        self.assertTrue(is_location("Remoto"))
+        self.assertTrue(is_location("Ica - Perú"))
+
+    def test_bare_place_name_is_kept_as_company(self) -> None:
+        self.assertFalse(is_location("Ica"))
+        self.assertEqual(CompanyIndex().apply({"empresa": "Ica"})["empresa_id"], "ica")
+
+
+class CompanyIndexTests(unittest.TestCase):
+    def test_learns_most_common_variant_across_sources(self) -> None:
+        index = CompanyIndex()
+        records = [
+            {"fuente": "Bumeran", "empresa": "FINANCIERA ADES"},
+            {"fuente": "Computrabajo", "empresa": "Financiera Ades S.A.C."},
+            {"fuente": "Indeed", "empresa": "Financiera Ades S.A.C."},
+            {"fuente": "Indeed", "empresa": "Ades Financiera"},
+            {"fuente": "Bumeran", "empresa": "Lima, Lima"},
+        ]
+        for record in records:
+            index.apply(record)
+        self.assertEqual(
+            [r["empresa_id"] for r in records],
+            ["financiera ades"] * 4 + [""],
+        )
+        self.assertEqual(index.canonical("financiera ades"), "Financiera Ades S.A.C.")
+        self.assertEqual(index.apply({"empresa": "financiera ades"})["empresa"], "Financiera Ades S.A.C.")
+        self.assertEqual(records[-1]["empresa"], "")
+
+    def test_curated_aliases_win_and_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            aliases_csv = os.path.join(directory, "aliases.csv")
+            with open(aliases_csv, "w", encoding="utf-8", newline="") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(["alias", "empresa"])
+                writer.writerow(["BCP", "Banco de Crédito del Perú"])
+            index = CompanyIndex.load(None, aliases_csv=aliases_csv)
+            record = index.apply({"empresa": "B.C.P."})
+            self.assertEqual((record["empresa"], record["empresa_id"]), ("Banco de Crédito del Perú", "bcp"))
+            index.apply({"empresa": "Acme SAC"})
+
+            path = os.path.join(directory, "empresas.json")
+            index.save(path)
+            reloaded = CompanyIndex.load(path)
+        self.assertEqual(reloaded.apply({"empresa": "bcp"})["empresa"], "Banco de Crédito del Perú")
+        self.assertEqual(reloaded.apply({"empresa": "ACME"})["empresa_id"], "acme")
+        self.assertEqual(reloaded.canonical("acme"), "Acme SAC")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -133,5 +133,49 @@ class CompanyExtractionTests(unittest.TestCase):
         self.assertEqual(company, "DataCorp")
 
 
+def build_anchor(href: str, text: str = "", css_map=None):
+    anchor = build_element(text=text, css_map=css_map)
+    anchor.get_attribute.side_effect = lambda name: href if name == "href" else None
+    return anchor
+
+
+def driver_with_listing(anchors):
+    container = Mock()
+    container.find_elements.return_value = anchors
+    driver = Mock()
+    driver.find_element.return_value = container
+    return driver
+
+
+class RenderedCardCountTests(unittest.TestCase):
+    """Short-page detection counts the cards the page showed, not the records kept."""
+
+    def test_computrabajo_full_page_with_unreadable_cards_is_not_last(self) -> None:
+        base = "https://pe.computrabajo.com/ofertas-de-trabajo/oferta-de-trabajo-de-analista-"
+        anchors = [build_anchor(f"{base}{index:010X}", text="Analista") for index in range(16)]
+        anchors += [build_anchor(f"{base}FFFFFFFF{index:02d}") for index in range(3)]  # sin título
+        anchors.append(build_anchor(f"{base}{0:010X}", text="Analista"))  # repetida
+        scraper = ComputrabajoScraper(driver=driver_with_listing(anchors))
+        scraper.last_keyword = "analista"
+
+        records = scraper.extraer_puestos(timeout=0)
+
+        self.assertEqual(len(records), 16)
+        self.assertFalse(scraper.is_last_page(records))
+
+    def test_bumeran_counts_job_links_not_filters(self) -> None:
+        base = "https://www.bumeran.com.pe/empleos/analista-"
+        anchors = [build_anchor(f"{base}{index}.html") for index in range(20)]  # sin título
+        anchors.append(build_anchor("https://www.bumeran.com.pe/empleos-busqueda-analista.html", text="Filtro"))
+        scraper = BumeranScraper(driver=driver_with_listing(anchors))
+
+        records = scraper._extract_from_links(timeout=0)
+        self.assertEqual(records, [])
+        self.assertFalse(scraper.is_last_page(records))
+
+        scraper.driver = driver_with_listing(anchors[:5])
+        self.assertTrue(scraper.is_last_page(scraper._extract_from_links(timeout=0)))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.computrabajo_urls import (
+    detail_url,
+    keyword_from_url,
+    offer_id,
+    offer_token,
+    page_search_url,
+    replace_page,
+    search_base_url,
+)
+
+HREF = "/ofertas-de-trabajo/oferta-de-trabajo-de-analista-de-datos-en-miraflores-6F3C1A0B9E2D7C41"
+
+
+class ComputrabajoUrlTests(unittest.TestCase):
+    def test_search_base_url(self) -> None:
+        self.assertEqual(search_base_url("Analista de Datos"), "https://pe.computrabajo.com/trabajo-de-analista-de-datos")
+        self.assertEqual(search_base_url("analista", 3), "https://pe.computrabajo.com/trabajo-de-analista?pubdate=3")
+        self.assertEqual(page_search_url(search_base_url("analista", 3), 2), search_base_url("analista", 3) + "&p=2")
+        self.assertEqual(page_search_url(search_base_url("analista"), 1), search_base_url("analista"))
+
+    def test_replace_page(self) -> None:
+        self.assertEqual(replace_page("https://x/trabajo-de-a?pubdate=1&p=2", 3), "https://x/trabajo-de-a?pubdate=1&p=3")
+        self.assertEqual(replace_page("https://x/trabajo-de-a", 2), "https://x/trabajo-de-a?p=2")
+        self.assertEqual(keyword_from_url("https://x/trabajo-de-analista-de-datos?p=2"), "analista-de-datos")
+
+    def test_offer_token_prefers_blocks_with_digits(self) -> None:
+        self.assertEqual(offer_token(HREF), "6F3C1A0B9E2D7C41")
+        self.assertEqual(offer_token("/ofertas/administrador-contabilidad"), "administrador")
+        self.assertEqual(offer_token("/a/b"), "")
+
+    def test_detail_url(self) -> None:
+        base = search_base_url("analista")
+        self.assertEqual(detail_url(HREF, base), f"{base}#6F3C1A0B9E2D7C41")
+        self.assertEqual(detail_url("/a/b", base), "https://pe.computrabajo.com/a/b")
+        self.assertEqual(detail_url("https://otro.com/x", base), "https://otro.com/x")
+
+    def test_offer_id_is_stable_across_searches(self) -> None:
+        first = detail_url(HREF, search_base_url("analista"))
+        second = detail_url(HREF, search_base_url("analista de datos", 1))
+        self.assertNotEqual(first, second)
+        self.assertEqual(offer_id(first), offer_id(second))
+        self.assertEqual(offer_id("https://pe.computrabajo.com" + HREF), "6F3C1A0B9E2D7C41")
+        self.assertIsNone(offer_id("https://pe.computrabajo.com/trabajo-de-analista"))
+        self.assertIsNone(offer_id(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.core import backend as backend_module
+from src.core.backend import DriverBackend, LocalChromiumBackend, RemoteGridBackend, resolve_backend
+from src.core.base import BaseScraper
+
+
+class RemoteGridBackendTests(unittest.TestCase):
+    def test_released_session_is_reused(self) -> None:
+        created = []
+
+        def fake_remote(url, headless=None):
+            driver = MagicMock(name=f"driver-{len(created)}")
+            created.append((url, driver))
+            return driver
+
+        with patch.object(backend_module, "create_remote_driver", side_effect=fake_remote):
+            backend = RemoteGridBackend(["http://node-a:4444"], slots_per_node=1)
+            first = backend.acquire(headless=True)
+            backend.release(first)
+            second = backend.acquire(headless=True)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(created), 1)
+        first.delete_all_cookies.assert_called_once()
+        first.quit.assert_not_called()
+
+    def test_acquire_spreads_sessions_across_nodes(self) -> None:
+        urls = []
+
+        def fake_remote(url, headless=None):
+            urls.append(url)
+            return MagicMock()
+
+        with patch.object(backend_module, "create_remote_driver", side_effect=fake_remote):
+            backend = RemoteGridBackend(["http://node-a:4444", "http://node-b:4444"], slots_per_node=2)
+            for _ in range(4):
+                backend.acquire()
+
+        self.assertEqual(backend.capacity, 4)
+        self.assertEqual(sorted(urls), ["http://node-a:4444"] * 2 + ["http://node-b:4444"] * 2)
+
+    def test_acquire_blocks_when_capacity_is_exhausted(self) -> None:
+        with patch.object(backend_module, "create_remote_driver", side_effect=lambda *_a, **_k: MagicMock()):
+            backend = RemoteGridBackend(["http://node-a:4444"], slots_per_node=1)
+            first = backend.acquire()
+            with self.assertRaises(TimeoutError):
+                backend.acquire(timeout=0.05)
+
+            acquired = []
+            waiter = threading.Thread(target=lambda: acquired.append(backend.acquire(timeout=2)))
+            waiter.start()
+            backend.release(first)
+            waiter.join(timeout=2)
+
+        self.assertEqual(acquired, [first])
+
+    def test_dead_idle_session_is_replaced(self) -> None:
+        stale = MagicMock()
+        fresh = MagicMock()
+        with patch.object(backend_module, "create_remote_driver", side_effect=[stale, fresh]):
+            backend = RemoteGridBackend(["http://node-a:4444"])
+            backend.release(backend.acquire())
+            type(stale).current_url = property(lambda _self: (_ for _ in ()).throw(RuntimeError("gone")))
+            driver = backend.acquire()
+
+        self.assertIs(driver, fresh)
+        stale.quit.assert_called_once()
+
+    def test_idle_session_with_other_headless_is_closed_before_a_new_one(self) -> None:
+        created = []
+
+        def fake_remote(url, headless=None):
+            driver = MagicMock(name=f"driver-{len(created)}")
+            created.append(driver)
+            return driver
+
+        with patch.object(backend_module, "create_remote_driver", side_effect=fake_remote):
+            backend = RemoteGridBackend(["http://node-a:4444"], slots_per_node=1)
+            backend.release(backend.acquire(headless=True))
+            second = backend.acquire(headless=False)
+
+        self.assertEqual(len(created), 2)
+        self.assertIs(second, created[1])
+        # El nodo de un solo slot nunca tiene dos sesiones vivas
+        created[0].quit.assert_called_once()
+        self.assertEqual(backend.nodes[0].idle, [])
+
+    def test_scraper_hands_driver_back_to_backend(self) -> None:
+        backend = MagicMock()
+        driver = MagicMock()
+        backend.acquire.return_value = driver
+        scraper = BaseScraper(backend=backend, headless=False)
+
+        self.assertIs(scraper.driver, driver)
+        scraper.close()
+
+        backend.acquire.assert_called_once_with(headless=False, timeout=None)
+        backend.release.assert_called_once_with(driver)
+        driver.quit.assert_not_called()
+
+    def test_resolve_backend_reads_environment(self) -> None:
+        with patch.dict(os.environ, {"SCRAPER_GRID_URL": "http://a:4444, http://b:4444"}, clear=True):
+            backend = resolve_backend()
+        self.assertIsInstance(backend, RemoteGridBackend)
+        self.assertEqual([node.url for node in backend.nodes], ["http://a:4444", "http://b:4444"])
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(resolve_backend())
+
+    def test_driver_backend_requires_acquire(self) -> None:
+        with self.assertRaises(TypeError):
+            DriverBackend()
+
+        class Incomplete(DriverBackend):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+    def test_local_chromium_backend_respects_its_capacity(self) -> None:
+        with patch.object(backend_module, "create_chromium_driver", side_effect=lambda **_k: MagicMock()):
+            backend = LocalChromiumBackend(capacity=1)
+            first = backend.acquire()
+            with self.assertRaises(TimeoutError):
+                backend.acquire(timeout=0.05)
+            backend.release(first)
+            second = backend.acquire(timeout=0.05)
+
+        first.quit.assert_called_once()
+        self.assertIsNot(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
 import sys
+import threading
 from pathlib import Path
 import unittest
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock, patch
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -11,7 +12,9 @@ from tests.selenium_stub import ensure_selenium_stub
 
 ensure_selenium_stub()
 
-from src.core.base import BaseScraper
+from src.core import backend as backend_module
+from src.core.backend import RemoteGridBackend
+from src.core.base import BaseScraper, parse_results_count
 
 
 class DummyScraper(BaseScraper):
@@ -91,6 +94,238 @@ class BaseScraperTests(unittest.TestCase):
         self.assertEqual(results, [{"url": "u1", "titulo": "Job 1"}])
         self.assertEqual(visited_pages, [2])
 
+    def test_gather_paginated_skips_navigation_after_short_page(self) -> None:
+        scraper = DummyScraper()
+        scraper.page_size = 2
+        pages = [[{"url": "u1"}, {"url": "u2"}], [{"url": "u3"}]]
+        visited_pages = []
+
+        def navigator(page: int) -> bool:
+            visited_pages.append(page)
+            return True
+
+        results = scraper.gather_paginated(
+            extractor=lambda: pages[min(len(visited_pages), len(pages) - 1)],
+            navigator=navigator,
+            page_wait=0,
+        )
+
+        self.assertEqual([payload["url"] for payload in results], ["u1", "u2", "u3"])
+        self.assertEqual(visited_pages, [2])
+
+    def test_gather_paginated_uses_announced_total(self) -> None:
+        scraper = DummyScraper()
+        scraper.page_size = 2
+        scraper.estimate_total_pages = Mock(return_value=2)  # type: ignore[method-assign]
+        visited_pages = []
+
+        def navigator(page: int) -> bool:
+            visited_pages.append(page)
+            return True
+
+        def extractor():
+            page = len(visited_pages) + 1
+            return [{"url": f"u{page}a"}, {"url": f"u{page}b"}]
+
+        results = scraper.gather_paginated(extractor=extractor, navigator=navigator, page_wait=0)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(visited_pages, [2])
+        scraper.estimate_total_pages.assert_called_once()
+
+    def test_estimate_total_pages_reads_counter(self) -> None:
+        scraper = DummyScraper()
+        scraper.page_size = 20
+        scraper.TOTAL_RESULTS_SELECTORS = ("h1",)
+        scraper.driver.find_elements.return_value = [Mock(text="45 ofertas de trabajo de Analista")]
+        self.assertEqual(scraper.estimate_total_pages(), 3)
+
+    def test_parse_results_count(self) -> None:
+        self.assertEqual(parse_results_count("1.234 empleos"), 1234)
+        self.assertEqual(parse_results_count("Página 1 de 56 ofertas"), 56)
+        self.assertEqual(parse_results_count(" 2,345 "), 2345)
+        self.assertIsNone(parse_results_count("Analista 3D"))
+        self.assertIsNone(parse_results_count(""))
+
+
+class FakeDriver:
+    def __init__(self, log) -> None:
+        self.current_url = "page=1"
+        self.log = log
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self.log.append(url)
+
+    def quit(self) -> None:
+        pass
+
+
+class ShardedScraper(BaseScraper):
+    SHARD_STATE = ("listing",)
+    created = []
+
+    def __init__(self, driver=None, headless=True, backend=None) -> None:
+        super().__init__(driver=driver, headless=headless, backend=backend)
+        self.max_pages = 50
+        self.listing = {}
+        self.visits = []
+        ShardedScraper.created.append(self)
+
+    def _create_driver(self, timeout=None):
+        return FakeDriver(self.visits)
+
+    def page_url(self, numero: int):
+        return f"page={numero}"
+
+    def extract(self):
+        page = int(self.driver.current_url.split("=")[1])
+        return list(self.listing.get(page, []))
+
+
+class ShardedPaginationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        ShardedScraper.created = []
+
+    def _build(self, listing):
+        scraper = ShardedScraper()
+        scraper.listing = listing
+        return scraper
+
+    def test_sharded_results_preserve_page_order_and_dedup(self) -> None:
+        listing = {
+            page: [{"url": f"u{page}a"}, {"url": f"u{page}b"}] for page in range(1, 8)
+        }
+        listing[3].append({"url": "u1a"})
+        scraper = self._build(listing)
+
+        results = scraper.gather_paginated(
+            extractor=scraper.extract,
+            page_wait=0,
+            workers=3,
+            shard_extractor=lambda shard: shard.extract(),
+        )
+
+        expected = [f"u{page}{suffix}" for page in range(1, 8) for suffix in "ab"]
+        self.assertEqual([payload["url"] for payload in results], expected)
+        self.assertEqual(len(ShardedScraper.created), 3)
+        loaded = sorted(
+            int(url.split("=")[1]) for shard in ShardedScraper.created for url in shard.visits
+        )
+        # Ninguna página se carga dos veces y no se pasa mucho del final
+        self.assertEqual(len(loaded), len(set(loaded)))
+        self.assertLessEqual(max(loaded), 8 + 3)
+
+    def test_sharded_stops_at_repeated_page_like_sequential(self) -> None:
+        listing = {1: [{"url": "a"}], 2: [{"url": "b"}], 3: [{"url": "b"}], 4: [{"url": "c"}]}
+        sequential = self._build(listing)
+        pages = iter(range(1, 10))
+        expected = sequential.gather_paginated(
+            extractor=lambda: list(listing.get(next(pages), [])), page_wait=0
+        )
+        sharded = self._build(listing)
+
+        results = sharded.gather_paginated(
+            extractor=sharded.extract,
+            page_wait=0,
+            workers=2,
+            shard_extractor=lambda shard: shard.extract(),
+        )
+
+        self.assertEqual(results, expected)
+        self.assertEqual([payload["url"] for payload in results], ["a", "b"])
+
+    def test_page_that_keeps_failing_is_skipped_not_taken_for_the_end(self) -> None:
+        listing = {page: [{"url": f"u{page}"}] for page in range(1, 6)}
+        scraper = self._build(listing)
+        attempts = []
+
+        def extract(shard):
+            page = int(shard.driver.current_url.split("=")[1])
+            if page == 3:
+                attempts.append(page)
+                raise RuntimeError("tarjetas no disponibles")
+            return shard.extract()
+
+        results = scraper.gather_paginated(
+            extractor=scraper.extract, page_wait=0, workers=2, shard_extractor=extract
+        )
+
+        self.assertEqual([payload["url"] for payload in results], ["u1", "u2", "u4", "u5"])
+        self.assertEqual(attempts, [3, 3])
+        self.assertEqual(scraper.extraction_stats.failed_pages, [3])
+
+    def test_single_shard_keeps_paginating_past_a_failing_page(self) -> None:
+        listing = {page: [{"url": f"u{page}"}] for page in range(1, 7)}
+        scraper = self._build(listing)
+
+        def extract(shard):
+            page = int(shard.driver.current_url.split("=")[1])
+            if page == 2:
+                raise RuntimeError("tarjetas no disponibles")
+            return shard.extract()
+
+        # Ningún navegador libre para otros shards: solo pagina el propio scraper
+        with patch.object(ShardedScraper, "_reserve_shards", return_value=[]):
+            results = scraper.gather_paginated(
+                extractor=scraper.extract, page_wait=0, workers=3, shard_extractor=extract
+            )
+
+        self.assertEqual([payload["url"] for payload in results], ["u1", "u3", "u4", "u5", "u6"])
+        self.assertEqual(scraper.extraction_stats.failed_pages, [2])
+
+    def test_grid_without_free_slots_paginates_with_fewer_shards(self) -> None:
+        def fake_remote(url, headless=None):
+            driver = MagicMock()
+            driver.current_url = "page=1"
+            driver.title = ""
+            driver.find_elements.return_value = []
+
+            def get(target):
+                driver.current_url = target
+
+            driver.get.side_effect = get
+            return driver
+
+        class GridScraper(BaseScraper):
+            SHARD_STATE = ("listing",)
+            shard_acquire_timeout = 0.1
+
+            def page_url(self, numero):
+                return f"page={numero}"
+
+            def extract(self):
+                page = int(self.driver.current_url.split("=")[1])
+                return list(self.listing.get(page, []))
+
+        results = []
+        with patch.object(backend_module, "create_remote_driver", side_effect=fake_remote):
+            backend = RemoteGridBackend(["http://node-a:4444"], slots_per_node=1)
+            scraper = GridScraper(backend=backend)
+            scraper.listing = {page: [{"url": f"u{page}"}] for page in range(1, 5)}
+            worker = threading.Thread(
+                target=lambda: results.extend(
+                    scraper.gather_paginated(
+                        extractor=scraper.extract,
+                        page_wait=0.02,
+                        workers=2,
+                        shard_extractor=lambda shard: shard.extract(),
+                    )
+                ),
+                daemon=True,
+            )
+            worker.start()
+            worker.join(5)
+
+        self.assertFalse(worker.is_alive())
+        self.assertEqual([payload["url"] for payload in results], ["u1", "u2", "u3", "u4"])
+
+    def test_spawned_shard_copies_search_state(self) -> None:
+        scraper = self._build({1: [{"url": "a"}]})
+        shard = scraper.spawn_shard()
+        self.assertEqual(shard.listing, scraper.listing)
+        self.assertIsNot(shard.listing, scraper.listing)
+
 
 if __name__ == "__main__":
     unittest.main()
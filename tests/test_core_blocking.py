@@ -0,0 +1,164 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src import pipeline
+from src.core.base import BaseScraper
+from src.core.blocking import BlockedPageError, BlockRegistry, classify_page, detect_block
+from src.indeed import IndeedScraper
+from src.pipeline import RunContext
+from src.scheduler import SearchScheduler, build_specs
+
+
+def page_driver(title: str = "Empleos de analista", markers=()):
+    driver = MagicMock()
+    driver.title = title
+    driver.current_url = ""
+    driver.find_elements.return_value = list(markers)
+
+    def get(url: str) -> None:
+        driver.current_url = url
+
+    driver.get.side_effect = get
+    return driver
+
+
+class ClassifyPageTests(unittest.TestCase):
+    def test_challenge_titles_statuses_and_widgets_are_blocks(self) -> None:
+        self.assertIn("Just a moment", classify_page("Just a moment..."))
+        self.assertEqual(classify_page("Empleos", status=429), "HTTP 429")
+        self.assertIsNotNone(classify_page("Empleos", has_marker=True))
+        self.assertIsNone(classify_page("Empleos de analista | Indeed", status=200))
+
+    def test_detect_block_reads_title_then_markers(self) -> None:
+        self.assertIsNone(detect_block(page_driver()))
+        self.assertIsNotNone(detect_block(page_driver(markers=[object()])))
+        blocked = page_driver("Attention Required! | Cloudflare")
+        self.assertIsNotNone(detect_block(blocked))
+        blocked.find_elements.assert_not_called()
+
+
+class BlockRegistryTests(unittest.TestCase):
+    def test_cooldown_doubles_on_repeated_blocks_and_persists(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.json")
+            registry = BlockRegistry(path, cooldown=60)
+            error = BlockedPageError("pe.indeed.com", "HTTP 403")
+            now = time.time()
+            self.assertEqual(registry.record("indeed", error, now=now - 200), 60)
+            self.assertEqual(registry.record("indeed", error, now=now - 100), 120)
+            self.assertAlmostEqual(registry.remaining("pe.indeed.com", now=now), 20)
+            self.assertAlmostEqual(registry.source_remaining("indeed", now=now), 20)
+            self.assertEqual(registry.source_remaining("bumeran", now=now), 0)
+            registry.save()
+            self.assertAlmostEqual(BlockRegistry(path).remaining("pe.indeed.com", now=now), 20)
+
+    def test_cooling_errors_do_not_escalate(self) -> None:
+        registry = BlockRegistry(cooldown=60)
+        registry.record("indeed", BlockedPageError("pe.indeed.com", "HTTP 403"))
+        with self.assertRaises(BlockedPageError) as raised:
+            registry.check("https://pe.indeed.com/jobs?q=x")
+        self.assertTrue(raised.exception.cooling)
+        registry.record("indeed", raised.exception)
+        self.assertEqual(registry.hosts["pe.indeed.com"]["strikes"], 1)
+
+
+class BlockedScraperTests(unittest.TestCase):
+    def test_captcha_aborts_the_search_before_waiting_for_cards(self) -> None:
+        scraper = IndeedScraper(driver=page_driver("Just a moment..."))
+        scraper.abrir_pagina_empleos(dias=1)
+        with self.assertRaises(BlockedPageError) as raised:
+            scraper.buscar_vacante("analista")
+        self.assertEqual(raised.exception.host, "pe.indeed.com")
+
+    def test_host_in_cooldown_is_not_requested(self) -> None:
+        registry = BlockRegistry()
+        registry.record("indeed", BlockedPageError("pe.indeed.com", "HTTP 429"))
+        driver = page_driver()
+        scraper = IndeedScraper(driver=driver)
+        scraper.block_registry = registry
+        scraper.abrir_pagina_empleos(dias=1)
+        with self.assertRaises(BlockedPageError):
+            scraper.buscar_vacante("analista")
+        driver.get.assert_not_called()
+
+    def test_run_source_records_the_block_instead_of_reporting_no_results(self) -> None:
+        registry = BlockRegistry()
+        entry = (lambda headless=None: IndeedScraper(driver=page_driver("Just a moment...")), pipeline._collect_indeed, False)
+        with patch.dict(pipeline.SCRAPER_REGISTRY, {"indeed": entry}):
+            results = pipeline.run_source("indeed", "analista", 1, 0, 0, context=RunContext(block_registry=registry))
+        self.assertEqual(results, [])
+        self.assertEqual([event["host"] for event in registry.events], ["pe.indeed.com"])
+
+    def test_block_on_a_later_page_keeps_the_earlier_pages(self) -> None:
+        scraper = BaseScraper(driver=page_driver())
+        pages = iter(range(1, 10))
+        current = {"page": 1}
+
+        def navigator(page):
+            if page == 3:
+                raise BlockedPageError("pe.indeed.com", "HTTP 429")
+            current["page"] = page
+            return True
+
+        with self.assertRaises(BlockedPageError) as raised:
+            scraper.gather_paginated(
+                extractor=lambda: [{"url": f"u{current['page']}-{next(pages)}"}], navigator=navigator, page_wait=0
+            )
+        self.assertEqual([payload["url"] for payload in raised.exception.partial], ["u1-1", "u2-2"])
+
+    def test_run_source_returns_partial_results_flagged_as_blocked(self) -> None:
+        registry = BlockRegistry()
+
+        def collector(scraper, busqueda, dias, initial_wait, page_wait):
+            error = BlockedPageError("pe.indeed.com", "HTTP 429")
+            error.partial = [{"fuente": "Indeed", "url": "https://pe.indeed.com/viewjob?jk=1"}]
+            raise error
+
+        entry = (lambda headless=None: IndeedScraper(driver=page_driver()), collector, False)
+        with patch.dict(pipeline.SCRAPER_REGISTRY, {"indeed": entry}):
+            results = pipeline.run_source("indeed", "analista", 1, 0, 0, context=RunContext(block_registry=registry))
+            batch = SearchScheduler(max_workers=1).run(
+                build_specs(["analista"], [1], ["indeed"]), initial_wait=0, page_wait=0
+            )
+
+        self.assertEqual([record["url"] for record in results], ["https://pe.indeed.com/viewjob?jk=1"])
+        self.assertEqual(results.blocked.reason, "HTTP 429")
+        self.assertEqual(len(registry.events), 1)
+        self.assertEqual(batch[0].blocked, ["indeed"])
+        self.assertEqual(len(batch[0].records), 1)
+
+    def test_scheduler_skips_sources_in_cooldown(self) -> None:
+        registry = BlockRegistry()
+        registry.record("indeed", BlockedPageError("pe.indeed.com", "HTTP 403"))
+        calls = []
+
+        def runner(source, busqueda, *args, **kwargs):
+            calls.append(source)
+            return [{"url": f"https://jobs.com/{source}/{busqueda}"}]
+
+        scheduler = SearchScheduler(max_workers=2, runner=runner)
+        results = scheduler.run(
+            build_specs(["a"], [0], ["bumeran", "indeed"]),
+            initial_wait=0,
+            page_wait=0,
+            context=RunContext(block_registry=registry),
+        )
+        self.assertEqual(calls, ["bumeran"])
+        self.assertEqual(results[0].executed, ["bumeran"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ import os
 import sys
 from pathlib import Path
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, call, patch
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -16,6 +16,8 @@ import importlib
 
 browser_module = importlib.import_module("src.core.browser")
 create_firefox_driver = browser_module.create_firefox_driver
+create_remote_driver = browser_module.create_remote_driver
+create_chromium_driver = browser_module.create_chromium_driver
 
 
 class BrowserFactoryTests(unittest.TestCase):
@@ -67,6 +69,43 @@ class BrowserFactoryTests(unittest.TestCase):
         options_instance.add_argument.assert_not_called()
         mock_firefox.assert_called_once()
 
+    def test_remote_driver_targets_command_executor(self) -> None:
+        with patch.object(browser_module, "Options") as mock_options, patch.object(
+            browser_module.webdriver, "Remote"
+        ) as mock_remote:
+            options_instance = mock_options.return_value
+            create_remote_driver("http://grid:4444/wd/hub", headless=True)
+        mock_remote.assert_called_once_with(
+            command_executor="http://grid:4444/wd/hub", options=options_instance
+        )
+        options_instance.add_argument.assert_called_once_with("-headless")
+
+    def test_chromium_driver_enables_performance_log(self) -> None:
+        with patch.object(browser_module, "ChromeOptions") as mock_options, patch.object(
+            browser_module.webdriver, "Chrome"
+        ) as mock_chrome:
+            options_instance = mock_options.return_value
+            create_chromium_driver(headless=True)
+        mock_chrome.assert_called_once_with(options=options_instance)
+        options_instance.add_argument.assert_called_once_with("--headless=new")
+        options_instance.set_capability.assert_called_once_with(
+            "goog:loggingPrefs", {"performance": "ALL"}
+        )
+
+    def test_profile_template_clone_is_passed_to_geckodriver(self) -> None:
+        template = Mock()
+        template.clone.return_value = "/tmp/profile-123"
+        browser_module.startup_stats.reset()
+        with patch.object(browser_module, "Options") as mock_options, patch.object(
+            browser_module.webdriver, "Firefox"
+        ) as mock_firefox:
+            options_instance = mock_options.return_value
+            create_firefox_driver(headless=True, profile_template=template)
+        options_instance.add_argument.assert_has_calls([call("-headless"), call("-profile"), call("/tmp/profile-123")])
+        template.attach.assert_called_once_with(mock_firefox.return_value, "/tmp/profile-123")
+        self.assertEqual(browser_module.startup_stats.summary()["template"]["count"], 1)
+        browser_module.startup_stats.reset()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+from unittest.mock import Mock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.core.base import BaseScraper
+from src.core.cache import PageCache, normalize_listing_url
+
+
+class ListingScraper(BaseScraper):
+    page_size = 2
+
+    def __init__(self, listing, driver) -> None:
+        super().__init__(driver=driver)
+        self.listing = listing
+        self.current = 1
+
+    def page_url(self, numero: int):
+        return f"https://jobs.example.com/search?q=data&page={numero}"
+
+    def navigate(self, numero: int) -> bool:
+        self.driver.get(self.page_url(numero))
+        self.current = numero
+        return True
+
+    def extract(self):
+        return list(self.listing.get(self.current, []))
+
+
+class PageCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_normalized_urls_share_an_entry(self) -> None:
+        cache = PageCache(self.tmpdir.name)
+        cache.put("HTTPS://Jobs.Example.com/search?page=2&q=data#top", [{"url": "a"}], total=40)
+        entry = cache.get("https://jobs.example.com/search?q=data&page=2")
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.records, [{"url": "a"}])
+        self.assertEqual(entry.total, 40)
+        self.assertEqual(
+            normalize_listing_url("HTTPS://Jobs.Example.com/search?page=2&q=data#top"),
+            "https://jobs.example.com/search?page=2&q=data",
+        )
+
+    def test_expired_entries_are_only_served_as_stale(self) -> None:
+        cache = PageCache(self.tmpdir.name, ttl=60)
+        with patch("src.core.cache.time.time", return_value=1000.0):
+            cache.put("https://jobs.example.com/a", [], etag='"v1"')
+        with patch("src.core.cache.time.time", return_value=1100.0):
+            self.assertIsNone(cache.get("https://jobs.example.com/a"))
+            stale = cache.get("https://jobs.example.com/a", allow_stale=True)
+        self.assertEqual(stale.conditional_headers(), {"If-None-Match": '"v1"'})
+        self.assertEqual([page.url for page in cache.iter_pages()], ["https://jobs.example.com/a"])
+
+    def test_second_run_is_served_without_the_browser(self) -> None:
+        listing = {1: [{"url": "a"}, {"url": "b"}], 2: [{"url": "c"}]}
+        cache = PageCache(self.tmpdir.name)
+        first_driver = Mock()
+        first_driver.page_source = "<html>page</html>"
+        first = ListingScraper(listing, first_driver)
+        first.page_cache = cache
+        expected = first.gather_paginated(extractor=first.extract, navigator=first.navigate, page_wait=0)
+
+        second_driver = Mock()
+        second = ListingScraper(listing, second_driver)
+        second.page_cache = cache
+        second._open_listing(second.page_url(1))
+        extractor = Mock(side_effect=AssertionError("no debería extraer"))
+        results = second.gather_paginated(extractor=extractor, navigator=second.navigate, page_wait=0)
+
+        self.assertEqual([payload["url"] for payload in expected], ["a", "b", "c"])
+        self.assertEqual(results, expected)
+        second_driver.get.assert_not_called()
+        self.assertEqual(cache.get(first.page_url(1)).html, "<html>page</html>")
+
+    def test_partial_cache_jumps_straight_to_missing_page(self) -> None:
+        listing = {1: [{"url": "a"}, {"url": "b"}], 2: [{"url": "c"}]}
+        cache = PageCache(self.tmpdir.name)
+        cache.put(
+            "https://jobs.example.com/search?q=data&page=1", listing[1], total=3, card_count=2
+        )
+        driver = Mock()
+        scraper = ListingScraper(listing, driver)
+        scraper.page_cache = cache
+        navigator = Mock(side_effect=AssertionError("debe ir directo a la URL"))
+
+        def extract():
+            return list(listing[2])
+
+        results = scraper.gather_paginated(extractor=extract, navigator=navigator, page_wait=0)
+
+        self.assertEqual([payload["url"] for payload in results], ["a", "b", "c"])
+        driver.get.assert_called_once_with("https://jobs.example.com/search?q=data&page=2")
+
+
+if __name__ == "__main__":
+    unittest.main()
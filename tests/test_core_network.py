@@ -0,0 +1,162 @@
+import base64
+import json
+import sys
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.bumeran import BumeranScraper
+from src.core.network import NetworkCapture
+from src.indeed import IndeedScraper
+
+INDEED_JOBCARDS = {
+    "metaData": {
+        "mosaicProviderJobCardsModel": {
+            "results": [
+                {"jobkey": "abc123", "displayTitle": "Analista de Datos", "company": "DataCorp"},
+                {"jobkey": "def456", "title": "Analista QA", "companyName": "QA SAC"},
+                {"jobkey": "", "displayTitle": "Sin clave"},
+            ]
+        }
+    }
+}
+
+BUMERAN_SEARCH = {
+    "content": [
+        {"id": 1117001, "titulo": "Analista Contable", "empresa": "FINANCIERA ADES", "confidencial": False},
+        {"id": 1117002, "titulo": "Analista de Compras", "empresa": "Oculta", "confidencial": True},
+    ],
+    "total": 2,
+}
+
+
+def perf_entry(request_id, url, mime="application/json", resource_type="XHR", status=200):
+    message = {
+        "message": {
+            "method": "Network.responseReceived",
+            "params": {
+                "requestId": request_id,
+                "type": resource_type,
+                "response": {"url": url, "mimeType": mime, "status": status},
+            },
+        }
+    }
+    return {"message": json.dumps(message)}
+
+
+def build_driver(entries, bodies):
+    driver = MagicMock()
+    driver.get_log.side_effect = [entries, []]
+
+    def execute_cdp_cmd(command, params):
+        return bodies[params["requestId"]]
+
+    driver.execute_cdp_cmd.side_effect = execute_cdp_cmd
+    return driver
+
+
+class NetworkCaptureTests(unittest.TestCase):
+    def test_json_payloads_filters_by_pattern_and_mime(self) -> None:
+        entries = [
+            perf_entry("1", "https://pe.indeed.com/jobs?q=x", mime="text/html", resource_type="Document", status=200),
+            perf_entry("2", "https://pe.indeed.com/api/jobcards"),
+            perf_entry("3", "https://tracking.example.com/pixel"),
+        ]
+        encoded = base64.b64encode(json.dumps({"ok": True}).encode()).decode()
+        driver = build_driver(entries, {"2": {"body": encoded, "base64Encoded": True}})
+        capture = NetworkCapture(driver, ("/api/",))
+
+        payloads = capture.json_payloads()
+
+        self.assertEqual(payloads, [("https://pe.indeed.com/api/jobcards", {"ok": True})])
+        self.assertEqual(capture.last_document_status, 200)
+        self.assertEqual(capture.json_payloads(), [])
+
+
+class NetworkModeExtractionTests(unittest.TestCase):
+    def test_indeed_maps_jobcards_payload(self) -> None:
+        entries = [perf_entry("7", "https://pe.indeed.com/api/jobcards")]
+        driver = build_driver(entries, {"7": {"body": json.dumps(INDEED_JOBCARDS)}})
+        scraper = IndeedScraper(driver=driver)
+        scraper.extraction_mode = "network"
+
+        records = scraper.extraer_puestos(timeout=1)
+
+        self.assertEqual(
+            records,
+            [
+                {"titulo": "Analista de Datos", "url": "https://pe.indeed.com/viewjob?jk=abc123", "empresa": "DataCorp"},
+                {"titulo": "Analista QA", "url": "https://pe.indeed.com/viewjob?jk=def456", "empresa": "QA SAC"},
+            ],
+        )
+
+    def test_bumeran_maps_search_payload(self) -> None:
+        scraper = BumeranScraper(driver=MagicMock())
+        records = scraper._records_from_payload(BUMERAN_SEARCH)
+        self.assertEqual(
+            records,
+            [
+                {
+                    "titulo": "Analista Contable",
+                    "url": "https://www.bumeran.com.pe/empleos/analista-contable-1117001.html",
+                    "empresa": "FINANCIERA ADES",
+                },
+                {
+                    "titulo": "Analista de Compras",
+                    "url": "https://www.bumeran.com.pe/empleos/analista-de-compras-1117002.html",
+                    "empresa": "",
+                },
+            ],
+        )
+
+    def test_network_mode_falls_back_to_dom(self) -> None:
+        driver = MagicMock()
+        driver.get_log.return_value = []
+        scraper = BumeranScraper(driver=driver)
+        scraper.extraction_mode = "network"
+        dom_records = [{"titulo": "Dom", "url": "https://www.bumeran.com.pe/empleos/dom-1.html", "empresa": ""}]
+
+        with patch.object(scraper, "_extract_from_links", return_value=dom_records) as dom_path, patch(
+            "src.core.base.time.sleep"
+        ):
+            records = scraper.extraer_puestos(timeout=0)
+
+        dom_path.assert_called_once()
+        self.assertEqual(records, dom_records)
+
+    def test_responses_before_the_search_are_not_merged_into_page_one(self) -> None:
+        landing = {"content": [{"id": 1, "titulo": "Destacado de portada", "empresa": "X"}], "total": 1}
+        driver = MagicMock()
+        driver.current_url = ""
+        driver.get_log.side_effect = [
+            [perf_entry("1", "https://www.bumeran.com.pe/api/avisos/destacados")],  # antes de buscar
+            [],  # estado del documento de la búsqueda
+            [perf_entry("2", "https://www.bumeran.com.pe/api/avisos/searchV2")],
+        ]
+        bodies = {"1": {"body": json.dumps(landing)}, "2": {"body": json.dumps(BUMERAN_SEARCH)}}
+        driver.execute_cdp_cmd.side_effect = lambda command, params: bodies[params["requestId"]]
+        scraper = BumeranScraper(driver=driver)
+        scraper.extraction_mode = "network"
+
+        scraper._navigate("https://www.bumeran.com.pe/empleos-busqueda-analista.html")
+        records = scraper._extract_from_network(timeout=0)
+
+        self.assertEqual([record["titulo"] for record in records], ["Analista Contable", "Analista de Compras"])
+
+    def test_dom_mode_never_reads_network_log(self) -> None:
+        driver = MagicMock()
+        scraper = IndeedScraper(driver=driver)
+        self.assertEqual(scraper._extract_from_network(), [])
+        driver.get_log.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
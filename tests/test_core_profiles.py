@@ -0,0 +1,105 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.core.profiles import WARM_MARKER, ProfileTemplate, StartupStats
+
+
+class FakeFirefox:
+    """Creates the files a first start would leave in the profile."""
+
+    def __init__(self, profile_dir: str) -> None:
+        self.profile_dir = profile_dir
+        self.quit_called = False
+        os.makedirs(os.path.join(profile_dir, "startupCache"), exist_ok=True)
+        with open(os.path.join(profile_dir, "startupCache", "startupCache.8.little"), "wb") as handle:
+            handle.write(b"cache")
+        with open(os.path.join(profile_dir, "places.sqlite"), "wb") as handle:
+            handle.write(b"db")
+        with open(os.path.join(profile_dir, "lock"), "w") as handle:
+            handle.write("locked")
+
+    def get(self, url: str) -> None:
+        pass
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class ProfileTemplateTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self._tmp.name, "template")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_prepare_writes_prefs_and_warms_once(self) -> None:
+        launches = []
+
+        def launcher(profile_dir):
+            launches.append(profile_dir)
+            return FakeFirefox(profile_dir)
+
+        template = ProfileTemplate(self.directory, prefs={"general.useragent.locale": "es-PE"})
+        template.prepare(warm=True, launcher=launcher)
+        template.prepare(warm=True, launcher=launcher)
+        with open(os.path.join(self.directory, "user.js"), encoding="utf-8") as handle:
+            user_js = handle.read()
+        self.assertIn('user_pref("toolkit.telemetry.enabled", false);', user_js)
+        self.assertIn('user_pref("general.useragent.locale", "es-PE");', user_js)
+        self.assertEqual(launches, [template.directory])
+        self.assertTrue(template.warmed)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "lock")))
+
+    def test_changed_prefs_invalidate_the_warm_profile(self) -> None:
+        ProfileTemplate(self.directory).prepare(warm=True, launcher=FakeFirefox)
+        template = ProfileTemplate(self.directory, prefs={"browser.cache.disk.capacity": 1024})
+        template.prepare()
+        self.assertFalse(template.warmed)
+
+    def test_clone_links_immutable_files_and_copies_mutable_ones(self) -> None:
+        template = ProfileTemplate(self.directory).prepare(warm=True, launcher=FakeFirefox)
+        clone = template.clone()
+        shared = os.path.join("startupCache", "startupCache.8.little")
+        self.assertTrue(os.path.samefile(os.path.join(clone, shared), os.path.join(self.directory, shared)))
+        self.assertFalse(os.path.samefile(os.path.join(clone, "places.sqlite"), os.path.join(self.directory, "places.sqlite")))
+        self.assertFalse(os.path.exists(os.path.join(clone, WARM_MARKER)))
+        with open(os.path.join(clone, "places.sqlite"), "wb") as handle:
+            handle.write(b"changed")
+        with open(os.path.join(self.directory, "places.sqlite"), "rb") as handle:
+            self.assertEqual(handle.read(), b"db")
+        self.assertNotEqual(template.clone(), clone)
+
+    def test_clone_is_removed_with_its_driver(self) -> None:
+        template = ProfileTemplate(self.directory).prepare()
+        clone = template.clone()
+        driver = FakeFirefox(clone)
+        template.attach(driver, clone)
+        del driver
+        self.assertFalse(os.path.exists(clone))
+
+
+class StartupStatsTests(unittest.TestCase):
+    def test_summary_by_kind(self) -> None:
+        stats = StartupStats()
+        stats.record("fresh", 3.0)
+        stats.record("fresh", 5.0)
+        stats.record("template", 1.0)
+        summary = stats.summary()
+        self.assertEqual(summary["fresh"], {"count": 2, "mean": 4.0, "max": 5.0})
+        self.assertEqual(summary["template"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
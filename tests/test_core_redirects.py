@@ -0,0 +1,125 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.bumeran import BumeranScraper
+from src.computrabajo import ComputrabajoScraper
+from src.core.redirects import RedirectCache
+
+
+def redirecting_driver(moves):
+    """Driver mock whose ``get`` lands on another host for the origins in ``moves``."""
+    driver = MagicMock()
+    driver.current_url = ""
+
+    def get(url: str) -> None:
+        for source, target in moves.items():
+            if url.startswith(source):
+                url = target + url[len(source):]
+        driver.current_url = url
+
+    driver.get.side_effect = get
+    return driver
+
+
+class RedirectCacheTests(unittest.TestCase):
+    def test_domain_redirect_is_learned_and_applied_to_other_paths(self) -> None:
+        cache = RedirectCache()
+        self.assertTrue(cache.learn("https://www.computrabajo.com.pe/", "https://pe.computrabajo.com/"))
+        self.assertEqual(
+            cache.resolve("https://www.computrabajo.com.pe/trabajo-de-analista?p=2"),
+            "https://pe.computrabajo.com/trabajo-de-analista?p=2",
+        )
+        self.assertEqual(cache.resolve("https://pe.indeed.com/jobs?q=x"), "https://pe.indeed.com/jobs?q=x")
+
+    def test_redirects_that_change_the_page_are_not_cached(self) -> None:
+        cache = RedirectCache()
+        self.assertFalse(cache.learn("https://pe.indeed.com/jobs?q=x", "https://secure.indeed.com/auth?continue=x"))
+        self.assertFalse(cache.learn("https://pe.indeed.com/jobs?q=x", "https://pe.indeed.com/jobs?q=x"))
+        self.assertEqual(len(cache), 0)
+
+    def test_root_redirect_to_a_login_page_is_not_cached(self) -> None:
+        cache = RedirectCache()
+        self.assertFalse(cache.learn("https://pe.indeed.com/?r=pe", "https://secure.indeed.com/auth?continue=x"))
+        self.assertFalse(cache.learn("https://pe.indeed.com/", "https://pe.indeed.com.x/challenge"))
+        self.assertEqual(len(cache), 0)
+        self.assertTrue(cache.learn("https://pe.indeed.com/?r=pe", "https://pe.indeed.example/"))
+
+    def test_learned_redirects_expire(self) -> None:
+        cache = RedirectCache(max_age=60)
+        cache.learn("https://www.computrabajo.com.pe/", "https://pe.computrabajo.com/", now=1000.0)
+        self.assertEqual(
+            cache.resolve("https://www.computrabajo.com.pe/x", now=1050.0), "https://pe.computrabajo.com/x"
+        )
+        self.assertEqual(
+            cache.resolve("https://www.computrabajo.com.pe/x", now=1100.0), "https://www.computrabajo.com.pe/x"
+        )
+        self.assertEqual(len(cache), 0)
+
+    def test_chains_collapse_and_persist(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "redirects.json")
+            cache = RedirectCache(path)
+            cache.learn("http://computrabajo.com.pe/", "https://www.computrabajo.com.pe/")
+            cache.learn("https://www.computrabajo.com.pe/", "https://pe.computrabajo.com/")
+            cache.save()
+            with open(path, encoding="utf-8") as handle:
+                origins = json.load(handle)["origins"]
+            self.assertEqual(origins["http://computrabajo.com.pe"], "https://pe.computrabajo.com")
+            reloaded = RedirectCache(path)
+            self.assertEqual(reloaded.resolve("http://computrabajo.com.pe/"), "https://pe.computrabajo.com/")
+
+
+class DirectEntryTests(unittest.TestCase):
+    def test_computrabajo_goes_straight_to_the_search(self) -> None:
+        driver = redirecting_driver({})
+        scraper = ComputrabajoScraper(driver=driver)
+        scraper.abrir_pagina_empleos(dias=3)
+        scraper.buscar_vacante("analista")
+        driver.get.assert_called_once_with("https://pe.computrabajo.com/trabajo-de-analista?pubdate=3")
+
+    def test_landing_redirect_is_reused_by_the_next_navigation(self) -> None:
+        driver = redirecting_driver({"https://www.computrabajo.com.pe": "https://pe.computrabajo.com"})
+        scraper = ComputrabajoScraper(driver=driver)
+        scraper.direct_entry = False
+        scraper.redirect_cache = RedirectCache()
+        scraper.abrir_pagina_empleos(dias=0)
+        scraper._navigate("https://www.computrabajo.com.pe/trabajo-de-analista")
+        self.assertEqual(driver.get.call_args.args[0], "https://pe.computrabajo.com/trabajo-de-analista")
+        self.assertEqual(scraper.redirect_cache.hits, 1)
+
+    def test_bumeran_derives_the_search_url_without_loading_the_listing(self) -> None:
+        driver = redirecting_driver({})
+        scraper = BumeranScraper(driver=driver)
+        scraper.abrir_pagina_empleos(hoy=True)
+        scraper.buscar_vacante("Analista de datos")
+        driver.get.assert_called_once_with(
+            "https://www.bumeran.com.pe/empleos-publicacion-hoy-busqueda-analista-de-datos.html"
+        )
+
+    def test_landing_page_mode_keeps_the_extra_load(self) -> None:
+        driver = redirecting_driver({})
+        scraper = BumeranScraper(driver=driver)
+        scraper.direct_entry = False
+        scraper.abrir_pagina_empleos(dias=2)
+        scraper.buscar_vacante("analista")
+        self.assertEqual(driver.get.call_count, 2)
+        self.assertEqual(
+            driver.get.call_args.args[0], "https://www.bumeran.com.pe/empleos-publicacion-menor-a-2-dias-busqueda-analista.html"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+import unittest
+from unittest.mock import Mock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.core.base import BaseScraper
+from src.core.resources import MB, ResourceGovernor, driver_process_id, process_tree_rss
+
+
+class ProcessTreeTests(unittest.TestCase):
+    @unittest.skipUnless(os.path.isdir("/proc"), "requiere /proc")
+    def test_tree_rss_includes_children(self) -> None:
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        try:
+            time.sleep(0.2)
+            own = process_tree_rss(child.pid)
+            tree = process_tree_rss(os.getpid())
+            self.assertGreater(own, 0)
+            self.assertGreater(tree, own)
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_driver_process_id_prefers_service_process(self) -> None:
+        driver = Mock()
+        driver.service.process.pid = 4321
+        self.assertEqual(driver_process_id(driver), 4321)
+        remote = Mock(spec=["capabilities"])
+        remote.capabilities = {"moz:processID": 99}
+        self.assertEqual(driver_process_id(remote), 99)
+        self.assertIsNone(driver_process_id(Mock(spec=[])))
+
+
+class ResourceGovernorTests(unittest.TestCase):
+    def test_recycles_on_page_count_and_rss(self) -> None:
+        governor = ResourceGovernor(max_rss_mb=100, max_pages=10)
+        driver = Mock()
+        with patch.object(governor, "driver_rss", return_value=50 * MB):
+            self.assertFalse(governor.should_recycle(driver, 3))
+            self.assertTrue(governor.should_recycle(driver, 10))
+        with patch.object(governor, "driver_rss", return_value=150 * MB):
+            self.assertTrue(governor.should_recycle(driver, 1))
+        with patch.object(governor, "driver_rss", return_value=None):
+            self.assertFalse(governor.should_recycle(driver, 1))
+
+    def test_new_browser_waits_for_pool_budget(self) -> None:
+        governor = ResourceGovernor(pool_rss_mb=100, poll_interval=0.01)
+        running = Mock()
+        governor.register(running)
+        with patch.object(governor, "driver_rss", return_value=120 * MB):
+            waiter = threading.Thread(target=governor.wait_for_budget)
+            waiter.start()
+            time.sleep(0.05)
+            self.assertTrue(waiter.is_alive())
+            governor.unregister(running)
+            waiter.join(1)
+        self.assertFalse(waiter.is_alive())
+
+    def test_budget_wait_gives_up_after_timeout(self) -> None:
+        governor = ResourceGovernor(pool_rss_mb=1, budget_timeout=0.05, poll_interval=0.01)
+        governor.register(Mock())
+        with patch.object(governor, "driver_rss", return_value=10 * MB):
+            started = time.monotonic()
+            governor.wait_for_budget()
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class RecyclingScraper(BaseScraper):
+    def page_url(self, numero: int):
+        return f"https://jobs.example.com/search?page={numero}"
+
+
+class DriverRecyclingTests(unittest.TestCase):
+    def test_pagination_resumes_on_page_url_with_new_driver(self) -> None:
+        drivers = []
+
+        def new_driver(headless=None):
+            driver = Mock()
+            driver.visited = []
+            driver.get.side_effect = driver.visited.append
+            drivers.append(driver)
+            return driver
+
+        scraper = RecyclingScraper()
+        scraper.resource_governor = ResourceGovernor(max_pages=2)
+
+        def navigator(numero: int) -> bool:
+            scraper.driver.get(scraper.page_url(numero))
+            return True
+
+        def extractor():
+            visited = scraper.driver.visited
+            page = int(visited[-1].rsplit("=", 1)[1]) if visited else 1
+            return [{"url": f"u{page}"}] if page <= 5 else []
+
+        with patch("src.core.base.create_firefox_driver", side_effect=new_driver):
+            results = scraper.gather_paginated(extractor, navigator=navigator, page_wait=0)
+
+        self.assertEqual(len(drivers), 3)
+        self.assertTrue(drivers[0].quit.called and drivers[1].quit.called)
+        self.assertEqual(drivers[0].visited, ["https://jobs.example.com/search?page=2"])
+        # Tras reciclar se abre la URL de la página siguiente en el nuevo navegador
+        self.assertEqual(
+            drivers[1].visited,
+            ["https://jobs.example.com/search?page=3", "https://jobs.example.com/search?page=4"],
+        )
+        self.assertEqual(drivers[2].visited[0], "https://jobs.example.com/search?page=5")
+        self.assertEqual([r["url"] for r in results], ["u1", "u2", "u3", "u4", "u5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
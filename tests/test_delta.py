@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.delta import DeltaIndex, emit_delta, search_key
+
+
+def job(url, titulo, empresa="", fuente="Bumeran"):
+    return {"fuente": fuente, "titulo": titulo, "empresa": empresa, "url": url}
+
+
+class DeltaIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_first_run_reports_everything_as_added(self) -> None:
+        index = DeltaIndex(self.directory, "k")
+        events = index.diff([job("u1", "Analista"), job("u2", "Contador"), job("u1", "Analista")], run_id="r1")
+        self.assertEqual([(e["op"], e["url"]) for e in events], [("added", "u1"), ("added", "u2")])
+        self.assertEqual(events[0]["run"], "r1")
+
+    def test_reports_changes_and_removals_only(self) -> None:
+        index = DeltaIndex(self.directory, "k")
+        index.diff([job("u1", "Analista", "Acme"), job("u2", "Contador"), job("u3", "QA", fuente="Indeed")])
+
+        events = DeltaIndex(self.directory, "k").diff(
+            [job("u1", "Analista Sr", "Acme"), job("u4", "Data"), job("u3", "QA", fuente="Indeed")]
+        )
+        by_op = {e["op"]: e for e in events}
+        self.assertEqual(sorted(by_op), ["added", "changed", "removed"])
+        self.assertEqual(by_op["changed"]["titulo"], "Analista Sr")
+        self.assertEqual(by_op["changed"]["previous"]["titulo"], "Analista")
+        self.assertEqual(by_op["removed"]["url"], "u2")
+        self.assertEqual(by_op["added"]["url"], "u4")
+        # A third identical run produces no events
+        self.assertEqual(
+            index.diff([job("u1", "Analista Sr", "Acme"), job("u4", "Data"), job("u3", "QA", fuente="Indeed")]),
+            [],
+        )
+
+    def test_tracking_parameters_and_host_case_do_not_create_events(self) -> None:
+        index = DeltaIndex(self.directory, "k")
+        index.diff([job("https://pe.indeed.com/viewjob?jk=1a2b&from=serp", "QA", fuente="Indeed")])
+        events = index.diff([job("https://PE.indeed.com/viewjob?jk=1a2b&vjs=3", "QA", fuente="Indeed")])
+        self.assertEqual(events, [])
+
+    def test_same_offer_under_another_search_url_is_not_new(self) -> None:
+        base = "https://pe.computrabajo.com/trabajo-de-analista"
+        index = DeltaIndex(self.directory, "k")
+        index.diff([job(f"{base}#A1B2C3D4E5", "Analista", fuente="Computrabajo")])
+        events = index.diff([job(f"{base}?pubdate=3#A1B2C3D4E5", "Analista", fuente="Computrabajo")])
+        self.assertEqual(events, [])
+
+    def test_offers_of_a_silent_source_are_not_removed(self) -> None:
+        index = DeltaIndex(self.directory, "k")
+        index.diff([job("u1", "Analista"), job("i1", "QA", fuente="Indeed")])
+        events = index.diff([job("u1", "Analista")])
+        self.assertEqual(events, [])
+
+    def test_partial_results_of_a_blocked_source_are_not_removals(self) -> None:
+        index = DeltaIndex(self.directory, "k")
+        index.diff([job(f"u{i}", "Analista") for i in range(5)])
+        events = index.diff([job("u0", "Analista"), job("u9", "Data")], blocked=["bumeran"])
+        self.assertEqual([(e["op"], e["url"]) for e in events], [("added", "u9")])
+        # Once the source answers in full, the missing offers are removals
+        events = index.diff([job("u0", "Analista"), job("u9", "Data")])
+        self.assertEqual(sorted(e["url"] for e in events if e["op"] == "removed"), ["u1", "u2", "u3", "u4"])
+
+    def test_emit_delta_writes_jsonl_per_search(self) -> None:
+        self.assertNotEqual(search_key("Analista", 0, ["indeed"]), search_key("Analista", 1, ["indeed"]))
+        self.assertEqual(search_key("analista", 0, ["b", "a"]), search_key("Analista ", 0, ["a", "b"]))
+        path = emit_delta([job("u1", "Analista")], "Analista", 0, ["bumeran"], self.directory)
+        with open(path, encoding="utf-8") as handle:
+            lines = [json.loads(line) for line in handle]
+        self.assertEqual(lines[0]["op"], "added")
+        self.assertIsNone(emit_delta([job("u1", "Analista")], "Analista", 0, ["bumeran"], self.directory))
+        self.assertTrue(os.path.isdir(os.path.join(self.directory, "index")))
+
+
+if __name__ == "__main__":
+    unittest.main()
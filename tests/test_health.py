@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.core.extraction import ExtractionStats
+from src.health import HealthMonitor, search_key
+
+
+def run_stats(cards_per_page, empresa_branch: str = "h3.fs16", pages: int = 3):
+    stats = ExtractionStats()
+    records = []
+    for _ in range(pages):
+        stats.page(cards_per_page)
+        for i in range(cards_per_page):
+            filled = empresa_branch != "ninguno"
+            stats.branch("empresa", empresa_branch)
+            records.append({"titulo": f"Oferta {i}", "empresa": "ACME" if filled else ""})
+    return stats, records
+
+
+class HealthMonitorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "health.json")
+        self.alerts = os.path.join(self._tmp.name, "alerts.jsonl")
+        self.posted = []
+        self.monitor = HealthMonitor(
+            self.path,
+            alert_path=self.alerts,
+            webhook="https://hooks.example/salud",
+            poster=lambda url, payload: self.posted.append((url, payload)),
+        )
+        for _ in range(4):
+            self.monitor.check("Bumeran", "python", 1, *run_stats(20))
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_healthy_run_has_no_alerts(self) -> None:
+        report = self.monitor.check("Bumeran", "python", 1, *run_stats(19))
+        self.assertEqual(report.alerts, [])
+        self.assertGreater(report.score, 0.9)
+        self.assertFalse(os.path.exists(self.alerts))
+        self.assertEqual(self.posted, [])
+
+    def test_selector_fallback_and_missing_company_alert(self) -> None:
+        report = self.monitor.check("Bumeran", "python", 1, *run_stats(20, empresa_branch="ninguno"))
+        self.assertEqual(len(report.alerts), 2)
+        self.assertLess(report.score, 0.5)
+        with open(self.alerts, "r", encoding="utf-8") as handle:
+            lines = [json.loads(line) for line in handle]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["fuente"], "Bumeran")
+        self.assertEqual(self.posted[0][0], "https://hooks.example/salud")
+
+    def test_zero_offers_and_thin_pages_alert(self) -> None:
+        self.assertTrue(self.monitor.check("Bumeran", "python", 1, *run_stats(0)).alerts)
+        self.assertTrue(self.monitor.check("Bumeran", "python", 1, *run_stats(5)).alerts)
+
+    def test_alerting_runs_stay_out_of_the_baseline(self) -> None:
+        for _ in range(5):
+            self.monitor.check("Bumeran", "python", 1, *run_stats(20, empresa_branch="ninguno"))
+        report = self.monitor.check("Bumeran", "python", 1, *run_stats(20, empresa_branch="ninguno"))
+        self.assertTrue(report.alerts)
+
+    def test_history_persists_and_sources_are_independent(self) -> None:
+        self.monitor.save()
+        reloaded = HealthMonitor(self.path)
+        self.assertEqual(len(reloaded.history[search_key("Bumeran", "python", 1)]), 4)
+        report = reloaded.check("Indeed", "python", 1, *run_stats(0))
+        self.assertEqual(report.alerts, [])
+        self.assertEqual(report.baseline_runs, 0)
+
+    def test_new_niche_query_is_not_judged_on_volume(self) -> None:
+        report = self.monitor.check("Bumeran", "actuario senior", 1, *run_stats(0))
+        self.assertEqual(report.alerts, [])
+        self.assertEqual(report.baseline_runs, 4)
+
+    def test_new_query_still_alerts_on_selector_regressions(self) -> None:
+        report = self.monitor.check("Bumeran", "actuario", 1, *run_stats(3, empresa_branch="ninguno"))
+        self.assertEqual(len(report.alerts), 2)
+        self.assertFalse(any("tarjetas" in alert or "0 ofertas" in alert for alert in report.alerts))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,9 @@
+import os
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import unittest
 from unittest.mock import MagicMock
@@ -12,6 +17,7 @@ from tests.selenium_stub import ensure_selenium_stub
 ensure_selenium_stub()
 
 from src.indeed import IndeedScraper
+from src.indeed_links import LinkResolver
 
 
 class IndeedScraperTests(unittest.TestCase):
@@ -33,6 +39,13 @@ class IndeedScraperTests(unittest.TestCase):
         self.assertIn("fromage=1", called_url)
         self.assertTrue(called_url.startswith("https://pe.indeed.com/jobs?"))
 
+    def test_direct_entry_skips_the_landing_page(self) -> None:
+        self.scraper.abrir_pagina_empleos(dias=0)
+        self.driver.get.assert_not_called()
+        self.scraper.direct_entry = False
+        self.scraper.abrir_pagina_empleos(dias=0)
+        self.driver.get.assert_called_once_with("https://pe.indeed.com?r=pe")
+
     def test_navegar_a_pagina_sets_start_parameter(self) -> None:
         self.scraper.abrir_pagina_empleos(dias=0)
         self.scraper.buscar_vacante("Data")
@@ -57,6 +70,15 @@ class IndeedScraperTests(unittest.TestCase):
         self.assertFalse(result)
         self.driver.get.assert_called_once()
 
+    def test_page_url_is_deterministic_and_copied_to_shards(self) -> None:
+        self.assertIsNone(self.scraper.page_url(2))
+        self.scraper.abrir_pagina_empleos(dias=1)
+        self.scraper.buscar_vacante("Data")
+        shard = self.scraper.spawn_shard()
+        self.assertEqual(shard.page_url(4), self.scraper.page_url(4))
+        self.assertIn("start=30", shard.page_url(4))
+        self.assertIn("fromage=1", shard.page_url(4))
+
     def test_normalize_job_url_removes_duplicates(self) -> None:
         raw_url = "https://pe.indeed.com/viewjob?jk=abc123&from=serp&start=20"
         normalized = self.scraper._normalize_job_url(raw_url)
@@ -71,6 +93,82 @@ class IndeedScraperTests(unittest.TestCase):
         preserved = self.scraper._normalize_job_url(sponsor_url)
         self.assertEqual(preserved, "https://pe.indeed.com/pagead/clk?from=serp&ad=123")
 
+    def test_sponsored_links_resolve_once_through_the_link_cache(self) -> None:
+        locations = {
+            "https://pe.indeed.com/pagead/clk?ad=123&tk=a": "/rc/clk/dl?from=serp",
+            "https://pe.indeed.com/rc/clk/dl?from=serp": "https://pe.indeed.com/viewjob?jk=0f1e2d3c4b5a6978&from=serp",
+        }
+        probed = []
+
+        def probe(url):
+            probed.append(url)
+            return locations.get(url)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "links.json")
+            self.scraper.link_resolver = LinkResolver(path, probe=probe)
+            records = [{"url": self.scraper._normalize_job_url("https://pe.indeed.com/pagead/clk?ad=123&tk=a")}]
+            first = self.scraper._resolve_tracking_links(records)[0]["url"]
+            # Otra impresión del mismo anuncio (tk distinto) sale de la caché
+            locations["https://pe.indeed.com/pagead/clk?ad=123&tk=b"] = None
+            records = [{"url": "https://pe.indeed.com/pagead/clk?ad=123&tk=b"}]
+            second = self.scraper._resolve_tracking_links(records)[0]["url"]
+            self.scraper.link_resolver.save()
+            reloaded = LinkResolver(path, probe=None)
+
+        self.assertEqual(first, "https://pe.indeed.com/viewjob?jk=0f1e2d3c4b5a6978")
+        self.assertEqual(second, first)
+        self.assertEqual(len(probed), 2)
+        self.assertEqual(reloaded.resolve("https://pe.indeed.com/pagead/clk?tk=z&ad=123"), "0f1e2d3c4b5a6978")
+
+    def test_failed_resolution_is_not_retried_immediately(self) -> None:
+        calls = []
+        resolver = LinkResolver(probe=lambda url: calls.append(url))
+        self.assertIsNone(resolver.resolve("https://pe.indeed.com/pagead/clk?ad=9"))
+        self.assertIsNone(resolver.resolve("https://pe.indeed.com/pagead/clk?ad=9&tk=x"))
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_impressions_of_one_link_are_probed_once(self) -> None:
+        calls = []
+        release = threading.Event()
+
+        def probe(url):
+            calls.append(url)
+            release.wait(5)
+            return "https://pe.indeed.com/viewjob?jk=abc123" if url.endswith("tk=a") else None
+
+        resolver = LinkResolver(probe=probe)
+        urls = ["https://pe.indeed.com/pagead/clk?ad=5&tk=a", "https://pe.indeed.com/pagead/clk?ad=5&tk=b"]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(resolver.resolve, urls[0])
+            while not calls:
+                time.sleep(0.01)
+            second = pool.submit(resolver.resolve, urls[1])
+            time.sleep(0.05)
+            release.set()
+        self.assertEqual((first.result(), second.result()), ("abc123", "abc123"))
+        self.assertEqual(len(calls), 1)
+
+    def test_extraction_resolves_tracking_links_after_the_page(self) -> None:
+        resolver = MagicMock()
+        resolver.resolve_many.return_value = {"https://pe.indeed.com/pagead/clk?ad=7": "777"}
+        self.scraper.link_resolver = resolver
+        records = self.scraper._resolve_tracking_links(
+            [
+                {"url": "https://pe.indeed.com/pagead/clk?ad=7"},
+                {"url": "https://pe.indeed.com/pagead/clk?ad=7"},
+                {"url": "https://pe.indeed.com/viewjob?jk=1"},
+            ]
+        )
+        resolver.resolve_many.assert_called_once_with(
+            ["https://pe.indeed.com/pagead/clk?ad=7", "https://pe.indeed.com/pagead/clk?ad=7"]
+        )
+        self.assertEqual([record["url"] for record in records], [
+            "https://pe.indeed.com/viewjob?jk=777",
+            "https://pe.indeed.com/viewjob?jk=777",
+            "https://pe.indeed.com/viewjob?jk=1",
+        ])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
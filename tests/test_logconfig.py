@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.logconfig import (
+    JsonFormatter,
+    SamplingFilter,
+    current_context,
+    in_current_context,
+    log_context,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+def _record(msg: str, level: int = logging.DEBUG, *args) -> logging.LogRecord:
+    return logging.LogRecord("src.pipeline", level, __file__, 1, msg, args, None)
+
+
+class LogContextTests(unittest.TestCase):
+    def test_nested_context_is_restored(self) -> None:
+        with log_context(fuente="bumeran"):
+            with log_context(page=2):
+                self.assertEqual(current_context()["page"], 2)
+                self.assertEqual(current_context()["fuente"], "bumeran")
+            self.assertNotIn("page", current_context())
+        self.assertNotIn("fuente", current_context())
+
+    def test_worker_threads_inherit_the_context(self) -> None:
+        seen = {}
+
+        def worker() -> None:
+            seen["plain"] = current_context().get("busqueda")
+
+        def wrapped_worker() -> None:
+            seen["wrapped"] = current_context().get("busqueda")
+
+        with log_context(busqueda="analista"):
+            threads = [threading.Thread(target=worker), threading.Thread(target=in_current_context(wrapped_worker))]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        self.assertIsNone(seen["plain"])
+        self.assertEqual(seen["wrapped"], "analista")
+
+
+class SamplingFilterTests(unittest.TestCase):
+    def test_keeps_one_of_every_n_debug_records_per_message(self) -> None:
+        sampler = SamplingFilter(5)
+        kept = [sampler.filter(_record("Oferta duplicada descartada: %s", logging.DEBUG, i)) for i in range(12)]
+        self.assertEqual(sum(kept), 3)
+        self.assertTrue(kept[0])
+        self.assertTrue(sampler.filter(_record("Otro mensaje")))
+        self.assertTrue(all(sampler.filter(_record("Página cargada", logging.INFO)) for _ in range(5)))
+
+
+class JsonFormatterTests(unittest.TestCase):
+    def test_context_fields_are_top_level(self) -> None:
+        record = _record("Página %d cargada", logging.INFO, 3)
+        record.context = {"run": "r1", "fuente": "indeed", "page": 3}
+        payload = json.loads(JsonFormatter().format(record))
+        self.assertEqual(payload["msg"], "Página 3 cargada")
+        self.assertEqual(payload["level"], "info")
+        self.assertEqual(payload["fuente"], "indeed")
+        self.assertEqual(payload["run"], "r1")
+
+
+class SetupLoggingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        root = logging.getLogger()
+        self._handlers = list(root.handlers)
+        self._level = root.level
+
+    def tearDown(self) -> None:
+        shutdown_logging()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in self._handlers:
+            root.addHandler(handler)
+        root.setLevel(self._level)
+
+    def test_json_lines_are_written_by_the_background_listener(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "run.log")
+            setup_logging(logging.DEBUG, log_format="json", log_file=path, run="r42")
+            logger = logging.getLogger("src.test")
+            with log_context(fuente="computrabajo", page=4):
+                logger.info("Página %d cargada", 4)
+                try:
+                    raise ValueError("boom")
+                except ValueError:
+                    logger.exception("Fallo")
+            shutdown_logging()
+            with open(path, encoding="utf-8") as handle:
+                lines = [json.loads(line) for line in handle]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["msg"], "Página 4 cargada")
+        self.assertEqual(lines[0]["run"], "r42")
+        self.assertEqual(lines[0]["fuente"], "computrabajo")
+        self.assertEqual(lines[0]["page"], 4)
+        self.assertIn("ValueError: boom", lines[1]["exc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -82,6 +82,48 @@ class MainModuleTests(unittest.TestCase):
             params = main.prompt_interactive()
         self.assertIsNone(params)
 
+    def test_parse_modes_expands_all_and_rejects_unknown(self) -> None:
+        self.assertEqual(main.parse_modes(["indeed=network"]), {"indeed": "network"})
+        self.assertEqual(
+            main.parse_modes(["all=network", "bumeran=dom"]),
+            {"bumeran": "dom", "computrabajo": "network", "indeed": "network"},
+        )
+        with self.assertRaises(SystemExit):
+            main.parse_modes(["indeed=magic"])
+
+    def test_parse_source_limits(self) -> None:
+        self.assertEqual(main.parse_source_limits(["Indeed=1", "bumeran=2"]), {"indeed": 1, "bumeran": 2})
+        with self.assertRaises(SystemExit):
+            main.parse_source_limits(["indeed=0"])
+
+    def test_profile_template_is_rejected_with_grid_and_noted_for_network_sources(self) -> None:
+        params = main.RunParameters(
+            busqueda="Analista",
+            dias=0,
+            initial_wait=0,
+            page_wait=0,
+            sources=["bumeran", "indeed"],
+            grid_urls=["http://grid:4444"],
+            modes={"indeed": "network"},
+            profile_template="perfil",
+        )
+        with self.assertRaises(SystemExit):
+            main.resolve_browser_backend(params)
+
+        params.grid_urls = []
+        with patch.dict("os.environ", {"SCRAPER_GRID_URL": ""}), patch.object(
+            main, "ProfileTemplate"
+        ) as template, self.assertLogs("main", level="WARNING") as logs:
+            backend = main.resolve_browser_backend(params)
+        self.assertIsInstance(backend, main.LocalFirefoxBackend)
+        self.assertIs(backend.profile_template, template.return_value.prepare.return_value)
+        self.assertIn("indeed", logs.output[0])
+
+    def test_resolve_min_relevance(self) -> None:
+        self.assertIsNone(main.resolve_min_relevance(argparse.Namespace(rank=False, min_relevance=None)))
+        self.assertEqual(main.resolve_min_relevance(argparse.Namespace(rank=True, min_relevance=None)), 0.0)
+        self.assertEqual(main.resolve_min_relevance(argparse.Namespace(rank=False, min_relevance=1.5)), 1.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,12 @@
 import sys
+import threading
+import time
 from pathlib import Path
 import unittest
 from unittest.mock import Mock, patch
 from tests.selenium_stub import ensure_selenium_stub
 from src import pipeline
+from src.companies import CompanyIndex
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -214,6 +217,134 @@ class PipelineTests(unittest.TestCase):
             "Total ofertas combinadas tras deduplicación: %d", 0
         )
 
+    def test_collect_jobs_respects_backend_capacity(self) -> None:
+        backend = Mock()
+        backend.capacity = 1
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+        received_backends = []
+
+        def factory(headless=None, backend=None):
+            received_backends.append(backend)
+            return Mock()
+
+        def collector(scraper, busqueda, dias, initial_wait, page_wait):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+                state["calls"] = state.get("calls", 0) + 1
+                url = f"https://jobs.com/{state['calls']}"
+            return [{"fuente": "Fake", "url": url, "titulo": "Role"}]
+
+        with patch.dict(
+            "src.pipeline.SCRAPER_REGISTRY",
+            {"one": (factory, collector, False), "two": (factory, collector, False)},
+            clear=True,
+        ):
+            combined, executed = pipeline.collect_jobs(
+                busqueda="Analista",
+                dias=0,
+                initial_wait=0,
+                page_wait=0,
+                sources=["one", "two"],
+                backend=backend,
+            )
+
+        self.assertEqual(sorted(executed), ["one", "two"])
+        self.assertEqual(len(combined), 2)
+        self.assertEqual(state["peak"], 1)
+        self.assertEqual(received_backends, [backend, backend])
+
+    def test_collect_jobs_network_mode_uses_chromium_backend(self) -> None:
+        scrapers = {}
+
+        def factory_for(name):
+            def factory(headless=None, backend=None):
+                scraper = Mock()
+                scraper.backend_used = backend
+                scrapers[name] = scraper
+                return scraper
+            return factory
+
+        def collector(scraper, busqueda, dias, initial_wait, page_wait):
+            return []
+
+        with patch.dict(
+            "src.pipeline.SCRAPER_REGISTRY",
+            {"dom": (factory_for("dom"), collector, False), "net": (factory_for("net"), collector, False)},
+            clear=True,
+        ), patch("src.pipeline.LocalChromiumBackend") as chromium_cls:
+            pipeline.collect_jobs(
+                busqueda="Analista",
+                dias=0,
+                initial_wait=0,
+                page_wait=0,
+                sources=["dom", "net"],
+                modes={"net": "network"},
+            )
+
+        chromium_cls.assert_called_once_with(capacity=2)
+        self.assertIs(scrapers["net"].backend_used, chromium_cls.return_value)
+        self.assertEqual(scrapers["net"].extraction_mode, "network")
+        self.assertIsNone(scrapers["dom"].backend_used)
+
+    def test_network_mode_with_grid_backend_is_logged(self) -> None:
+        grid = Mock(capacity=1)
+        with patch("src.pipeline.LocalChromiumBackend") as chromium_cls, self.assertLogs(
+            "src.pipeline", level="WARNING"
+        ) as logs:
+            network_backend = pipeline._network_backend({"net": "network", "dom": "dom"}, grid, 1)
+
+        chromium_cls.assert_called_once_with(capacity=1)
+        self.assertIs(network_backend, chromium_cls.return_value)
+        self.assertIn("Chromium local", logs.output[0])
+        self.assertIsNone(pipeline._network_backend({"dom": "dom"}, grid, 1))
+
+    def test_collect_jobs_applies_company_index(self) -> None:
+        def factory(headless=None):
+            return Mock()
+
+        def collector(scraper, busqueda, dias, initial_wait, page_wait):
+            return [
+                {"fuente": "Fake", "url": "https://jobs.com/1", "empresa": "FINANCIERA ADES"},
+                {"fuente": "Fake", "url": "https://jobs.com/2", "empresa": "Financiera Ades S.A.C."},
+            ]
+
+        index = CompanyIndex()
+        index.add_alias("Financiera Ades", "Financiera ADES")
+        with patch.dict("src.pipeline.SCRAPER_REGISTRY", {"fake": (factory, collector, False)}, clear=True):
+            combined, _ = pipeline.collect_jobs(
+                busqueda="Analista", dias=0, initial_wait=0, page_wait=0, sources=["fake"], context=pipeline.RunContext(company_index=index)
+            )
+
+        self.assertEqual([job["empresa"] for job in combined], ["Financiera ADES", "Financiera ADES"])
+        self.assertEqual({job["empresa_id"] for job in combined}, {"financiera ades"})
+
+    def test_merge_source_results_dedupes_by_offer_id(self) -> None:
+        base = "https://pe.computrabajo.com/trabajo-de-analista"
+        combined, executed = pipeline.merge_source_results(
+            [
+                ("computrabajo", [
+                    {"fuente": "Computrabajo", "url": f"{base}#A1B2C3D4E5"},
+                    {"fuente": "Computrabajo", "url": f"{base}?pubdate=3#A1B2C3D4E5"},
+                    {"fuente": "Computrabajo", "url": f"{base}#F6E5D4C3B2"},
+                ]),
+                ("indeed", [
+                    {"fuente": "Indeed", "url": "https://pe.indeed.com/viewjob?jk=1a2b"},
+                    {"fuente": "Indeed", "url": "https://pe.indeed.com/viewjob?jk=1a2b"},
+                ]),
+                ("bumeran", [{"fuente": "Bumeran", "url": "https://www.bumeran.com.pe/empleos/1.html"}]),
+            ]
+        )
+        self.assertEqual(len(combined), 4)
+        self.assertEqual(executed, ["computrabajo", "indeed", "bumeran"])
+        self.assertEqual(pipeline.record_key(combined[0]), "computrabajo:A1B2C3D4E5")
+        self.assertEqual(pipeline.record_key(combined[2]), "https://pe.indeed.com/viewjob?jk=1a2b")
+        self.assertEqual(pipeline.record_key(combined[3]), "https://www.bumeran.com.pe/empleos/1.html")
+
 
 if __name__ == "__main__":
     unittest.main()
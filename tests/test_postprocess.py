@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.postprocess import canonicalize_urls, merge_history, normalize_text, postprocess_records, record_key
+
+
+class PostprocessTests(unittest.TestCase):
+    def test_normalize_text(self) -> None:
+        self.assertEqual(normalize_text(pd.Series(["  Ánálisis   DE Datos "])).tolist(), ["analisis de datos"])
+        self.assertEqual(normalize_text(pd.Series([None, "Ñandú"])).tolist(), ["", "nandu"])
+
+    def test_canonicalize_urls_keeps_fragments_and_drops_tracking(self) -> None:
+        urls = pd.Series(
+            [
+                "http://WWW.Bumeran.com.pe/empleos/x.html?utm_source=a&page=2",
+                "https://pe.computrabajo.com/trabajo-de-x?p=2&utm_medium=b#ABC123",
+                "https://pe.indeed.com/viewjob?jk=1&from=serp",
+                "https://pe.indeed.com/viewjob?jk=2&xfrom=1",
+                "relative/path",
+            ]
+        )
+        self.assertEqual(
+            canonicalize_urls(urls).tolist(),
+            [
+                "https://www.bumeran.com.pe/empleos/x.html?page=2",
+                "https://pe.computrabajo.com/trabajo-de-x?p=2#ABC123",
+                "https://pe.indeed.com/viewjob?jk=1",
+                "https://pe.indeed.com/viewjob?jk=2&xfrom=1",
+                "relative/path",
+            ],
+        )
+
+    def test_postprocess_records_maps_aliases_and_deduplicates(self) -> None:
+        records = [
+            {"fuente": "Bumeran", "empresa": "ACME  s.a.c.", "titulo": " Analista ", "url": "https://x.com/a"},
+            {"fuente": "Indeed", "empresa": "Otra", "titulo": "Dup", "url": "http://X.com/a?utm_source=z"},
+            {"fuente": "Indeed", "empresa": "Beta", "titulo": "QA", "url": "https://x.com/b"},
+            {"fuente": "Indeed", "empresa": "Sin URL", "titulo": "QA", "url": ""},
+        ]
+        result = postprocess_records(records, {"Acme S.A.C.": "Acme SAC"})
+        self.assertEqual([r["url"] for r in result], ["https://x.com/a", "https://x.com/b"])
+        self.assertEqual(result[0]["empresa"], "Acme SAC")
+        self.assertEqual(result[0]["empresa_normalizada"], "acme sac")
+        self.assertEqual(result[0]["titulo"], "Analista")
+        self.assertEqual(list(result[0])[:4], ["fuente", "empresa", "titulo", "url"])
+        self.assertEqual(postprocess_records([]), [])
+
+    def test_bumeran_dom_and_api_urls_share_the_aviso_key(self) -> None:
+        dom = {"fuente": "Bumeran", "url": "https://www.bumeran.com.pe/empleos/analista-de-datos-sr.-lima-1116342345.html?indexAviso=0"}
+        api = {"fuente": "Bumeran", "url": "https://www.bumeran.com.pe/empleos/analista-de-datos-sr-1116342345.html"}
+        self.assertEqual(record_key(dom), "bumeran:1116342345")
+        self.assertEqual(record_key(api), record_key(dom))
+        listing = "https://www.bumeran.com.pe/empleos-busqueda.html"
+        self.assertEqual(record_key({"fuente": "Bumeran", "url": listing}), listing)
+        self.assertEqual(len(postprocess_records([{**dom, "titulo": "Analista"}, {**api, "titulo": "Analista"}])), 1)
+
+    def test_merge_history_prefers_newest_file(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            old = os.path.join(directory, "old.json")
+            new = os.path.join(directory, "new.json")
+            with open(old, "w", encoding="utf-8") as handle:
+                json.dump([{"fuente": "B", "empresa": "A", "titulo": "Viejo", "url": "https://x.com/1"}], handle)
+            with open(new, "w", encoding="utf-8") as handle:
+                json.dump(
+                    [
+                        {"fuente": "B", "empresa": "A", "titulo": "Nuevo", "url": "https://x.com/1"},
+                        {"fuente": "B", "empresa": "A", "titulo": "Otro", "url": "https://x.com/2"},
+                    ],
+                    handle,
+                )
+            os.utime(old, (1, 1))
+            merged = merge_history(directory)
+        self.assertEqual(merged["titulo"].tolist(), ["Nuevo", "Otro"])
+        self.assertEqual(merged["archivo"].tolist(), ["new.json", "new.json"])
+
+    def test_merge_history_dedupes_an_offer_found_by_two_searches(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            for name, url in (
+                ("computrabajo_analista_2024-05-01.json", "https://pe.computrabajo.com/trabajo-de-analista#A1B2C3D4E5"),
+                ("computrabajo_datos_2024-05-01.json", "https://pe.computrabajo.com/trabajo-de-datos?pubdate=3#A1B2C3D4E5"),
+            ):
+                with open(os.path.join(directory, name), "w", encoding="utf-8") as handle:
+                    json.dump([{"fuente": "Computrabajo", "empresa": "A", "titulo": "Analista de datos", "url": url}], handle)
+            merged = merge_history(directory)
+        self.assertEqual(len(merged), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
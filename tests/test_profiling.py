@@ -0,0 +1,71 @@
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+import unittest
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src import profiling
+from src.profiling import RunProfiler
+
+
+def _busy_extract(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+class RunProfilerTests(unittest.TestCase):
+    def test_sampler_reports_hot_function_per_thread(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = RunProfiler(tmp, mode="sample", interval=0.002).start()
+
+            def task(label: str) -> None:
+                with profiler.profile(label):
+                    _busy_extract(0.15)
+
+            threads = [threading.Thread(target=task, args=(label,)) for label in ("bumeran_analista_d0", "indeed_analista_d0")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            reports = profiler.stop()
+            self.assertEqual(set(reports), {"bumeran_analista_d0", "indeed_analista_d0"})
+            with open(reports["indeed_analista_d0"], encoding="utf-8") as handle:
+                report = handle.read()
+            self.assertIn("_busy_extract", report)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "indeed_analista_d0.folded")))
+
+    def test_cprofile_writes_stats_per_task(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = RunProfiler(tmp, mode="cprofile").start()
+            with profiler.profile("computrabajo/analista"):
+                _busy_extract(0.02)
+            reports = profiler.stop()
+            self.assertIn("computrabajo/analista", reports)
+            stats = pstats.Stats(os.path.join(tmp, "computrabajo_analista.prof"))
+            self.assertTrue(any(name == "_busy_extract" for _, _, name in stats.stats))
+
+    def test_cprofile_falls_back_to_sampling_for_concurrent_tasks_on_312(self) -> None:
+        with patch.object(profiling, "SINGLE_CPROFILE", True):
+            self.assertEqual(RunProfiler("unused", mode="cprofile", concurrent=True).mode, "sample")
+            self.assertEqual(RunProfiler("unused", mode="cprofile").mode, "cprofile")
+        with patch.object(profiling, "SINGLE_CPROFILE", False):
+            self.assertEqual(RunProfiler("unused", mode="cprofile", concurrent=True).mode, "cprofile")
+
+    def test_unknown_mode_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            RunProfiler("unused", mode="perf")
+
+
+if __name__ == "__main__":
+    unittest.main()
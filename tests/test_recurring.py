@@ -0,0 +1,115 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.recurring import DAY, HOUR, RecurringSchedule
+from src.scheduler import SearchResult, SearchSpec
+
+HOT = SearchSpec("analista", 0, ("bumeran",))
+QUIET = SearchSpec("astronauta", 0, ("bumeran",))
+RECENT = SearchSpec("vendedor", 1, ("bumeran",))
+
+
+class FakeBatch:
+    """Returns ``new_per_run`` fresh offers per call for each search, plus the old ones."""
+
+    def __init__(self, new_per_run):
+        self.new_per_run = new_per_run
+        self.calls = []
+        self.seen = {}
+
+    def __call__(self, specs, max_workers, source_limits=None, **options):
+        self.calls.append([spec.busqueda for spec in specs])
+        results = []
+        for spec in specs:
+            offers = self.seen.setdefault(spec, [])
+            start = len(offers)
+            offers.extend(
+                {"fuente": "Bumeran", "titulo": spec.busqueda, "url": f"https://x/{spec.busqueda}/{i}"}
+                for i in range(start, start + self.new_per_run[spec.busqueda])
+            )
+            results.append(SearchResult(spec, list(offers), ["bumeran"]))
+        return results
+
+
+class RecurringScheduleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "schedule.json")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _run(self, schedule, runner, now):
+        return schedule.run_due(max_workers=2, now=now, runner=runner)
+
+    def test_hot_searches_are_refreshed_more_often_than_quiet_ones(self) -> None:
+        schedule = RecurringSchedule(self.path, min_interval=HOUR, max_interval=2 * DAY, target_new=10)
+        schedule.sync([HOT, QUIET])
+        runner = FakeBatch({"analista": 12, "astronauta": 0})
+        now = 0.0
+        runs = {"analista": 0, "astronauta": 0}
+        while now < 2 * DAY:
+            for state in self._run(schedule, runner, now):
+                runs[state.busqueda] += 1
+            now += HOUR
+        self.assertGreater(runs["analista"], 3 * runs["astronauta"])
+        states = {state.busqueda: state for state in schedule.searches.values()}
+        self.assertGreater(states["astronauta"].interval, 12 * HOUR)
+        self.assertLess(states["analista"].interval, 2 * DAY)
+
+    def test_interval_stays_within_the_dias_window(self) -> None:
+        schedule = RecurringSchedule(self.path, min_interval=HOUR, max_interval=2 * DAY)
+        schedule.sync([RECENT])
+        runner = FakeBatch({"vendedor": 0})
+        for hour in range(0, 96):
+            self._run(schedule, runner, hour * HOUR)
+        (state,) = schedule.searches.values()
+        self.assertLessEqual(state.interval, DAY / 2)
+
+    def test_state_is_persisted_and_sync_drops_removed_searches(self) -> None:
+        schedule = RecurringSchedule(self.path)
+        schedule.sync([HOT, QUIET])
+        self._run(schedule, FakeBatch({"analista": 5, "astronauta": 5}), 0.0)
+        reloaded = RecurringSchedule(self.path)
+        self.assertEqual(len(reloaded), 2)
+        self.assertTrue(all(state.runs == 1 for state in reloaded.searches.values()))
+        reloaded.sync([HOT])
+        self.assertEqual([state.busqueda for state in reloaded.searches.values()], ["analista"])
+        self.assertEqual(next(iter(reloaded.searches.values())).runs, 1)
+
+    def test_nothing_runs_before_it_is_due(self) -> None:
+        schedule = RecurringSchedule(self.path, min_interval=HOUR)
+        schedule.sync([HOT])
+        runner = FakeBatch({"analista": 1})
+        self._run(schedule, runner, 0.0)
+        self.assertEqual(self._run(schedule, runner, HOUR / 2), [])
+        self.assertEqual(len(runner.calls), 1)
+
+
+    def test_blocked_runs_do_not_count_towards_the_yield(self) -> None:
+        schedule = RecurringSchedule(self.path, min_interval=HOUR)
+        schedule.sync([HOT])
+
+        def blocked_batch(specs, max_workers, source_limits=None, **options):
+            partial = [{"fuente": "Bumeran", "url": "https://x/1"}]
+            return [SearchResult(spec, partial, ["bumeran"], ["bumeran"]) for spec in specs]
+
+        self._run(schedule, blocked_batch, 0.0)
+        (state,) = schedule.searches.values()
+        self.assertEqual(state.runs, 0)
+        self.assertEqual(state.next_due, HOUR)
+
+
+if __name__ == "__main__":
+    unittest.main()
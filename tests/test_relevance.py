@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.relevance import RelevanceScorer, rank_records, title_terms
+
+
+TITLES = [
+    "Vendedor de tienda",
+    "Analista de Datos",
+    "Analistas de Créditos",
+    "Asistente administrativo",
+    "Analista Contable Senior",
+    "Vendedor de tienda",
+]
+
+
+def _records(titles):
+    return [{"fuente": "Bumeran", "titulo": t, "url": f"https://example.com/{i}"} for i, t in enumerate(titles)]
+
+
+class TitleTermsTests(unittest.TestCase):
+    def test_terms_are_folded_and_skip_stopwords(self) -> None:
+        terms = title_terms("Analista de Logística", ngram=0)
+        self.assertEqual(terms, ["analista", "logistica"])
+
+    def test_char_ngrams_share_terms_across_plurals(self) -> None:
+        singular = set(title_terms("analista"))
+        plural = set(title_terms("analistas"))
+        self.assertIn("~#an", singular & plural)
+
+
+class RelevanceScorerTests(unittest.TestCase):
+    def test_matching_titles_score_above_unrelated_ones(self) -> None:
+        scores = RelevanceScorer().score("analista de datos", TITLES)
+        self.assertEqual(scores.argmax(), 1)
+        self.assertEqual(scores[0], 0.0)
+        self.assertLess(scores[3], scores[2])
+        self.assertGreater(scores[2], 0.0)
+        self.assertTrue(((scores >= 0) & (scores <= 1)).all())
+
+    def test_repeated_titles_get_the_same_score(self) -> None:
+        scores = RelevanceScorer().score("vendedor", TITLES)
+        self.assertEqual(scores[0], scores[5])
+        self.assertGreater(scores[0], 0.0)
+
+    def test_unknown_keyword_scores_zero(self) -> None:
+        scores = RelevanceScorer().score("zzzz", TITLES)
+        self.assertFalse(scores.any())
+
+    def test_save_and_load_round_trip(self) -> None:
+        scorer = RelevanceScorer().fit(TITLES)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vocab.json")
+            scorer.save(path)
+            loaded = RelevanceScorer.load(path)
+        self.assertEqual(loaded.vocabulary, scorer.vocabulary)
+        query = "analista contable"
+        self.assertEqual(loaded.score(query, TITLES).tolist(), scorer.score(query, TITLES).tolist())
+
+
+class RankRecordsTests(unittest.TestCase):
+    def test_records_are_sorted_best_first_with_score(self) -> None:
+        ranked = rank_records(_records(TITLES), "analista")
+        self.assertEqual(len(ranked), len(TITLES))
+        scores = [record["relevancia"] for record in ranked]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertTrue(ranked[0]["titulo"].startswith("Analista"))
+        # A igual puntaje se mantiene el orden original
+        tail = [record["url"] for record in ranked if record["relevancia"] == 0]
+        self.assertEqual(tail, sorted(tail))
+
+    def test_threshold_drops_unrelated_titles(self) -> None:
+        ranked = rank_records(_records(TITLES), "analista", threshold=0.5)
+        self.assertTrue(ranked)
+        self.assertTrue(all("nalista" in record["titulo"] for record in ranked))
+
+    def test_prefit_scorer_is_reused(self) -> None:
+        scorer = RelevanceScorer().fit(TITLES + ["Operario de almacén"])
+        ranked = rank_records(_records(["Operario de almacén", "Vendedor"]), "operario almacen", scorer=scorer)
+        self.assertEqual(ranked[0]["titulo"], "Operario de almacén")
+        self.assertEqual(ranked[0]["relevancia"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
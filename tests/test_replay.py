@@ -0,0 +1,180 @@
+import gzip
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.core.base import BaseScraper
+from src.core.cache import PageCache
+from src.core.htmldom import HtmlDriver
+from src.replay import (
+    Snapshot,
+    SnapshotArchive,
+    extract_snapshot,
+    iter_archive,
+    iter_cached_pages,
+    replay,
+    source_for_url,
+)
+
+COMPUTRABAJO_URL = "https://pe.computrabajo.com/trabajo-de-analista?pubdate=1"
+COMPUTRABAJO_HTML = """
+<html><body><main><div id="offersGridOfferContainer">
+  <article class="box_offer">
+    <h2><a class="js-o-link fc_base" href="/ofertas-de-trabajo/oferta-de-trabajo-de-analista-ABC12345DEF">
+      Analista de datos</a></h2>
+    <p><a class="fc_base" href="/empresa">Acme SAC</a></p>
+  </article>
+  <article class="box_offer">
+    <h2><a class="js-o-link fc_base" href="/ofertas-de-trabajo/oferta-de-trabajo-de-analista-XYZ98765QRS">
+      Analista contable</a></h2>
+    <p><span class="fs13 fc_aux tx_ellipsis">Beta Corp</span></p>
+  </article>
+</div></main></body></html>
+"""
+
+BUMERAN_URL = "https://www.bumeran.com.pe/empleos-busqueda-analista.html?page=2"
+BUMERAN_HTML = """
+<html><body><div id="listado-avisos">
+  <a href="/empleos/analista-de-riesgos-1111.html"><div><h2>Analista de riesgos</h2></div></a>
+  <a href="/empleos/analista-comercial-2222.html"><div><h2>Analista comercial</h2></div></a>
+  <a href="/empleos-busqueda-analista.html?recientes=true">Recientes</a>
+</div></body></html>
+"""
+
+INDEED_URL = "https://pe.indeed.com/jobs?q=analista&start=10"
+INDEED_HTML = """
+<html><body><ul class="jobsearch-ResultsList">
+  <li><div class="job_seen_beacon">
+    <h2><a data-jk="abc123" href="/rc/clk?jk=abc123&amp;from=serp"><span title="Analista BI">Analista BI</span></a></h2>
+    <span class="companyName">Gamma SA</span>
+  </div></li>
+  <li><div class="job_seen_beacon">
+    <h2><a data-jk="def456" href="/rc/clk?jk=def456"><span title="Analista QA">Analista QA</span></a></h2>
+    <span data-testid="company-name">Delta SRL</span>
+  </div></li>
+</ul></body></html>
+"""
+
+
+class HtmlDriverTests(unittest.TestCase):
+    def test_css_selectors_and_text(self) -> None:
+        driver = HtmlDriver(COMPUTRABAJO_HTML, COMPUTRABAJO_URL)
+        container = driver.find_element("id", "offersGridOfferContainer")
+        anchors = container.find_elements("css selector", "article a.js-o-link.fc_base")
+        self.assertEqual(len(anchors), 2)
+        self.assertEqual(anchors[0].text, "Analista de datos")
+        self.assertTrue(anchors[0].get_attribute("href").startswith("https://pe.computrabajo.com/ofertas-de-trabajo/"))
+        card = anchors[1].find_element("xpath", "ancestor::article[1]")
+        self.assertEqual(card.find_elements("css selector", "span[class*='fc_aux']")[0].text, "Beta Corp")
+
+    def test_missing_element_raises(self) -> None:
+        driver = HtmlDriver("<html><body></body></html>", "https://example.com")
+        with self.assertRaises(Exception):
+            driver.find_element("id", "missing")
+        self.assertEqual(driver.find_elements("css selector", "div > a"), [])
+
+
+class ReplayTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _archive_fixtures(self) -> SnapshotArchive:
+        archive = SnapshotArchive(self.root, run_id="run-1")
+        archive.capture("computrabajo", 1, COMPUTRABAJO_URL, COMPUTRABAJO_HTML)
+        archive.capture("bumeran", 2, BUMERAN_URL, BUMERAN_HTML)
+        archive.capture("indeed", 2, INDEED_URL, INDEED_HTML)
+        return archive
+
+    def test_capture_writes_compressed_page_and_manifest(self) -> None:
+        archive = self._archive_fixtures()
+        snapshots = list(iter_archive(self.root))
+        self.assertEqual([s.source for s in snapshots], ["computrabajo", "bumeran", "indeed"])
+        self.assertTrue(snapshots[0].path.startswith(archive.directory))
+        with gzip.open(snapshots[1].path, "rt", encoding="utf-8") as handle:
+            self.assertIn("listado-avisos", handle.read())
+        # Also works when pointed at a single run directory
+        self.assertEqual(len(list(iter_archive(archive.directory))), 3)
+
+    def test_replay_extracts_every_source_without_browser(self) -> None:
+        self._archive_fixtures()
+        records = replay(iter_archive(self.root), workers=1)
+        by_source = {}
+        for record in records:
+            by_source.setdefault(record["fuente"], []).append(record)
+
+        self.assertEqual(
+            [r["titulo"] for r in by_source["Computrabajo"]], ["Analista de datos", "Analista contable"]
+        )
+        self.assertEqual(by_source["Computrabajo"][0]["empresa"], "Acme SAC")
+        self.assertTrue(by_source["Computrabajo"][0]["url"].endswith("#ABC12345DEF"))
+        self.assertEqual(
+            [r["url"] for r in by_source["Bumeran"]],
+            [
+                "https://www.bumeran.com.pe/empleos/analista-de-riesgos-1111.html",
+                "https://www.bumeran.com.pe/empleos/analista-comercial-2222.html",
+            ],
+        )
+        self.assertEqual(
+            by_source["Indeed"],
+            [
+                {"fuente": "Indeed", "titulo": "Analista BI", "url": "https://pe.indeed.com/viewjob?jk=abc123", "empresa": "Gamma SA"},
+                {"fuente": "Indeed", "titulo": "Analista QA", "url": "https://pe.indeed.com/viewjob?jk=def456", "empresa": "Delta SRL"},
+            ],
+        )
+
+    def test_parallel_replay_matches_sequential(self) -> None:
+        self._archive_fixtures()
+        snapshots = list(iter_archive(self.root)) * 2
+        self.assertEqual(replay(snapshots, workers=2, chunksize=1), replay(snapshots, workers=1))
+
+    def test_replay_reads_html_kept_in_page_cache(self) -> None:
+        cache_dir = os.path.join(self.root, "cache")
+        PageCache(cache_dir).put(INDEED_URL, records=[], html=INDEED_HTML)
+        PageCache(cache_dir).put("https://example.com/x", records=[], html=None)
+        snapshots = list(iter_cached_pages(cache_dir))
+        self.assertEqual([(s.source, s.kind) for s in snapshots], [("indeed", "cache")])
+        self.assertEqual(len(extract_snapshot(snapshots[0])), 2)
+
+    def test_paginated_run_archives_each_page(self) -> None:
+        class PagedScraper(BaseScraper):
+            source_name = "indeed"
+
+            def page_url(self, numero: int):
+                return f"https://pe.indeed.com/jobs?q=analista&start={(numero - 1) * 10}"
+
+        pages = {1: [{"url": "u1"}], 2: [{"url": "u2"}], 3: []}
+        driver = HtmlDriver(INDEED_HTML, INDEED_URL)
+        scraper = PagedScraper(driver=driver)
+        scraper.snapshot_archive = SnapshotArchive(self.root, run_id="run-2")
+        state = {"page": 1}
+
+        def navigate(numero: int) -> bool:
+            state["page"] = numero
+            return True
+
+        scraper.gather_paginated(lambda: pages[state["page"]], navigator=navigate, page_wait=0)
+        snapshots = list(iter_archive(self.root))
+        self.assertEqual([s.page for s in snapshots], [1, 2])
+        self.assertEqual(snapshots[1].url, "https://pe.indeed.com/jobs?q=analista&start=10")
+
+    def test_unknown_source_is_skipped(self) -> None:
+        self.assertEqual(source_for_url("https://example.com/jobs"), "")
+        self.assertEqual(extract_snapshot(Snapshot(source="", url="https://example.com", path="missing")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import sys
+import threading
+import time
+from pathlib import Path
+import unittest
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from tests.selenium_stub import ensure_selenium_stub
+
+ensure_selenium_stub()
+
+from src.core.base import BaseScraper
+from src.scheduler import SearchScheduler, SearchSpec, build_specs
+
+
+class LiveDrivers:
+    """Fake browser factory that tracks how many sessions are open at once."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.live = 0
+        self.peak = 0
+
+    def __call__(self, headless=None, **kwargs):
+        tracker = self
+
+        class Driver:
+            current_url = "page=1"
+
+            def get(self, url):
+                self.current_url = url
+
+            def quit(self):
+                with tracker.lock:
+                    tracker.live -= 1
+
+        with self.lock:
+            self.live += 1
+            self.peak = max(self.peak, self.live)
+        return Driver()
+
+
+class PagedScraper(BaseScraper):
+    shard_acquire_timeout = 0.05
+
+    def __init__(self, headless=True, backend=None) -> None:
+        super().__init__(headless=headless, backend=backend)
+        self.max_pages = 8
+
+    def page_url(self, numero: int):
+        return f"page={numero}"
+
+    def extract(self):
+        time.sleep(0.01)
+        return [{"url": self.driver.current_url}]
+
+
+class RecordingRunner:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.order = []
+        self.active = {}
+        self.peak = {}
+        self.active_total = 0
+        self.peak_total = 0
+
+    def __call__(self, source, busqueda, dias, initial_wait, page_wait, **kwargs):
+        with self.lock:
+            self.order.append((busqueda, dias, source))
+            self.active[source] = self.active.get(source, 0) + 1
+            self.peak[source] = max(self.peak.get(source, 0), self.active[source])
+            self.active_total += 1
+            self.peak_total = max(self.peak_total, self.active_total)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[source] -= 1
+            self.active_total -= 1
+        shared = f"https://jobs.com/{busqueda}/shared"
+        return [
+            {"fuente": source, "url": shared, "titulo": busqueda},
+            {"fuente": source, "url": f"https://jobs.com/{busqueda}/{source}/{dias}", "titulo": busqueda},
+        ]
+
+
+class SearchSchedulerTests(unittest.TestCase):
+    def test_build_specs_expands_keywords_and_dias(self) -> None:
+        specs = build_specs(["analista", " ", "analista", "contador"], [1, 0], ["indeed"])
+        self.assertEqual(
+            specs,
+            [
+                SearchSpec("analista", 1, ("indeed",)),
+                SearchSpec("analista", 0, ("indeed",)),
+                SearchSpec("contador", 1, ("indeed",)),
+                SearchSpec("contador", 0, ("indeed",)),
+            ],
+        )
+
+    def test_recent_date_filters_run_first(self) -> None:
+        runner = RecordingRunner()
+        scheduler = SearchScheduler(max_workers=1, runner=runner)
+        specs = [SearchSpec("a", 0, ("x",)), SearchSpec("b", 3, ("x",)), SearchSpec("c", 1, ("x",))]
+        scheduler.run(specs, initial_wait=0, page_wait=0)
+        self.assertEqual([entry[:2] for entry in runner.order], [("c", 1), ("b", 3), ("a", 0)])
+
+    def test_respects_global_and_per_source_caps(self) -> None:
+        runner = RecordingRunner(delay=0.02)
+        scheduler = SearchScheduler(max_workers=3, source_limits={"slow": 1}, runner=runner)
+        specs = build_specs([f"k{i}" for i in range(4)], [0], ["slow", "fast"])
+        results = scheduler.run(specs, initial_wait=0, page_wait=0)
+
+        self.assertEqual(len(runner.order), 8)
+        self.assertEqual(runner.peak["slow"], 1)
+        self.assertLessEqual(runner.peak_total, 3)
+        self.assertGreater(runner.peak["fast"], 1)
+        # Results are merged per search in source order, deduplicated by URL
+        first = results[0]
+        self.assertEqual(first.executed, ["slow", "fast"])
+        self.assertEqual([r["fuente"] for r in first.records], ["slow", "slow", "fast"])
+
+    def test_failed_unit_does_not_stop_the_batch(self) -> None:
+        def runner(source, busqueda, *args, **kwargs):
+            if source == "bad":
+                raise RuntimeError("boom")
+            return [{"url": f"https://jobs.com/{busqueda}"}]
+
+        scheduler = SearchScheduler(max_workers=2, runner=runner)
+        results = scheduler.run(build_specs(["a", "b"], [0], ["bad", "good"]), initial_wait=0, page_wait=0)
+        self.assertEqual([r.executed for r in results], [["good"], ["good"]])
+
+
+    def test_page_shards_share_the_browser_budget(self) -> None:
+        drivers = LiveDrivers()
+
+        def runner(source, busqueda, dias, initial_wait, page_wait, backend=None, page_workers=1, **kwargs):
+            scraper = PagedScraper(backend=backend)
+            try:
+                return scraper.gather_paginated(
+                    extractor=scraper.extract,
+                    page_wait=0,
+                    workers=page_workers,
+                    shard_extractor=lambda shard: shard.extract(),
+                )
+            finally:
+                scraper.close()
+
+        scheduler = SearchScheduler(max_workers=2, runner=runner)
+        with patch("src.core.backend.create_firefox_driver", drivers), patch(
+            "src.core.base.create_firefox_driver", drivers
+        ):
+            results = scheduler.run(
+                build_specs(["a", "b", "c"], [0], ["fake"]), initial_wait=0, page_wait=0, page_workers=3
+            )
+
+        self.assertTrue(all(len(result.records) == 8 for result in results))
+        # Dos tareas con tres shards cada una abrirían hasta seis navegadores
+        self.assertLessEqual(drivers.peak, 3)
+        self.assertEqual(drivers.live, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
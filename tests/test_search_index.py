@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.search_index import SearchIndex, build_match_query
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+        self.index = SearchIndex(os.path.join(self.directory, "ofertas.db"))
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self._tmp.cleanup()
+
+    def test_match_query_quotes_words_and_prefixes_last(self) -> None:
+        self.assertEqual(build_match_query('analista "datos'), '"analista" "datos"*')
+        self.assertEqual(build_match_query("  --  "), "")
+
+    def test_accent_insensitive_ranked_search(self) -> None:
+        self.index.add(
+            [
+                {"fuente": "Bumeran", "titulo": "Analista de Logística", "empresa": "Acme", "url": "u1"},
+                {"fuente": "Indeed", "titulo": "Asistente", "empresa": "Logistica Perú SAC", "url": "u2"},
+                {"fuente": "Indeed", "titulo": "Contador", "empresa": "Beta", "url": "u3"},
+            ],
+            busqueda="analista",
+        )
+        hits = self.index.search("logistica")
+        # Title matches weigh more than company matches
+        self.assertEqual([hit["url"] for hit in hits], ["u1", "u2"])
+        self.assertEqual([hit["url"] for hit in self.index.search("analis")], ["u1"])
+        self.assertEqual([hit["url"] for hit in self.index.search("logística", fuente="indeed")], ["u2"])
+        self.assertEqual(self.index.search("inexistente"), [])
+
+    def test_updates_are_incremental_and_keep_newest_text(self) -> None:
+        self.index.add([{"titulo": "Analista Jr", "url": "u1"}], seen_at=200.0)
+        self.index.add([{"titulo": "Analista Sr", "url": "u1"}], seen_at=300.0)
+        self.index.add([{"titulo": "Practicante", "url": "u1"}], seen_at=100.0)
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual([hit["titulo"] for hit in self.index.search("analista")], ["Analista Sr"])
+        self.assertEqual(self.index.search("jr"), [])
+        self.assertEqual(self.index.search("practicante"), [])
+
+    def test_import_directory_skips_files_already_indexed(self) -> None:
+        output = os.path.join(self.directory, "output")
+        os.makedirs(output)
+        with open(os.path.join(output, "combined_analista.json"), "w", encoding="utf-8") as handle:
+            json.dump([{"fuente": "Bumeran", "titulo": "Analista BI", "empresa": "Acme", "url": "u9"}], handle)
+        self.assertEqual(self.index.import_directory(output), 1)
+        self.assertEqual(self.index.import_directory(output), 0)
+        self.assertEqual(self.index.search("bi")[0]["url"], "u9")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from datetime import date, datetime
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.postprocess import merge_history
+from src.storage import SegmentStore, fcntl
+from src.utils import guardar_resultados
+
+
+def offers(prefix: str, count: int):
+    return [
+        {"fuente": "Bumeran", "empresa": "ACME", "titulo": f"{prefix} {i}", "url": f"https://x.pe/{prefix}/{i}"}
+        for i in range(count)
+    ]
+
+
+def write_runs(directory: str, name: str, runs: int) -> None:
+    store = SegmentStore(directory, codec="gzip")
+    for index in range(runs):
+        store.write(offers(f"{name}{index}", 2), "analista", name)
+
+
+class SegmentStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+        self.store = SegmentStore(self.directory, run_id="run-1", codec="gzip")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requiere fork")
+    def test_concurrent_processes_keep_every_segment(self) -> None:
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=write_runs, args=(self.directory, f"p{i}", 10)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        self.assertEqual([worker.exitcode for worker in workers], [0] * 4)
+        self.assertEqual(len(self.store.segments()), 40)
+        self.assertEqual(sum(1 for _ in self.store.iter_records()), 80)
+
+    def test_same_day_runs_get_their_own_segments(self) -> None:
+        when = datetime(2025, 3, 1, 9, 0, 0)
+        first = self.store.write(offers("analista", 3), "analista", "combined", when=when)
+        second = self.store.write(offers("analista", 2), "analista", "combined", when=when)
+        self.assertNotEqual(first, second)
+        runs = list(self.store.iter_runs(query="analista"))
+        self.assertEqual([len(records) for _, records in runs], [3, 2])
+        self.assertEqual(runs[0][0]["run"], "run-1")
+
+    def test_compaction_merges_past_days_and_keeps_runs_addressable(self) -> None:
+        for index, query in enumerate(["analista", "contador", "analista"]):
+            self.store.write(offers(f"{query}{index}", 4), query, "combined", when=datetime(2025, 3, 1, 8, index))
+        self.store.write(offers("hoy", 1), "analista", "combined", when=datetime(2025, 3, 2, 8, 0))
+        self.assertEqual(self.store.compact(before="2025-03-02"), 3)
+        segments = self.store.segments()
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(len(segments[0]["runs"]), 3)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.directory, "2025-03-01")))[0][:5], "part-")
+        titles = [record["titulo"] for record in self.store.iter_records(query="analista", until="2025-03-01")]
+        self.assertEqual(titles, [f"analista0 {i}" for i in range(4)] + [f"analista2 {i}" for i in range(4)])
+        self.assertEqual(len(list(self.store.iter_records(query="contador"))), 4)
+
+    @unittest.skipIf(fcntl is None, "requiere fcntl")
+    def test_compaction_waits_for_a_reader(self) -> None:
+        for index in range(2):
+            self.store.write(offers(f"a{index}", 2), "analista", "combined", when=datetime(2025, 3, 1, 8, index))
+        reader = self.store.iter_runs()
+        next(reader)
+        compactor = threading.Thread(target=self.store.compact, kwargs={"before": "2025-03-02"})
+        compactor.start()
+        compactor.join(0.2)
+        # El segmento que se está leyendo sigue en disco hasta terminar la lectura
+        self.assertTrue(compactor.is_alive())
+        self.assertEqual(len(list(reader)), 1)
+        compactor.join(5)
+        self.assertEqual(len(self.store.segments()), 1)
+
+    def test_failed_merge_leaves_no_temporary_file(self) -> None:
+        for index in range(2):
+            self.store.write(offers(f"a{index}", 2), "analista", "combined", when=datetime(2025, 3, 1, 8, index))
+        os.remove(os.path.join(self.directory, self.store.segments()[1]["file"]))
+        with self.assertRaises(FileNotFoundError):
+            self.store.compact(before="2025-03-02")
+        leftovers = [name for name in os.listdir(os.path.join(self.directory, "2025-03-01")) if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+        self.assertEqual(len(self.store.segments()), 2)
+
+    def test_retention_by_age_and_size(self) -> None:
+        for day in (1, 10, 20):
+            self.store.write(offers(f"d{day}", 50), "analista", "combined", when=datetime(2025, 3, day))
+        self.assertEqual(self.store.apply_retention(max_age_days=15, today=date(2025, 3, 21)), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "2025-03-01")))
+        newest = self.store.segments()[-1]["bytes"]
+        self.assertEqual(self.store.apply_retention(max_bytes=newest), 1)
+        self.assertEqual([entry["date"] for entry in self.store.segments()], ["2025-03-20"])
+
+    def test_legacy_files_and_merge_history(self) -> None:
+        legacy = os.path.join(self.directory, "legacy")
+        os.makedirs(legacy)
+        with open(os.path.join(legacy, "combined_analista_2025-02-01.json"), "w", encoding="utf-8") as handle:
+            json.dump(offers("viejo", 2), handle)
+        store = SegmentStore(os.path.join(self.directory, "store"), codec="gzip")
+        store.import_file(os.path.join(legacy, "combined_analista_2025-02-01.json"))
+        guardar_resultados(offers("nuevo", 2), "Analista", output_dir=legacy, source="combined", store=store, files=False)
+        self.assertEqual(len(os.listdir(legacy)), 1)
+        self.assertEqual(store.segments()[0]["date"], "2025-02-01")
+        merged = merge_history(store.directory)
+        self.assertEqual(len(merged), 4)
+        self.assertTrue(merged["titulo"].iloc[0].startswith("nuevo"))
+
+
+if __name__ == "__main__":
+    unittest.main()
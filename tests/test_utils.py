@@ -16,7 +16,7 @@ ensure_selenium_stub()
 
 from datetime import datetime as real_datetime
 
-from src.utils import guardar_resultados
+from src.utils import RecordFile, guardar_resultados, iter_history
 
 
 class GuardarResultadosTests(unittest.TestCase):
@@ -61,5 +61,47 @@ class GuardarResultadosTests(unittest.TestCase):
         self.assertEqual(rows, ["fuente,empresa,titulo,url"])
 
 
+class RecordFileTests(unittest.TestCase):
+    RECORDS = [
+        {"fuente": "Indeed", "empresa": "", "titulo": "Contador", "url": "https://x.pe/1", "extra": {"fuente": "Bumeran"}},
+        {"fuente": "Bumeran", "empresa": "Señor & Cía", "titulo": "Analista\n{datos}", "url": "https://x.pe/2", "extra": {}},
+        {"fuente": "Bumeran", "empresa": "ACME", "titulo": "Asistente", "url": "https://x.pe/3", "extra": {}},
+    ]
+
+    def test_random_access_and_filters_on_saved_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("src.utils.datetime") as mock_datetime:
+                mock_datetime.now.return_value = real_datetime(2025, 1, 15)
+                guardar_resultados(self.RECORDS, "Analista", output_dir=tmpdir, source="combined")
+            with RecordFile(os.path.join(tmpdir, "combined_analista_2025-01-15.json")) as records:
+                self.assertEqual(len(records), 3)
+                self.assertEqual(records[-1], self.RECORDS[2])
+                raw = records.raw(0)
+                self.assertIsInstance(raw, memoryview)
+                self.assertEqual(json.loads(bytes(raw)), self.RECORDS[0])
+                raw.release()
+                self.assertEqual([r["url"] for r in records.iter_records(fuente="Bumeran")], ["https://x.pe/2", "https://x.pe/3"])
+                self.assertEqual(list(records), self.RECORDS)
+
+    def test_jsonl_compact_arrays_and_history_filters(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "indeed_data_2025-01-10.jsonl"), "w", encoding="utf-8") as handle:
+                handle.write("\n".join(json.dumps(r, ensure_ascii=False) for r in self.RECORDS) + "\n\n")
+            with open(os.path.join(tmpdir, "combined_data_2025-02-01.json"), "w", encoding="utf-8") as handle:
+                json.dump(self.RECORDS[:2], handle)
+            with RecordFile(os.path.join(tmpdir, "combined_data_2025-02-01.json")) as records:
+                self.assertEqual(list(records), self.RECORDS[:2])
+            self.assertEqual(len(list(iter_history(tmpdir, busqueda="Data"))), 5)
+            self.assertEqual(len(list(iter_history(tmpdir, desde="2025-01-15"))), 2)
+            self.assertEqual(len(list(iter_history(tmpdir, fuente="Indeed", hasta="2025-01-31"))), 1)
+
+    def test_empty_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "vacio.json")
+            open(path, "w").close()
+            with RecordFile(path) as records:
+                self.assertEqual(list(records), [])
+
+
 if __name__ == "__main__":
     unittest.main()